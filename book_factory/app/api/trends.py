@@ -23,7 +23,7 @@ async def list_trends(db: AsyncSession = Depends(get_db)):
 @router.post("/refresh", response_model=list[schemas.TrendCandidateOut])
 async def refresh_trends(db: AsyncSession = Depends(get_db)):
     monitor = TrendMonitor()
-    new_candidates = monitor.fetch()
+    new_candidates = await monitor.fetch_async()
 
     for candidate in new_candidates:
         db.add(candidate)
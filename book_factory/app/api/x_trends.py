@@ -1,6 +1,8 @@
 """X trend digest endpoints."""
 from __future__ import annotations
 
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -29,7 +31,8 @@ async def x_trends(
     db: AsyncSession = Depends(get_db),
 ):
     topic = await _get_topic(db, slug)
-    digest = build_trend_digest(
+    digest = await asyncio.to_thread(
+        build_trend_digest,
         topic.name,
         topic.keywords or [],
         max_results=max_results,
@@ -66,6 +66,8 @@ class Settings(BaseSettings):
     x_access_token_secret: str = ""
     x_min_seconds_between_calls: float = 2.0
     x_max_calls_per_run: int = 50
+    x_max_concurrency: int = 4
+    x_rate_limit_burst: int = 1
     x_bearer_token: str = ""
 
     # GitHub
@@ -115,6 +117,8 @@ class Settings(BaseSettings):
     swarm_x_trends_top_authors: int = 8
     swarm_best_effort: bool = True
     swarm_strip_evidence_gaps: bool = True
+    swarm_cache: bool = True
+    swarm_cache_ttl_seconds: int = 7 * 24 * 3600
 
     class Config:
         env_file = [
@@ -81,7 +81,7 @@ async def _trend_loop() -> None:
     monitor = TrendMonitor()
     while True:
         async with AsyncSessionLocal() as session:
-            candidates = monitor.fetch()
+            candidates = await monitor.fetch_async()
             for candidate in candidates:
                 exists = await session.execute(
                     select(models.TrendCandidate).where(
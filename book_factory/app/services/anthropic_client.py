@@ -1,6 +1,9 @@
 """Anthropic API client via HTTPX."""
 from __future__ import annotations
 
+import json
+from typing import AsyncIterator
+
 import httpx
 
 from app.config import settings
@@ -14,7 +17,7 @@ class AnthropicClient:
         self.model = settings.anthropic_model
         self.base_url = "https://api.anthropic.com/v1/messages"
 
-    async def generate(self, system_prompt: str, user_prompt: str, max_tokens: int = 3000) -> str:
+    def _request(self, system_prompt: str, user_prompt: str, max_tokens: int) -> tuple[dict, dict]:
         if not self.api_key:
             raise ValueError("Anthropic API key is not configured.")
 
@@ -31,6 +34,10 @@ class AnthropicClient:
                 {"role": "user", "content": user_prompt}
             ],
         }
+        return headers, payload
+
+    async def generate(self, system_prompt: str, user_prompt: str, max_tokens: int = 3000) -> str:
+        headers, payload = self._request(system_prompt, user_prompt, max_tokens)
         async with httpx.AsyncClient(timeout=120) as client:
             response = await client.post(self.base_url, headers=headers, json=payload)
             if response.status_code >= 400:
@@ -43,3 +50,35 @@ class AnthropicClient:
         if not content:
             return ""
         return "".join(part.get("text", "") for part in content).strip()
+
+    async def generate_stream(
+        self, system_prompt: str, user_prompt: str, max_tokens: int = 3000
+    ) -> AsyncIterator[str]:
+        """Yield text deltas as they arrive over server-sent events."""
+        headers, payload = self._request(system_prompt, user_prompt, max_tokens)
+        payload["stream"] = True
+        async with httpx.AsyncClient(timeout=120) as client:
+            async with client.stream("POST", self.base_url, headers=headers, json=payload) as response:
+                if response.status_code >= 400:
+                    detail = (await response.aread()).decode("utf-8", errors="ignore")[:800]
+                    raise ValueError(f"Anthropic API error {response.status_code}: {detail}")
+                completed = False
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[5:].strip())
+                    event_type = event.get("type")
+                    if event_type == "content_block_delta":
+                        text = (event.get("delta") or {}).get("text")
+                        if text:
+                            yield text
+                    elif event_type == "error":
+                        error = event.get("error") or {}
+                        raise ValueError(
+                            f"Anthropic API stream error {error.get('type')}: {str(error.get('message'))[:800]}"
+                        )
+                    elif event_type == "message_stop":
+                        completed = True
+                        break
+                if not completed:
+                    raise ValueError("Anthropic API stream ended before message_stop")
@@ -15,6 +15,7 @@ from app.services.ingestion import (
     fetch_and_clean,
     is_x_url,
     chunk_text,
+    prefetch_x_payloads,
 )
 from app.services.ingest_log import log_failure, log_success
 from app.services.ollama_client import OllamaClient
@@ -53,13 +54,19 @@ async def run_ingest(
         runtime = load_runtime_settings()
         max_per_silo = int(runtime.get("draft_max_words_per_silo", settings.draft_max_words_per_silo))
         max_total = int(runtime.get("draft_max_words_total", settings.draft_max_words_total))
+        x_urls = [source.url for source in sources if is_x_url(source.url)][:max_calls]
+        try:
+            x_payloads = await prefetch_x_payloads(x_urls)
+        except Exception:
+            # Fall back to per-URL lookups inside fetch_and_clean.
+            x_payloads = {}
         for source in sources:
             if is_x_url(source.url) and x_calls >= max_calls:
                 continue
             processed += 1
             try:
                 started = time.monotonic()
-                text = await fetch_and_clean(source.url)
+                text = await fetch_and_clean(source.url, x_payload=x_payloads.get(source.url))
                 if len(text.split()) < settings.ingest_min_words:
                     raise ValueError("too_short")
                 if terms and not text_mentions_term(text[:8000], terms):
@@ -11,7 +11,14 @@ import httpx
 from bs4 import BeautifulSoup
 
 from app.services.ollama_client import OllamaClient
-from app.services.x_client import extract_status_id, fetch_tweet_payload, fetch_thread_text, fetch_username
+from app.services.x_client import (
+    extract_status_id,
+    fetch_thread_text,
+    fetch_tweet_payload,
+    fetch_tweet_payloads_async,
+    fetch_username,
+    fetch_usernames,
+)
 
 URL_RE = re.compile(r"https?://\\S+")
 X_DOMAINS = ("x.com", "twitter.com")
@@ -32,21 +39,43 @@ def is_x_url(url: str) -> bool:
     return any(domain in (url or "") for domain in X_DOMAINS)
 
 
-async def fetch_and_clean(url: str, timeout: int = 20) -> str:
+async def prefetch_x_payloads(urls: Iterable[str]) -> dict[str, dict]:
+    """Batch-fetch tweets and author usernames for X URLs, keyed by URL."""
+    status_ids = {url: extract_status_id(url) for url in urls if is_x_url(url)}
+    status_ids = {url: status_id for url, status_id in status_ids.items() if status_id}
+    if not status_ids:
+        return {}
+    payloads = await fetch_tweet_payloads_async(list(status_ids.values()))
+    author_ids = [payload.get("author_id") for payload in payloads.values()]
+    usernames = await asyncio.to_thread(fetch_usernames, author_ids)
+    prefetched: dict[str, dict] = {}
+    for url, status_id in status_ids.items():
+        payload = payloads.get(status_id)
+        if payload is None:
+            continue
+        prefetched[url] = {**payload, "username": usernames.get(payload.get("author_id"))}
+    return prefetched
+
+
+async def fetch_and_clean(url: str, timeout: int = 20, x_payload: dict | None = None) -> str:
     if url.startswith("file:"):
         path = url.replace("file:", "", 1)
         return Path(path).read_text(encoding="utf-8", errors="ignore").strip()
     if is_x_url(url):
-        status_id = extract_status_id(url)
-        if not status_id:
-            raise ValueError("Invalid X status URL")
-        payload = await asyncio.to_thread(fetch_tweet_payload, status_id)
+        payload = x_payload
+        if payload is None:
+            status_id = extract_status_id(url)
+            if not status_id:
+                raise ValueError("Invalid X status URL")
+            payload = await asyncio.to_thread(fetch_tweet_payload, status_id)
         text = payload.get("text", "")
         author_id = payload.get("author_id")
         conversation_id = payload.get("conversation_id")
 
         if author_id and conversation_id:
-            username = await asyncio.to_thread(fetch_username, author_id)
+            username = payload.get("username")
+            if username is None:
+                username = await asyncio.to_thread(fetch_username, author_id)
             if username:
                 thread = await asyncio.to_thread(fetch_thread_text, conversation_id, username)
                 if thread:
@@ -1,6 +1,9 @@
 """Minimal Ollama client."""
 from __future__ import annotations
 
+import json
+from typing import AsyncIterator
+
 import httpx
 
 from app.config import settings
@@ -25,3 +28,28 @@ class OllamaClient:
             response.raise_for_status()
             data = response.json()
         return data.get("response", "").strip()
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield response fragments from Ollama's NDJSON stream."""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+        }
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with client.stream("POST", f"{self.base_url}/api/generate", json=payload) as response:
+                response.raise_for_status()
+                completed = False
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    if data.get("error"):
+                        raise ValueError(f"Ollama stream error: {str(data['error'])[:800]}")
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        completed = True
+                        break
+                if not completed:
+                    raise ValueError("Ollama stream ended before done")
@@ -1,6 +1,9 @@
 """OpenAI-compatible chat completions client (works for GPT/Grok-compatible endpoints)."""
 from __future__ import annotations
 
+import json
+from typing import AsyncIterator
+
 import httpx
 
 
@@ -13,7 +16,7 @@ class OpenAICompatClient:
         self.model = model
         self.path = path
 
-    async def generate(self, system_prompt: str, user_prompt: str, max_tokens: int = 3000) -> str:
+    def _request(self, system_prompt: str, user_prompt: str, max_tokens: int) -> tuple[str, dict, dict]:
         if not self.api_key:
             raise ValueError("OpenAI-compatible API key is not configured.")
         if self.path.startswith("/"):
@@ -33,6 +36,10 @@ class OpenAICompatClient:
             "max_tokens": max_tokens,
             "temperature": 0.7,
         }
+        return url, headers, payload
+
+    async def generate(self, system_prompt: str, user_prompt: str, max_tokens: int = 3000) -> str:
+        url, headers, payload = self._request(system_prompt, user_prompt, max_tokens)
         async with httpx.AsyncClient(timeout=120) as client:
             resp = await client.post(url, headers=headers, json=payload)
             resp.raise_for_status()
@@ -42,3 +49,32 @@ class OpenAICompatClient:
             return ""
         message = choices[0].get("message") or {}
         return (message.get("content") or "").strip()
+
+    async def generate_stream(
+        self, system_prompt: str, user_prompt: str, max_tokens: int = 3000
+    ) -> AsyncIterator[str]:
+        """Yield content deltas from a streamed chat completion."""
+        url, headers, payload = self._request(system_prompt, user_prompt, max_tokens)
+        payload["stream"] = True
+        async with httpx.AsyncClient(timeout=120) as client:
+            async with client.stream("POST", url, headers=headers, json=payload) as resp:
+                resp.raise_for_status()
+                completed = False
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        completed = True
+                        break
+                    chunk = json.loads(data)
+                    if chunk.get("error"):
+                        raise ValueError(f"OpenAI-compatible API stream error: {str(chunk['error'])[:800]}")
+                    choices = chunk.get("choices") or []
+                    if not choices:
+                        continue
+                    content = (choices[0].get("delta") or {}).get("content")
+                    if content:
+                        yield content
+                if not completed:
+                    raise ValueError("OpenAI-compatible API stream ended before [DONE]")
@@ -1,18 +1,24 @@
 """Filesystem helpers for topic storage."""
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 import re
 from typing import Tuple
 
 from app.config import settings
 
+_SLUG_STRIP_RE = re.compile(r"[^a-z0-9\\s-]")
+_SLUG_SPACE_RE = re.compile(r"\\s+")
+_SLUG_DASH_RE = re.compile(r"-+")
 
+
+@lru_cache(maxsize=1024)
 def slugify(value: str) -> str:
     value = value.strip().lower()
-    value = re.sub(r"[^a-z0-9\\s-]", "", value)
-    value = re.sub(r"\\s+", "-", value)
-    value = re.sub(r"-+", "-", value)
+    value = _SLUG_STRIP_RE.sub("", value)
+    value = _SLUG_SPACE_RE.sub("-", value)
+    value = _SLUG_DASH_RE.sub("-", value)
     return value or "topic"
 
 
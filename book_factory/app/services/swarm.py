@@ -2,13 +2,14 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import shutil
 import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable
+from typing import IO, AsyncIterator, Iterable
 
 from sqlalchemy import select
 
@@ -24,6 +25,21 @@ from app.services.x_client import search_recent_tweets
 from app.services.x_trends import build_trend_digest
 from app.services.discovery import cse_search
 from app.services.ingestion import fetch_and_clean
+from app.services.token_budget import budget
+
+# Per-block token budgets for prompt context (roughly 4 chars per token),
+# matching the previous character limits.
+_DRAFT_NOTES_TOKENS = 1000
+_RESEARCH_AUTHOR_NOTES_TOKENS = 375
+_RESEARCH_X_NOTES_TOKENS = 375
+_WRITER_AUTHOR_NOTES_TOKENS = 500
+_WRITER_X_NOTES_TOKENS = 250
+_X_TRENDS_TOKENS = 500
+_WEB_NOTES_TOKENS = 1000
+_REVIEW_CHAPTER_TOKENS = 1000
+
+# Streamed chapter text is buffered and written to the draft file in chunks of this many chars.
+_DRAFT_WRITE_CHARS = 4096
 
 
 @dataclass
@@ -55,6 +71,10 @@ def swarm_sources_path(slug: str, silo_number: int) -> Path:
     return silo_dir(slug, silo_number) / "swarm_sources.json"
 
 
+def swarm_cache_path(slug: str, key: str) -> Path:
+    return topic_dir(slug) / "cache" / f"{key}.txt"
+
+
 def _strip_evidence_gaps(text: str) -> str:
     if not settings.swarm_strip_evidence_gaps:
         return text
@@ -77,6 +97,19 @@ def _strip_evidence_gaps(text: str) -> str:
     return "\n".join(cleaned).strip() + "\n"
 
 
+def _dedupe_texts(texts: Iterable[str]) -> list[str]:
+    """Drop repeated texts, comparing on whitespace- and case-normalized content."""
+    seen: set[str] = set()
+    unique: list[str] = []
+    for text in texts:
+        key = " ".join(text.split()).lower()
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        unique.append(text)
+    return unique
+
+
 def _select_writer_provider() -> tuple[str, object]:
     provider = settings.swarm_writer_provider
     if provider == "anthropic":
@@ -171,6 +204,42 @@ async def _generate(provider: str, client: object, system_prompt: str, user_prom
     return await client.generate(system_prompt, user_prompt, max_tokens=max_tokens)
 
 
+def _generate_stream(
+    provider: str, client: object, system_prompt: str, user_prompt: str, max_tokens: int
+) -> AsyncIterator[str]:
+    if provider == "ollama":
+        return client.generate_stream(system_prompt + "\n\n" + user_prompt)
+    return client.generate_stream(system_prompt, user_prompt, max_tokens=max_tokens)
+
+
+async def _cached_generate(
+    slug: str,
+    provider: str,
+    client: object,
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int,
+) -> str:
+    """Generate via _generate, reusing a prior result for an identical prompt."""
+    if not settings.swarm_cache:
+        return await _generate(provider, client, system_prompt, user_prompt, max_tokens)
+    material = "\n".join(
+        [provider, getattr(client, "model", ""), str(max_tokens), system_prompt, user_prompt]
+    )
+    key = hashlib.sha256(material.encode("utf-8")).hexdigest()
+    cache_path = swarm_cache_path(slug, key)
+    try:
+        if time.time() - cache_path.stat().st_mtime < settings.swarm_cache_ttl_seconds:
+            return cache_path.read_text(encoding="utf-8")
+    except OSError:
+        pass
+    text = await _generate(provider, client, system_prompt, user_prompt, max_tokens)
+    if text:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(text, encoding="utf-8")
+    return text
+
+
 async def ensure_briefs(topic_id: int, slug: str) -> None:
     async with AsyncSessionLocal() as session:
         result = await session.execute(
@@ -274,6 +343,7 @@ async def _build_context(
                 )
             )
             ideas.extend([item.text for item in unassigned_result.scalars().all()])
+        ideas = _dedupe_texts(ideas)
 
     draft_notes = _read_draft_notes(slug, silo_number)
     author_notes = read_notes(slug, silo_number)
@@ -306,7 +376,7 @@ async def _build_context(
     )
 
 
-async def _research_memo(context: ChapterContext, topic_name: str) -> str:
+async def _research_memo(context: ChapterContext, topic_name: str, slug: str) -> str:
     provider, client = _select_research_provider()
     if client is None:
         return ""
@@ -314,23 +384,33 @@ async def _research_memo(context: ChapterContext, topic_name: str) -> str:
         "You are a research assistant. Create a concise memo with factual anchors, "
         "gaps, and questions. Avoid speculation."
     )
-    user_prompt = (
+    user_prompt = "\n\n".join([
         f"Topic: {topic_name}\n"
         f"Chapter: {context.title}\n"
         f"Goal: {context.goal}\n"
-        f"Outline: {context.outline}\n\n"
-        f"Brief notes:\n{context.notes}\n\n"
-        "Ideas:\n" + "\n".join(f"- {idea}" for idea in context.ideas[:25]) + "\n\n"
-        "Draft notes:\n" + context.draft_notes[:4000] + "\n\n"
-        "Author notes:\n" + context.author_notes[:1500] + "\n\n"
-        "X notes:\n" + context.x_notes[:1500] + "\n\n"
-        "X trend digest:\n" + json.dumps(context.x_trends, indent=2)[:2000] + "\n\n"
-        "Web evidence:\n" + context.web_notes[:4000]
-    )
-    return await _generate(provider, client, system_prompt, user_prompt, max_tokens=1200)
+        f"Outline: {context.outline}",
+        f"Brief notes:\n{context.notes}",
+        "Ideas:\n" + "\n".join(f"- {idea}" for idea in context.ideas[:25]),
+        "Draft notes:\n" + budget(context.draft_notes, _DRAFT_NOTES_TOKENS),
+        "Author notes:\n" + budget(context.author_notes, _RESEARCH_AUTHOR_NOTES_TOKENS),
+        "X notes:\n" + budget(context.x_notes, _RESEARCH_X_NOTES_TOKENS),
+        "X trend digest:\n" + budget(json.dumps(context.x_trends, indent=2), _X_TRENDS_TOKENS),
+        "Web evidence:\n" + budget(context.web_notes, _WEB_NOTES_TOKENS),
+    ])
+    return await _cached_generate(slug, provider, client, system_prompt, user_prompt, max_tokens=1200)
+
+
+def _append_draft(handle: IO[str], text: str) -> None:
+    handle.write(text)
+    handle.flush()
 
 
-async def _write_chapter(context: ChapterContext, topic_name: str, voice_preset: str) -> str:
+async def _write_chapter(
+    context: ChapterContext,
+    topic_name: str,
+    voice_preset: str,
+    draft_path: Path,
+) -> str:
     provider, client = _select_writer_provider()
     system_prompt = (
         "You are a senior ghostwriter. Write original prose with a clear narrative arc. "
@@ -343,29 +423,47 @@ async def _write_chapter(context: ChapterContext, topic_name: str, voice_preset:
         )
     else:
         system_prompt += " If evidence is weak, flag gaps."
-    user_prompt = (
+    user_prompt = "\n\n".join([
         f"Topic: {topic_name}\n"
         f"Chapter: {context.title}\n"
-        f"Voice: {voice_preset}\n\n"
+        f"Voice: {voice_preset}",
         f"Chapter goal: {context.goal}\n"
-        f"Outline: {context.outline}\n\n"
-        f"Brief notes:\n{context.notes}\n\n"
-        "Idea pool (scrum backlog):\n" + "\n".join(f"- {idea}" for idea in context.ideas[:30]) + "\n\n"
-        "Author notes:\n" + context.author_notes[:2000] + "\n\n"
-        "Draft notes (do not copy verbatim):\n" + context.draft_notes[:4000] + "\n\n"
-        "X notes (signals only, paraphrase):\n" + context.x_notes[:1000] + "\n\n"
-        "X trend digest:\n" + json.dumps(context.x_trends, indent=2)[:2000] + "\n\n"
-        "Web evidence (paraphrase, cite by URL if useful):\n" + context.web_notes[:4000] + "\n\n"
-        "Write the chapter in coherent narrative form. Use section headings if helpful."
-    )
-
-    text = await _generate(provider, client, system_prompt, user_prompt, max_tokens=3200)
+        f"Outline: {context.outline}",
+        f"Brief notes:\n{context.notes}",
+        "Idea pool (scrum backlog):\n" + "\n".join(f"- {idea}" for idea in context.ideas[:30]),
+        "Author notes:\n" + budget(context.author_notes, _WRITER_AUTHOR_NOTES_TOKENS),
+        "Draft notes (do not copy verbatim):\n" + budget(context.draft_notes, _DRAFT_NOTES_TOKENS),
+        "X notes (signals only, paraphrase):\n" + budget(context.x_notes, _WRITER_X_NOTES_TOKENS),
+        "X trend digest:\n" + budget(json.dumps(context.x_trends, indent=2), _X_TRENDS_TOKENS),
+        "Web evidence (paraphrase, cite by URL if useful):\n" + budget(context.web_notes, _WEB_NOTES_TOKENS),
+        "Write the chapter in coherent narrative form. Use section headings if helpful.",
+    ])
+
+    # Stream to the draft file so partial output is visible while generating. Deltas are
+    # buffered and written off the event loop so file I/O never blocks other coroutines.
+    chunks: list[str] = []
+    written = 0
+    pending_chars = 0
+    handle = await asyncio.to_thread(open, draft_path, "w", encoding="utf-8")
+    try:
+        async for chunk in _generate_stream(provider, client, system_prompt, user_prompt, max_tokens=3200):
+            chunks.append(chunk)
+            pending_chars += len(chunk)
+            if pending_chars >= _DRAFT_WRITE_CHARS:
+                await asyncio.to_thread(_append_draft, handle, "".join(chunks[written:]))
+                written = len(chunks)
+                pending_chars = 0
+        if written < len(chunks):
+            await asyncio.to_thread(_append_draft, handle, "".join(chunks[written:]))
+    finally:
+        await asyncio.to_thread(handle.close)
+    text = "".join(chunks)
     if settings.swarm_best_effort:
         text = _strip_evidence_gaps(text)
     return text
 
 
-async def _review_chapter(context: ChapterContext, topic_name: str, chapter_text: str) -> dict:
+async def _review_chapter(context: ChapterContext, topic_name: str, chapter_text: str, slug: str) -> dict:
     provider, client = _select_writer_provider()
     system_prompt = "You are a meticulous book editor."
     user_prompt = (
@@ -375,9 +473,9 @@ async def _review_chapter(context: ChapterContext, topic_name: str, chapter_text
         f"Outline: {context.outline}\n\n"
         "Evaluate the chapter for coverage, coherence, repetition, and missing evidence. "
         "Return JSON with keys: score (1-10), strengths (list), gaps (list), risks (list).\n\n"
-        f"Chapter text:\n{chapter_text[:4000]}"
+        f"Chapter text:\n{budget(chapter_text, _REVIEW_CHAPTER_TOKENS)}"
     )
-    response = await _generate(provider, client, system_prompt, user_prompt, max_tokens=800)
+    response = await _cached_generate(slug, provider, client, system_prompt, user_prompt, max_tokens=800)
     try:
         return json.loads(response)
     except json.JSONDecodeError:
@@ -438,10 +536,9 @@ async def run_swarm(
                 include_unassigned_ideas,
                 x_trend_digest,
             )
-            research_memo = await _research_memo(context, topic_name)
+            research_memo = await _research_memo(context, topic_name, slug)
             if research_memo:
                 context.notes = (context.notes + "\n\n" + research_memo).strip()
-            chapter_text = await _write_chapter(context, topic_name, voice_preset)
             draft_path = swarm_draft_path(slug, silo_number)
             if draft_path.exists():
                 backup_path = draft_path.with_name("swarm_draft.prev.md")
@@ -449,9 +546,10 @@ async def run_swarm(
                     shutil.copyfile(draft_path, backup_path)
                 except OSError:
                     pass
+            chapter_text = await _write_chapter(context, topic_name, voice_preset, draft_path)
             draft_path.write_text(chapter_text.strip(), encoding="utf-8")
 
-            review = await _review_chapter(context, topic_name, chapter_text)
+            review = await _review_chapter(context, topic_name, chapter_text, slug)
             review_path = swarm_review_path(slug, silo_number)
             review_path.write_text(json.dumps(review, indent=2), encoding="utf-8")
 
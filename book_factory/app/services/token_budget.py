@@ -0,0 +1,38 @@
+"""Token-aware truncation for prompt context blocks."""
+from __future__ import annotations
+
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Rough chars-per-token ratio used when tiktoken is unavailable.
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def budget(text: str, max_tokens: int) -> str:
+    """Truncate text to at most max_tokens tokens."""
+    if not text or max_tokens <= 0:
+        return ""
+    # A token always spans at least one character, so short text fits as-is.
+    if len(text) <= max_tokens:
+        return text
+    enc = _encoding()
+    if enc is None:
+        return text[: max_tokens * _CHARS_PER_TOKEN]
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens])
@@ -1,16 +1,24 @@
 """Helpers for topic keywords, aliases, and query building."""
 from __future__ import annotations
 
+from functools import lru_cache
 import re
 from typing import Iterable
 
+_LIST_SPLIT = re.compile(r"[,\n]")
+
 
 def parse_list_field(raw: str | None) -> list[str]:
     if not raw:
         return []
-    parts = re.split(r"[,\n]", raw)
-    cleaned = [part.strip() for part in parts if part.strip()]
-    return list(dict.fromkeys(cleaned))
+    seen: set[str] = set()
+    cleaned: list[str] = []
+    for part in _LIST_SPLIT.split(raw):
+        part = part.strip()
+        if part and part not in seen:
+            seen.add(part)
+            cleaned.append(part)
+    return cleaned
 
 
 def parse_url_list(raw: str | None) -> list[str]:
@@ -40,6 +48,11 @@ def normalize_terms(topic_name: str, keywords: Iterable[str] | None = None) -> l
 
 
 def build_or_query(terms: Iterable[str]) -> str:
+    return _build_or_query(tuple(terms))
+
+
+@lru_cache(maxsize=1024)
+def _build_or_query(terms: tuple[str, ...]) -> str:
     items: list[str] = []
     for term in terms:
         if not term:
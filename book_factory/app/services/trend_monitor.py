@@ -1,6 +1,7 @@
 """RSS-based trend monitor to avoid scraping/captcha."""
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
 
 import feedparser
@@ -18,10 +19,21 @@ class TrendMonitor:
     def __init__(self) -> None:
         self.feeds = settings.trend_rss_feeds
 
+    async def fetch_async(self) -> list[TrendCandidate]:
+        """Parse all feeds concurrently in worker threads."""
+        parsed_list = await asyncio.gather(
+            *[asyncio.to_thread(feedparser.parse, feed_url) for feed_url in self.feeds]
+        )
+        return self._candidates(parsed_list)
+
     def fetch(self) -> list[TrendCandidate]:
+        """Blocking variant for callers outside an event loop."""
+        return self._candidates([feedparser.parse(feed_url) for feed_url in self.feeds])
+
+    @staticmethod
+    def _candidates(parsed_list: list) -> list[TrendCandidate]:
         candidates: list[TrendCandidate] = []
-        for feed_url in self.feeds:
-            parsed = feedparser.parse(feed_url)
+        for parsed in parsed_list:
             for entry in parsed.entries[:20]:
                 title = getattr(entry, "title", "").strip()
                 if not title:
@@ -1,17 +1,102 @@
 """X API client for fetching tweet text via Bearer Token (v2)."""
 from __future__ import annotations
 
+import asyncio
 import re
+import threading
 import time
-from typing import Optional
+from typing import Iterator, Optional
 
+import httpx
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.config import settings
 
-_last_call_ts: float | None = None
+# Extra wait after an exhausted window resets, to absorb clock skew.
+_RESET_BUFFER_SECONDS = 5
+# Transient server errors retried with exponential backoff, by both the sync session and async fetches.
+_SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+_SERVER_RETRIES = 3
+_SERVER_BACKOFF_FACTOR = 0.5
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by sync and async X API callers."""
+
+    def __init__(self, capacity: int, refill_per_sec: float) -> None:
+        self.capacity = max(1, capacity)
+        self.refill_per_sec = refill_per_sec
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token if available; otherwise return seconds to wait before retrying."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self.refill_per_sec <= 0:
+                return 0.0
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.refill_per_sec
+
+    def acquire(self) -> None:
+        while (delay := self._reserve()) > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        while (delay := self._reserve()) > 0:
+            await asyncio.sleep(delay)
+
+    def block_for(self, seconds: float) -> None:
+        """Hold all callers for the given number of seconds."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers) -> None:
+        """Pause until the window resets once X reports no remaining quota."""
+        if headers.get("x-rate-limit-remaining") != "0":
+            return
+        reset = headers.get("x-rate-limit-reset")
+        if reset and reset.isdigit():
+            self.block_for(max(0, int(reset) - time.time()) + _RESET_BUFFER_SECONDS)
+
+
+def _build_limiter() -> RateLimiter:
+    interval = settings.x_min_seconds_between_calls
+    return RateLimiter(settings.x_rate_limit_burst, 1 / interval if interval > 0 else 0.0)
+
+
+_LIMITER = _build_limiter()
+
+
+def _build_session() -> requests.Session:
+    # 429s are handled by _rate_limited_get, so only retry transient server errors here.
+    retries = Retry(
+        total=_SERVER_RETRIES,
+        backoff_factor=_SERVER_BACKOFF_FACTOR,
+        status_forcelist=_SERVER_ERROR_STATUSES,
+        allowed_methods=["GET"],
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries))
+    return session
+
+
+_SESSION = _build_session()
 
 STATUS_ID_RE = re.compile(r"/status/(\d+)")
+_TWEET_FIELDS = "text,created_at,author_id,conversation_id,entities"
+_BATCH_SIZE = 100
 
 
 def extract_status_id(url: str) -> Optional[str]:
@@ -27,28 +112,68 @@ def _bearer_headers() -> dict:
     return {"Authorization": f"Bearer {settings.x_bearer_token}"}
 
 
-def fetch_tweet_payload(status_id: str) -> dict:
-    global _last_call_ts
-    if _last_call_ts is not None:
-        elapsed = time.time() - _last_call_ts
-        delay = max(0.0, settings.x_min_seconds_between_calls - elapsed)
-        if delay > 0:
-            time.sleep(delay)
+def _chunked(items: list[str], size: int) -> Iterator[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
 
-    url = f"https://api.x.com/2/tweets/{status_id}"
-    params = {"tweet.fields": "text,created_at,author_id,conversation_id,entities"}
-    resp = requests.get(url, headers=_bearer_headers(), params=params, timeout=20)
-    if resp.status_code == 429:
-        reset = resp.headers.get("x-rate-limit-reset")
-        if reset and reset.isdigit():
-            wait_for = max(0, int(reset) - int(time.time()) + 1)
-            time.sleep(wait_for)
-            resp = requests.get(url, headers=_bearer_headers(), params=params, timeout=20)
+
+def _reset_delay(resp: requests.Response | httpx.Response) -> float | None:
+    """Seconds to wait after a 429, preferring Retry-After over the window reset."""
+    retry_after = resp.headers.get("retry-after")
+    if retry_after and retry_after.isdigit():
+        return int(retry_after)
+    reset = resp.headers.get("x-rate-limit-reset")
+    if not reset or not reset.isdigit():
+        return None
+    return max(0, int(reset) - int(time.time()) + 1)
+
+
+def _wait_for_reset(resp: requests.Response | httpx.Response) -> bool:
+    """Hold all callers until a 429's rate-limit window resets; return True if a retry is worthwhile."""
+    if resp.status_code != 429:
+        return False
+    wait_for = _reset_delay(resp)
+    if wait_for is None:
+        return False
+    _LIMITER.block_for(wait_for)
+    return True
+
+
+def _rate_limited_get(url: str, params: dict | None = None, timeout: int = 20) -> dict:
+    """GET an X API endpoint through the shared rate limiter with a single 429 retry."""
+    _LIMITER.acquire()
+    resp = _SESSION.get(url, headers=_bearer_headers(), params=params, timeout=timeout)
+    if _wait_for_reset(resp):
+        _LIMITER.acquire()
+        resp = _SESSION.get(url, headers=_bearer_headers(), params=params, timeout=timeout)
+    _LIMITER.update_from_headers(resp.headers)
     resp.raise_for_status()
-    _last_call_ts = time.time()
-    data = resp.json()
-    payload = data.get("data") or {}
-    text = payload.get("text", "")
+    return orjson.loads(resp.content)
+
+
+async def _get_with_server_retries(client: httpx.AsyncClient, url: str, params: dict | None) -> httpx.Response:
+    """GET with the same bounded 5xx retry and backoff that _SESSION's Retry applies."""
+    for attempt in range(_SERVER_RETRIES):
+        resp = await client.get(url, params=params)
+        if resp.status_code not in _SERVER_ERROR_STATUSES:
+            return resp
+        await asyncio.sleep(_SERVER_BACKOFF_FACTOR * 2 ** attempt)
+    return await client.get(url, params=params)
+
+
+async def _rate_limited_get_async(client: httpx.AsyncClient, url: str, params: dict | None = None) -> dict:
+    """Async counterpart of _rate_limited_get, sharing its rate limiter and 429 handling."""
+    await _LIMITER.acquire_async()
+    resp = await _get_with_server_retries(client, url, params)
+    if _wait_for_reset(resp):
+        await _LIMITER.acquire_async()
+        resp = await _get_with_server_retries(client, url, params)
+    _LIMITER.update_from_headers(resp.headers)
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
+
+
+def _tweet_payload(payload: dict) -> dict:
     urls = []
     entities = payload.get("entities") or {}
     for item in entities.get("urls", []) or []:
@@ -56,61 +181,75 @@ def fetch_tweet_payload(status_id: str) -> dict:
         if expanded:
             urls.append(expanded)
     return {
-        "text": text,
+        "text": payload.get("text", ""),
         "urls": urls,
         "author_id": payload.get("author_id"),
         "conversation_id": payload.get("conversation_id"),
     }
 
 
+def fetch_tweet_payload(status_id: str) -> dict:
+    url = f"https://api.x.com/2/tweets/{status_id}"
+    params = {"tweet.fields": _TWEET_FIELDS}
+    data = _rate_limited_get(url, params=params)
+    return _tweet_payload(data.get("data") or {})
+
+
+async def fetch_tweet_payloads_async(status_ids: list[str]) -> dict[str, dict]:
+    """Fetch many tweets concurrently, one request per batch of 100 ids."""
+    ids = list(dict.fromkeys(status_id for status_id in status_ids if status_id))
+    if not ids:
+        return {}
+    semaphore = asyncio.Semaphore(settings.x_max_concurrency)
+
+    # Connection errors are retried by the transport, like the sync session's Retry
+    transport = httpx.AsyncHTTPTransport(retries=_SERVER_RETRIES)
+    async with httpx.AsyncClient(headers=_bearer_headers(), timeout=20, transport=transport) as client:
+        async def _fetch(batch: list[str]) -> dict:
+            params = {"ids": ",".join(batch), "tweet.fields": _TWEET_FIELDS}
+            async with semaphore:
+                return await _rate_limited_get_async(client, "https://api.x.com/2/tweets", params=params)
+
+        responses = await asyncio.gather(*[_fetch(batch) for batch in _chunked(ids, _BATCH_SIZE)])
+
+    payloads: dict[str, dict] = {}
+    for data in responses:
+        for item in data.get("data") or []:
+            if item.get("id"):
+                payloads[item["id"]] = _tweet_payload(item)
+    return payloads
+
+
 def fetch_tweet_text(status_id: str) -> str:
     return fetch_tweet_payload(status_id).get("text", "")
 
 
 def fetch_username(author_id: str) -> Optional[str]:
-    global _last_call_ts
-    if _last_call_ts is not None:
-        elapsed = time.time() - _last_call_ts
-        delay = max(0.0, settings.x_min_seconds_between_calls - elapsed)
-        if delay > 0:
-            time.sleep(delay)
     url = f"https://api.x.com/2/users/{author_id}"
-    resp = requests.get(url, headers=_bearer_headers(), timeout=20)
-    if resp.status_code == 429:
-        reset = resp.headers.get("x-rate-limit-reset")
-        if reset and reset.isdigit():
-            wait_for = max(0, int(reset) - int(time.time()) + 1)
-            time.sleep(wait_for)
-            resp = requests.get(url, headers=_bearer_headers(), timeout=20)
-    resp.raise_for_status()
-    _last_call_ts = time.time()
-    data = resp.json()
+    data = _rate_limited_get(url)
     return (data.get("data") or {}).get("username")
 
 
+def fetch_usernames(author_ids: list[str]) -> dict[str, str]:
+    """Resolve many author ids to usernames in batches of 100."""
+    ids = list(dict.fromkeys(author_id for author_id in author_ids if author_id))
+    usernames: dict[str, str] = {}
+    for batch in _chunked(ids, _BATCH_SIZE):
+        data = _rate_limited_get("https://api.x.com/2/users", params={"ids": ",".join(batch)})
+        for user in data.get("data") or []:
+            if user.get("id") and user.get("username"):
+                usernames[user["id"]] = user["username"]
+    return usernames
+
+
 def fetch_thread_text(conversation_id: str, username: str) -> list[str]:
-    global _last_call_ts
-    if _last_call_ts is not None:
-        elapsed = time.time() - _last_call_ts
-        delay = max(0.0, settings.x_min_seconds_between_calls - elapsed)
-        if delay > 0:
-            time.sleep(delay)
     url = "https://api.x.com/2/tweets/search/recent"
     params = {
         "query": f"conversation_id:{conversation_id} from:{username}",
         "max_results": 100,
         "tweet.fields": "created_at",
     }
-    resp = requests.get(url, headers=_bearer_headers(), params=params, timeout=20)
-    if resp.status_code == 429:
-        reset = resp.headers.get("x-rate-limit-reset")
-        if reset and reset.isdigit():
-            wait_for = max(0, int(reset) - int(time.time()) + 1)
-            time.sleep(wait_for)
-            resp = requests.get(url, headers=_bearer_headers(), params=params, timeout=20)
-    resp.raise_for_status()
-    _last_call_ts = time.time()
-    data = resp.json()
+    data = _rate_limited_get(url, params=params)
     tweets = data.get("data") or []
     tweets.sort(key=lambda item: item.get("created_at", ""))
     return [item.get("text", "") for item in tweets if item.get("text")]
@@ -118,12 +257,6 @@ def fetch_thread_text(conversation_id: str, username: str) -> list[str]:
 
 def search_recent_tweets(query: str, max_results: int = 10) -> list[dict]:
     """Search recent tweets by query and return text + metrics + author info."""
-    global _last_call_ts
-    if _last_call_ts is not None:
-        elapsed = time.time() - _last_call_ts
-        delay = max(0.0, settings.x_min_seconds_between_calls - elapsed)
-        if delay > 0:
-            time.sleep(delay)
     url = "https://api.x.com/2/tweets/search/recent"
     params = {
         "query": query,
@@ -132,16 +265,7 @@ def search_recent_tweets(query: str, max_results: int = 10) -> list[dict]:
         "expansions": "author_id",
         "user.fields": "username,name",
     }
-    resp = requests.get(url, headers=_bearer_headers(), params=params, timeout=20)
-    if resp.status_code == 429:
-        reset = resp.headers.get("x-rate-limit-reset")
-        if reset and reset.isdigit():
-            wait_for = max(0, int(reset) - int(time.time()) + 1)
-            time.sleep(wait_for)
-            resp = requests.get(url, headers=_bearer_headers(), params=params, timeout=20)
-    resp.raise_for_status()
-    _last_call_ts = time.time()
-    data = resp.json()
+    data = _rate_limited_get(url, params=params)
     tweets = data.get("data") or []
     users = {user.get("id"): user for user in (data.get("includes") or {}).get("users", []) or []}
     results = []
@@ -1,9 +1,13 @@
 """X trend digest helpers."""
 from __future__ import annotations
 
+import heapq
 from collections import Counter
+from itertools import chain
 from typing import Any
 
+import orjson
+
 from app.services.x_client import search_recent_tweets
 from app.services.topic_utils import build_or_query, normalize_terms
 from app.services.openai_compat_client import OpenAICompatClient
@@ -14,10 +18,10 @@ def _score(metrics: dict | None) -> int:
     if not metrics:
         return 0
     return (
-        int(metrics.get("like_count", 0))
-        + 2 * int(metrics.get("retweet_count", 0))
-        + int(metrics.get("reply_count", 0))
-        + int(metrics.get("quote_count", 0))
+        int(metrics.get("like_count") or 0)
+        + 2 * int(metrics.get("retweet_count") or 0)
+        + int(metrics.get("reply_count") or 0)
+        + int(metrics.get("quote_count") or 0)
     )
 
 
@@ -32,16 +36,13 @@ def build_trend_digest(
     tweets = search_recent_tweets(query, max_results=max_results)
 
     by_author: dict[str, dict[str, Any]] = {}
-    url_counts: Counter[str] = Counter()
-
-    for tweet in tweets:
-        for url in tweet.get("urls", []) or []:
-            url_counts[url] += 1
+    url_counts: Counter[str] = Counter(chain.from_iterable(tweet.get("urls") or () for tweet in tweets))
 
+    scores = [_score(tweet.get("public_metrics")) for tweet in tweets]
+    for tweet, score in zip(tweets, scores):
         author_id = tweet.get("author_id") or "unknown"
-        score = _score(tweet.get("public_metrics"))
         current = by_author.get(author_id)
-        if current is None or score > current.get("score", 0):
+        if current is None or score > current["score"]:
             by_author[author_id] = {
                 "author_id": author_id,
                 "username": tweet.get("username"),
@@ -51,7 +52,7 @@ def build_trend_digest(
                 "urls": tweet.get("urls", []),
             }
 
-    top_authors_list = sorted(by_author.values(), key=lambda item: item.get("score", 0), reverse=True)[:top_authors]
+    top_authors_list = heapq.nlargest(top_authors, by_author.values(), key=lambda item: item["score"])
     top_urls_list = [{"url": url, "mentions": count} for url, count in url_counts.most_common(top_urls)]
 
     return {
@@ -62,6 +63,18 @@ def build_trend_digest(
     }
 
 
+def _prompt_projection(digest: dict[str, Any]) -> dict[str, Any]:
+    """Keep only the digest fields the summary prompt needs, with short keys."""
+    return {
+        "authors": [
+            {"u": author.get("username"), "s": author.get("score", 0), "t": (author.get("tweet") or "")[:280]}
+            for author in digest.get("top_authors", [])
+        ],
+        "urls": [[item.get("url"), item.get("mentions", 0)] for item in digest.get("top_urls", [])],
+        "tweets": [tweet.get("text", "") for tweet in digest.get("tweets", [])[:10]],
+    }
+
+
 async def summarize_trends(digest: dict[str, Any]) -> str:
     if not settings.grok_api_key:
         return ""
@@ -77,9 +90,9 @@ async def summarize_trends(digest: dict[str, Any]) -> str:
     )
     user_prompt = (
         "Provide a concise summary (200-300 words) and bullet list of key claims. "
-        "Use only the provided data; do not invent.\n\n"
-        f"Top authors: {digest.get('top_authors', [])}\n"
-        f"Top URLs: {digest.get('top_urls', [])}\n"
-        f"Sample tweets: {digest.get('tweets', [])[:10]}"
+        "Use only the provided data; do not invent.\n"
+        "Data keys: authors (u=username, s=engagement score, t=top tweet), "
+        "urls ([url, mentions]), tweets (sample texts).\n\n"
+        "```json\n" + orjson.dumps(_prompt_projection(digest)).decode() + "\n```"
     )
     return await client.generate(system_prompt, user_prompt, max_tokens=600)
@@ -13,8 +13,14 @@ Features:
 """
 
 import os
+import re
 import json
+import hashlib
 import logging
+import threading
+from functools import lru_cache, wraps
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
@@ -29,6 +35,14 @@ try:
 except ImportError:
     tiktoken = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can catch either
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 try:
     from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 except ImportError:
@@ -46,6 +60,194 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+SYSTEM_PROMPT = "You are a conservative book-structure tagger. Output strict JSON only, matching the provided schema."
+
+# Static instructions and schema, filled in per call with str.format_map
+_PROMPT_TEMPLATE = """Given this raw text chunk ({chunk_number}/{total_chunks}), detect chapters, headings (H1-H3), paragraphs, quotes, code blocks, images (with nearby captions), footnotes, and front/back matter.
+
+Do not typeset; do not invent content; do not reword. Return JSON with exact original text (preserve italics/ALL CAPS markers), plus {{full_bleed:true|false}} hints if a line says 'FULL PAGE IMAGE' etc.
+
+JSON Schema:
+{{
+  "blocks": [
+    {{
+      "type": "chapter|heading|paragraph|quote|footnote|front_matter|back_matter|image",
+      "level": 1-3,  // for headings only
+      "text": "exact original text",
+      "style": "normal|blockquote|italic|bold|code",
+      "metadata": {{
+        "full_bleed": false,
+        "attribution": "",  // for quotes
+        "caption": "",      // for images
+        "reference": ""     // for footnotes
+      }}
+    }}
+  ],
+  "chunk_info": {{
+    "chunk_number": {chunk_number},
+    "total_chunks": {total_chunks},
+    "word_count": {word_count}
+  }}
+}}
+
+Text to analyze:
+{text_chunk}
+"""
+
+_BATCH_PROMPT_TEMPLATE = """Given these raw text chunks ({first_number}-{last_number} of {total_chunks}), detect chapters, headings (H1-H3), paragraphs, quotes, code blocks, images (with nearby captions), footnotes, and front/back matter in each chunk independently.
+
+Do not typeset; do not invent content; do not reword. Return JSON with exact original text (preserve italics/ALL CAPS markers), plus {{full_bleed:true|false}} hints if a line says 'FULL PAGE IMAGE' etc.
+
+JSON Schema:
+{{
+  "results": [
+    {{
+      "id": <chunk id from input>,
+      "blocks": [
+        {{
+          "type": "chapter|heading|paragraph|quote|footnote|front_matter|back_matter|image",
+          "level": 1-3,  // for headings only
+          "text": "exact original text",
+          "style": "normal|blockquote|italic|bold|code",
+          "metadata": {{
+            "full_bleed": false,
+            "attribution": "",  // for quotes
+            "caption": "",      // for images
+            "reference": ""     // for footnotes
+          }}
+        }}
+      ]
+    }}
+  ]
+}}
+
+Chunks to analyze (JSON):
+{payload}
+"""
+
+
+# Default location for cached API responses (override with KDP_AI_CACHE_DIR)
+DEFAULT_CACHE_DIR = Path(os.getenv("KDP_AI_CACHE_DIR", Path.home() / ".cache" / "kdp_formatter" / "ai"))
+
+
+def _disk_cached(func):
+    """Cache parsed API responses on disk, keyed by model, system prompt and prompt"""
+    @wraps(func)
+    def wrapper(self, prompt: str, chunk_info: Optional[Dict] = None) -> Dict[str, Any]:
+        if self.cache_dir is None:
+            return func(self, prompt, chunk_info)
+
+        key = hashlib.blake2b(
+            "\n".join((self.model, SYSTEM_PROMPT, prompt)).encode("utf-8"), digest_size=16
+        ).hexdigest()
+        cache_path = self.cache_dir / f"{key}.json"
+        try:
+            result = _json_loads(cache_path.read_bytes())
+            logger.info(f"Cache hit for {chunk_info or 'prompt'} ({key})")
+            return result
+        except (OSError, ValueError):
+            pass
+
+        result = func(self, prompt, chunk_info)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent workers never read a partial file
+            tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write AI response cache {cache_path}: {e}")
+        return result
+    return wrapper
+
+
+# Paragraphs that can be tagged without the API: front matter boilerplate and bare chapter titles
+_FRONT_MATTER_RE = re.compile(
+    r"^(copyright\b|©|\(c\)\s*\d{4}|isbn\b|all rights reserved|published by\b|printed in\b"
+    r"|first (edition|published)\b|library of congress\b|cover design\b)",
+    re.IGNORECASE
+)
+_TOC_HEADING_RE = re.compile(r"^(table of )?contents$", re.IGNORECASE)
+_CHAPTER_TITLE_RE = re.compile(
+    r"^chapter\s+(\d+|[ivxlc]+|one|two|three|four|five|six|seven|eight|nine|ten)\b",
+    re.IGNORECASE
+)
+_CHAPTER_TITLE_MAX_CHARS = 80
+
+
+def _heuristic_blocks(text_chunk: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Classify a chunk locally when every paragraph is obvious
+
+    Returns blocks only if each paragraph is front matter boilerplate, a table
+    of contents, or a short chapter title; otherwise None so the API decides.
+    """
+    paragraphs = [p.strip() for p in text_chunk.split("\n\n") if p.strip()]
+    if not paragraphs:
+        return None
+
+    in_toc = False
+    blocks = []
+    for paragraph in paragraphs:
+        if _TOC_HEADING_RE.match(paragraph):
+            in_toc = True
+            block_type = "front_matter"
+        elif _FRONT_MATTER_RE.match(paragraph):
+            block_type = "front_matter"
+        elif "\n" not in paragraph and len(paragraph) <= _CHAPTER_TITLE_MAX_CHARS \
+                and _CHAPTER_TITLE_RE.match(paragraph):
+            # Chapter titles listed under a contents heading are TOC entries
+            block_type = "front_matter" if in_toc else "chapter"
+        else:
+            return None
+        blocks.append({"type": block_type, "text": paragraph, "style": "normal", "metadata": {}})
+    return blocks
+
+
+def _salvage_partial_results(content: str) -> Optional[Dict[str, Any]]:
+    """
+    Recover the complete per-chunk results of a truncated batched response
+
+    Scans the "results" array item by item and keeps every chunk result that
+    closed before the output was cut off; chunks missing from the salvaged
+    results are re-run individually by detect_structure_batch. Single-chunk
+    responses are not salvaged since a partial block list would drop text.
+    """
+    key_pos = content.find('"results"')
+    pos = content.find("[", key_pos) if key_pos >= 0 else -1
+    if pos < 0:
+        return None
+
+    decoder = json.JSONDecoder()
+    pos += 1
+    items = []
+    while True:
+        while pos < len(content) and content[pos] in " \t\r\n,":
+            pos += 1
+        try:
+            item, pos = decoder.raw_decode(content, pos)
+        except json.JSONDecodeError:
+            break
+        items.append(item)
+    return {"results": items} if items else None
+
+
+@lru_cache(maxsize=None)
+def _encoding_for_model(model: str):
+    """Return the (process-wide cached) tiktoken encoding for a model, or None if unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use and may be unavailable offline
+        logger.warning(f"tiktoken encoding unavailable, approximating token counts: {e}")
+        return None
+
+
 @dataclass
 class CostTracker:
     """Tracks API usage costs and metadata"""
@@ -55,30 +257,39 @@ class CostTracker:
     total_cost: float = 0.0
     api_calls: int = 0
     model_used: str = ""
+    heuristic_chunks: int = 0
     calls: List[Dict[str, Any]] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def add_call(self, tokens_used: int, prompt_tokens: int, completion_tokens: int,
                  cost: float, model: str, chunk_info: Optional[Dict] = None):
-        """Record a single API call"""
-        self.api_calls += 1
-        self.total_tokens += tokens_used
-        self.prompt_tokens += prompt_tokens
-        self.completion_tokens += completion_tokens
-        self.total_cost += cost
-        self.model_used = model
-
-        call_info = {
-            "call_number": self.api_calls,
-            "model": model,
-            "tokens_used": tokens_used,
-            "prompt_tokens": prompt_tokens,
-            "completion_tokens": completion_tokens,
-            "cost": cost,
-            "chunk_info": chunk_info or {}
-        }
-        self.calls.append(call_info)
+        """Record a single API call (safe to call from worker threads)"""
+        with self._lock:
+            self.api_calls += 1
+            self.total_tokens += tokens_used
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.total_cost += cost
+            self.model_used = model
+
+            call_number = self.api_calls
+            call_info = {
+                "call_number": call_number,
+                "model": model,
+                "tokens_used": tokens_used,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "cost": cost,
+                "chunk_info": chunk_info or {}
+            }
+            self.calls.append(call_info)
+
+        logger.info(f"API Call {call_number}: {tokens_used} tokens, ${cost:.6f} ({model})")
 
-        logger.info(f"API Call {self.api_calls}: {tokens_used} tokens, ${cost:.6f} ({model})")
+    def add_heuristic_chunk(self):
+        """Record a chunk classified locally without an API call"""
+        with self._lock:
+            self.heuristic_chunks += 1
 
     def get_summary(self) -> Dict[str, Any]:
         """Get cost and usage summary"""
@@ -89,29 +300,41 @@ class CostTracker:
             "completion_tokens": self.completion_tokens,
             "total_cost": round(self.total_cost, 6),
             "model_used": self.model_used,
-            "calls": self.calls
+            "heuristic_chunks": self.heuristic_chunks,
+            "calls": list(self.calls)
         }
 
     def reset(self):
         """Reset all counters"""
-        self.total_tokens = 0
-        self.prompt_tokens = 0
-        self.completion_tokens = 0
-        self.total_cost = 0.0
-        self.api_calls = 0
-        self.calls.clear()
+        with self._lock:
+            self.total_tokens = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.total_cost = 0.0
+            self.api_calls = 0
+            self.heuristic_chunks = 0
+            self.calls.clear()
 
 
 class AIStructureDetector:
     """AI-powered document structure detection using OpenAI"""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4-turbo-preview"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4-turbo-preview",
+                 max_concurrency: int = 8, batch_size: int = 4, batch_token_budget: int = 2400,
+                 cache_dir: Optional[Path] = DEFAULT_CACHE_DIR, stream: bool = False):
         """
         Initialize AI detector
 
         Args:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             model: OpenAI model to use (gpt-4-turbo-preview or gpt-3.5-turbo)
+            max_concurrency: Maximum number of chunk API calls in flight at once
+            batch_size: Maximum number of chunks tagged in a single API call
+            batch_token_budget: Maximum chunk-text tokens per batched call; the model
+                echoes the text back, so this must leave room within max_tokens
+            cache_dir: Directory for cached API responses, or None to disable caching
+            stream: Stream completions instead of waiting for the full body; streamed
+                responses carry no usage data, so cost is estimated with tiktoken
         """
         if openai is None:
             raise ImportError("openai package is required for AI detection")
@@ -122,7 +345,13 @@ class AIStructureDetector:
 
         self.client = OpenAI(api_key=self.api_key)
         self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_size = max(1, batch_size)
+        self.batch_token_budget = batch_token_budget
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.stream = stream
         self.cost_tracker = CostTracker()
+        self._encoding = _encoding_for_model(model)
 
         # Pricing per 1k tokens (as of 2024)
         self.pricing = {
@@ -132,13 +361,23 @@ class AIStructureDetector:
 
         # Note: Keep self.model as given, fallback pricing will be used in cost calculations
 
-    def chunk_text(self, text: str, chunk_size: int = 2000) -> List[str]:
+    def count_tokens(self, text: str) -> int:
+        """Count tokens in text (approximated as chars / 4 without tiktoken)"""
+        if self._encoding is None:
+            return len(text) // 4
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def chunk_text(self, text: str, chunk_size: int = 600) -> List[str]:
         """
         Split text into manageable chunks for API calls
 
+        Chunks are measured in model tokens and cut at the last paragraph
+        break (or word boundary) before the limit. Without tiktoken the
+        limit is approximated as chunk_size * 4 characters.
+
         Args:
             text: Full document text
-            chunk_size: Target chunk size in characters (approximates token count)
+            chunk_size: Target chunk size in tokens
 
         Returns:
             List of text chunks
@@ -146,6 +385,48 @@ class AIStructureDetector:
         if not text:
             return []
 
+        if self._encoding is None:
+            chunks = self._chunk_text_by_chars(text, chunk_size * 4)
+        else:
+            chunks = self._chunk_text_by_tokens(text, chunk_size)
+
+        if chunks:
+            logger.info(f"Split text into {len(chunks)} chunks (avg {len(text)/len(chunks):.0f} chars each)")
+        return chunks
+
+    def _chunk_text_by_tokens(self, text: str, chunk_size: int) -> List[str]:
+        """Slice the token stream of text into chunks of at most chunk_size tokens"""
+        enc = self._encoding
+        ids = enc.encode(text, disallowed_special=())
+        chunks = []
+        start = 0
+        while start < len(ids):
+            end = min(start + chunk_size, len(ids))
+            if end < len(ids):
+                end = self._find_token_cut(ids, start, end)
+            chunk = enc.decode(ids[start:end]).strip()
+            if chunk:
+                chunks.append(chunk)
+            start = end
+        return chunks
+
+    def _find_token_cut(self, ids: List[int], start: int, end: int) -> int:
+        """Pick a cut point in ids[start:end], preferring paragraph breaks then word starts"""
+        token_bytes = self._encoding.decode_single_token_bytes
+        floor = start + (end - start) // 2
+        word_cut = None
+        for i in range(end - 1, floor, -1):
+            piece = token_bytes(ids[i])
+            if b"\n\n" in piece:
+                # Cut before the token if the break is its leading whitespace
+                lead = piece[:len(piece) - len(piece.lstrip())]
+                return i if piece.strip() and b"\n\n" in lead else i + 1
+            if word_cut is None and piece[:1] in (b" ", b"\n"):
+                word_cut = i
+        return word_cut or end
+
+    def _chunk_text_by_chars(self, text: str, chunk_size: int) -> List[str]:
+        """Split text on whitespace into chunks of roughly chunk_size characters"""
         chunks = []
         words = text.split()
         current_chunk = []
@@ -166,9 +447,9 @@ class AIStructureDetector:
         if current_chunk:
             chunks.append(' '.join(current_chunk))
 
-        logger.info(f"Split text into {len(chunks)} chunks (avg {len(text)/len(chunks):.0f} chars each)")
         return chunks
 
+    @_disk_cached
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -191,7 +472,7 @@ class AIStructureDetector:
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a conservative book-structure tagger. Output strict JSON only, matching the provided schema."
+                        "content": SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -200,44 +481,70 @@ class AIStructureDetector:
                 ],
                 temperature=0,  # Deterministic output
                 max_tokens=4000,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                stream=self.stream
             )
+        except openai.APIError as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise
 
-            # Parse response
+        if self.stream:
+            content = self._read_stream(response)
+            usage = None
+        else:
             content = response.choices[0].message.content
-            result = json.loads(content)
-
-            # Track costs
             usage = response.usage
-            if usage:
-                prompt_tokens = usage.prompt_tokens
-                completion_tokens = usage.completion_tokens
-                total_tokens = usage.total_tokens
-
-                # Calculate cost using fallback pricing if model not defined
-                pricing = self.pricing.get(self.model, self.pricing["gpt-4-turbo-preview"])
-                if self.model not in self.pricing:
-                    logger.warning(f"Using fallback pricing for unknown model {self.model}")
-
-                input_cost = (prompt_tokens / 1000) * pricing["input"]
-                output_cost = (completion_tokens / 1000) * pricing["output"]
-                total_cost = input_cost + output_cost
-
-                self.cost_tracker.add_call(
-                    tokens_used=total_tokens,
-                    prompt_tokens=prompt_tokens,
-                    completion_tokens=completion_tokens,
-                    cost=total_cost,
-                    model=self.model,
-                    chunk_info=chunk_info
-                )
-
-            return result
 
-        except openai.APIError as e:
-            logger.error(f"OpenAI API error: {e}")
-            raise
+        # Track costs before parsing so truncated responses are still billed
+        self._track_usage(prompt, content, usage, chunk_info)
+        return self._parse_response(content)
+
+    def _read_stream(self, stream) -> str:
+        """Consume a streamed completion, joining content deltas as they arrive"""
+        parts = []
+        for event in stream:
+            if event.choices and event.choices[0].delta.content:
+                parts.append(event.choices[0].delta.content)
+        return "".join(parts)
+
+    def _track_usage(self, prompt: str, content: str, usage, chunk_info: Optional[Dict]):
+        """Record token usage and cost; streamed responses are estimated with tiktoken"""
+        if usage:
+            prompt_tokens = usage.prompt_tokens
+            completion_tokens = usage.completion_tokens
+        elif self.stream:
+            prompt_tokens = self.count_tokens(SYSTEM_PROMPT) + self.count_tokens(prompt)
+            completion_tokens = self.count_tokens(content or "")
+        else:
+            return
+
+        # Calculate cost using fallback pricing if model not defined
+        pricing = self.pricing.get(self.model, self.pricing["gpt-4-turbo-preview"])
+        if self.model not in self.pricing:
+            logger.warning(f"Using fallback pricing for unknown model {self.model}")
+
+        input_cost = (prompt_tokens / 1000) * pricing["input"]
+        output_cost = (completion_tokens / 1000) * pricing["output"]
+
+        self.cost_tracker.add_call(
+            tokens_used=prompt_tokens + completion_tokens,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost=input_cost + output_cost,
+            model=self.model,
+            chunk_info=chunk_info
+        )
+
+    def _parse_response(self, content: Optional[str]) -> Dict[str, Any]:
+        """Parse the JSON response, salvaging complete chunk results from a truncated batch"""
+        content = content or ""
+        try:
+            return _json_loads(content)
         except json.JSONDecodeError as e:
+            salvaged = _salvage_partial_results(content)
+            if salvaged:
+                logger.warning(f"Truncated JSON response from OpenAI; recovered {len(salvaged['results'])} chunk results")
+                return salvaged
             logger.error(f"Failed to parse OpenAI response as JSON: {e}")
             raise ValueError(f"Invalid JSON response from OpenAI: {content[:200]}...")
 
@@ -254,41 +561,22 @@ class AIStructureDetector:
         Returns:
             Structured data dictionary
         """
-        prompt = f"""Given this raw text chunk ({chunk_number}/{total_chunks}), detect chapters, headings (H1-H3), paragraphs, quotes, code blocks, images (with nearby captions), footnotes, and front/back matter.
-
-Do not typeset; do not invent content; do not reword. Return JSON with exact original text (preserve italics/ALL CAPS markers), plus {{full_bleed:true|false}} hints if a line says 'FULL PAGE IMAGE' etc.
-
-JSON Schema:
-{{
-  "blocks": [
-    {{
-      "type": "chapter|heading|paragraph|quote|footnote|front_matter|back_matter|image",
-      "level": 1-3,  // for headings only
-      "text": "exact original text",
-      "style": "normal|blockquote|italic|bold|code",
-      "metadata": {{
-        "full_bleed": false,
-        "attribution": "",  // for quotes
-        "caption": "",      // for images
-        "reference": ""     // for footnotes
-      }}
-    }}
-  ],
-  "chunk_info": {{
-    "chunk_number": {chunk_number},
-    "total_chunks": {total_chunks},
-    "word_count": {len(text_chunk.split())}
-  }}
-}}
+        local_result = self._heuristic_result(text_chunk, chunk_number, total_chunks)
+        if local_result is not None:
+            return local_result
 
-Text to analyze:
-{text_chunk}
-"""
+        word_count = len(text_chunk.split())
+        prompt = _PROMPT_TEMPLATE.format_map({
+            "chunk_number": chunk_number,
+            "total_chunks": total_chunks,
+            "word_count": word_count,
+            "text_chunk": text_chunk
+        })
 
         chunk_info = {
             "chunk_number": chunk_number,
             "total_chunks": total_chunks,
-            "word_count": len(text_chunk.split())
+            "word_count": word_count
         }
 
         try:
@@ -308,6 +596,129 @@ Text to analyze:
                 "chunk_info": chunk_info
             }
 
+    def _heuristic_result(self, text_chunk: str, chunk_number: int,
+                          total_chunks: int) -> Optional[Dict[str, Any]]:
+        """Return a locally built result for an obvious chunk, or None"""
+        blocks = _heuristic_blocks(text_chunk)
+        if blocks is None:
+            return None
+        self.cost_tracker.add_heuristic_chunk()
+        logger.info(f"Classified chunk {chunk_number}/{total_chunks} heuristically (no API call)")
+        return {
+            "blocks": blocks,
+            "chunk_info": {
+                "chunk_number": chunk_number,
+                "total_chunks": total_chunks,
+                "word_count": len(text_chunk.split()),
+                "heuristic": True
+            }
+        }
+
+    def detect_structure_batch(self, text_chunks: List[str], start_number: int = 1,
+                               total_chunks: int = 1) -> List[Dict[str, Any]]:
+        """
+        Detect structure in several chunks with a single API call
+
+        The schema and instructions are sent once for the whole batch instead of
+        once per chunk. Obvious chunks are classified locally, and chunks missing
+        from the response fall back to individual detect_structure_chunk calls.
+
+        Args:
+            text_chunks: Consecutive text chunks to analyze
+            start_number: Chunk number of the first chunk in the batch
+            total_chunks: Total number of chunks (for context)
+
+        Returns:
+            One structured data dictionary per input chunk, in input order
+        """
+        if len(text_chunks) == 1:
+            return [self.detect_structure_chunk(text_chunks[0], start_number, total_chunks)]
+
+        numbers = list(range(start_number, start_number + len(text_chunks)))
+        results: Dict[int, Dict[str, Any]] = {}
+        pending: List[Tuple[int, str]] = []
+        for number, chunk in zip(numbers, text_chunks):
+            local_result = self._heuristic_result(chunk, number, total_chunks)
+            if local_result is not None:
+                results[number] = local_result
+            else:
+                pending.append((number, chunk))
+
+        if len(pending) > 1:
+            word_counts = {number: len(chunk.split()) for number, chunk in pending}
+            by_id = self._call_batch(pending, total_chunks, sum(word_counts.values()))
+            for number, _ in pending:
+                if number in by_id:
+                    results[number] = {
+                        "blocks": by_id[number],
+                        "chunk_info": {
+                            "chunk_number": number,
+                            "total_chunks": total_chunks,
+                            "word_count": word_counts[number]
+                        }
+                    }
+
+        for number, chunk in pending:
+            if number not in results:
+                results[number] = self.detect_structure_chunk(chunk, number, total_chunks)
+        return [results[number] for number in numbers]
+
+    def _call_batch(self, pending: List[Tuple[int, str]], total_chunks: int,
+                    word_count: int) -> Dict[int, List[Dict[str, Any]]]:
+        """Send several chunks in one API call and return their blocks keyed by chunk number"""
+        numbers = [number for number, _ in pending]
+        payload = json.dumps(
+            {"chunks": [{"id": number, "text": chunk} for number, chunk in pending]},
+            ensure_ascii=False
+        )
+        prompt = _BATCH_PROMPT_TEMPLATE.format_map({
+            "first_number": numbers[0],
+            "last_number": numbers[-1],
+            "total_chunks": total_chunks,
+            "payload": payload
+        })
+
+        batch_info = {
+            "chunk_numbers": numbers,
+            "total_chunks": total_chunks,
+            "word_count": word_count
+        }
+
+        by_id: Dict[int, List[Dict[str, Any]]] = {}
+        try:
+            result = self._call_openai_api(prompt, batch_info)
+            for item in result.get("results", []):
+                if not isinstance(item, dict) or not isinstance(item.get("blocks"), list):
+                    continue
+                try:
+                    by_id[int(item.get("id"))] = item["blocks"]
+                except (TypeError, ValueError):
+                    continue
+            logger.info(f"Successfully processed chunks {numbers[0]}-{numbers[-1]}/{total_chunks}")
+        except Exception as e:
+            logger.error(f"Failed to process chunks {numbers[0]}-{numbers[-1]}/{total_chunks}: {e}")
+        return by_id
+
+    def _group_batches(self, chunks: List[str]) -> List[Tuple[int, List[str]]]:
+        """Group consecutive chunks into batches bounded by count and token budget"""
+        batches: List[Tuple[int, List[str]]] = []
+        current: List[str] = []
+        current_tokens = 0
+        start = 1
+        for number, chunk in enumerate(chunks, 1):
+            tokens = self.count_tokens(chunk)
+            if current and (len(current) >= self.batch_size
+                            or current_tokens + tokens > self.batch_token_budget):
+                batches.append((start, current))
+                current, current_tokens = [], 0
+            if not current:
+                start = number
+            current.append(chunk)
+            current_tokens += tokens
+        if current:
+            batches.append((start, current))
+        return batches
+
     def detect_document_structure(self, text: str, metadata: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Detect complete document structure using AI
@@ -324,6 +735,9 @@ Text to analyze:
         """
         logger.info(f"Starting AI structure detection for document ({len(text)} chars, {len(text.split())} words)")
 
+        # Cost summary covers this document only, even when the detector is reused
+        self.cost_tracker.reset()
+
         # Chunk the text
         chunks = self.chunk_text(text)
         if not chunks:
@@ -334,15 +748,22 @@ Text to analyze:
                 "detection_metadata": {"error": "No text to process"}
             }
 
-        # Process each chunk
-        all_blocks = []
-        for i, chunk in enumerate(chunks, 1):
-            logger.info(f"Processing chunk {i}/{len(chunks)}")
-            chunk_result = self.detect_structure_chunk(chunk, i, len(chunks))
-
-            # Extract blocks from chunk result
-            chunk_blocks = chunk_result.get("blocks", [])
-            all_blocks.extend(chunk_blocks)
+        # Process batches concurrently; the API calls are I/O-bound so threads overlap them
+        total_chunks = len(chunks)
+        batches = self._group_batches(chunks)
+        workers = min(self.max_concurrency, len(batches))
+        logger.info(f"Processing {total_chunks} chunks in {len(batches)} batches with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.detect_structure_batch, batch, start, total_chunks)
+                for start, batch in batches
+            ]
+
+            # Collect in submission order to preserve document order
+            all_blocks = []
+            for future in futures:
+                for chunk_result in future.result():
+                    all_blocks.extend(chunk_result.get("blocks", []))
 
         # Aggregate results
         result = {
@@ -350,6 +771,7 @@ Text to analyze:
             "cost_summary": self.cost_tracker.get_summary(),
             "detection_metadata": {
                 "total_chunks": len(chunks),
+                "total_batches": len(batches),
                 "total_blocks": len(all_blocks),
                 "model_used": self.model,
                 "detection_method": "ai",
@@ -379,5 +801,11 @@ def detect_document_structure(text: str, metadata: Optional[Dict] = None,
     Returns:
         Structured document data with cost information
     """
-    detector = AIStructureDetector(api_key=api_key, model=model)
+    detector = _get_detector(api_key, model)
     return detector.detect_document_structure(text, metadata)
+
+
+@lru_cache(maxsize=4)
+def _get_detector(api_key: Optional[str], model: str) -> AIStructureDetector:
+    """Return a shared detector so the OpenAI client's connection pool is reused across documents"""
+    return AIStructureDetector(api_key=api_key, model=model)
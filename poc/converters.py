@@ -11,9 +11,15 @@ import os
 import re
 import subprocess
 import json
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from io import StringIO
 from pathlib import Path
-from typing import Optional, List
+from types import MappingProxyType
+from typing import Any, Callable, IO, Iterable, Iterator, Optional, List, Tuple
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 import re
 
 # #region agent log
@@ -25,16 +31,37 @@ def _debug_log(location, message, data=None, hypothesis_id=None):
 # #endregion
 
 try:
-    from pdfminer.high_level import extract_text
+    from pdfminer.converter import TextConverter as PDFMinerTextConverter
     from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+    from pdfminer.pdfpage import PDFPage
+
+    class _TextOnlyConverter(PDFMinerTextConverter):
+        """pdfminer text device that skips vector paths and images"""
+
+        def paint_path(self, gstate, stroke, fill, evenodd, path):
+            return
+
+        def render_image(self, name, stream):
+            return
 except ImportError:
-    extract_text = None
+    PDFPage = None
 
 try:
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, SoupStrainer
 except ImportError:
     BeautifulSoup = None
 
+# Prefer the C-backed lxml tree builder; fall back to the pure-Python parser
+try:
+    import lxml  # noqa: F401
+    _BS_PARSER = 'lxml'
+except ImportError:
+    _BS_PARSER = 'html.parser'
+
+# Tags PandocConverter.convert reads; everything else is skipped while parsing
+_PANDOC_STRAINER = SoupStrainer(['h1', 'h2', 'h3', 'p', 'blockquote']) if BeautifulSoup is not None else None
+
 try:
     from .idm_schema import IDMDocument, IDMChapter, IDMParagraph, IDMMetadata, IDMHeading, IDMQuote, IDMFootnote
 except ImportError:
@@ -49,9 +76,245 @@ except ImportError:
         detect_document_structure = None
 
 
+# Plain-text chapter headers: "Chapter 1", "Letter 1", "Part 1", "Section A", "1.", "I.", etc.
+_CHAPTER_OR_NUM_RE = re.compile('|'.join([
+    r'^(?:chapter|letter|part|section)\s+(?:\d+|[ivxlcdm]+|one|two|three|four|five|six|seven|eight|nine|ten|[a-z])',
+    r'^(?:\d+|[ivxlcdm]+)\.(?:\s+\S.{0,40})?$',
+]))
+# Characters a header line can start with (besides digits): chapter, letter,
+# part, section and roman numerals, in either case
+_HEADER_FIRST_CHARS = frozenset('clpsivxdmCLPSIVXDM')
+# Same headers at the start of any line, as a cheap check of whole documents
+_CHAPTER_MARKER_RE = re.compile(_CHAPTER_OR_NUM_RE.pattern, re.MULTILINE)
+_FOOTNOTE_NUM_RE = re.compile(r'\d+')
+_PARA_SPLIT_RE = re.compile(r'\n\s*\n')
+
+# Text files at least this large are decoded from a memory map rather than through a read buffer
+_MMAP_MIN_BYTES = 1 << 20
+
+
+def _word_count(text: str) -> int:
+    """Count whitespace-separated words"""
+    return len(text.split())
+
+
+@lru_cache(maxsize=256)
+def _title_from_path(input_path: str) -> str:
+    """Derive a document title from the input file name"""
+    return Path(input_path).stem.replace('_', ' ').title()
+
+
+def _build_basic_metadata(input_path: str, text: Optional[str] = None) -> IDMMetadata:
+    """Create metadata with the title from the file name and, if text is given, its word count"""
+    metadata = IDMMetadata()
+    metadata.title = _title_from_path(input_path)
+    if text is not None:
+        metadata.word_count = _word_count(text)
+    return metadata
+
+
+# PDFs with fewer pages are extracted in-process; worker start-up would cost more than it saves
+_PARALLEL_PDF_MIN_PAGES = 16
+
+# Cleared in convert_many's worker processes, which already run one file per core
+_PARALLEL_PDF_PAGES = True
+
+
+def _iter_pdf_pages_serial(input_path: str, laparams: "LAParams",
+                           page_numbers: Optional[range] = None) -> Iterator[str]:
+    """
+    Yield the extracted text of each PDF page in order
+
+    Equivalent to pdfminer's extract_text, but only one page's layout and text
+    is held in memory at a time. Each page's text ends with a form feed.
+    """
+    maxpages = page_numbers.stop if page_numbers is not None else 0
+    with open(input_path, 'rb') as fp, StringIO() as buffer:
+        rsrcmgr = PDFResourceManager(caching=True)
+        device = _TextOnlyConverter(rsrcmgr, buffer, laparams=laparams)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        try:
+            for page in PDFPage.get_pages(fp, page_numbers, maxpages=maxpages, caching=True):
+                interpreter.process_page(page)
+                yield buffer.getvalue()
+                buffer.truncate(0)
+                buffer.seek(0)
+        finally:
+            device.close()
+
+
+def _extract_page_texts(input_path: str, page_numbers: range, laparams: "LAParams") -> List[str]:
+    """Extract the text of a range of zero-based pages (process pool worker)"""
+    return list(_iter_pdf_pages_serial(input_path, laparams, page_numbers))
+
+
+def _iter_pdf_page_texts(input_path: str, laparams: "LAParams") -> Iterator[str]:
+    """
+    Yield the extracted text of each PDF page in order
+
+    Layout analysis is CPU-bound pure Python, so larger PDFs are split into
+    contiguous page ranges extracted in a process pool; results are yielded
+    in page order. Small PDFs are extracted serially in this process.
+    """
+    workers = (os.cpu_count() or 1) if _PARALLEL_PDF_PAGES else 1
+    page_count = 0
+    if workers > 1:
+        with open(input_path, 'rb') as fp:
+            page_count = sum(1 for _ in PDFPage.get_pages(fp))
+    if page_count < _PARALLEL_PDF_MIN_PAGES:
+        yield from _iter_pdf_pages_serial(input_path, laparams)
+        return
+
+    # Several ranges per worker keeps the pool busy when page complexity varies
+    size = -(-page_count // (workers * 4))
+    ranges = [range(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+        for texts in executor.map(partial(_extract_page_texts, input_path, laparams=laparams), ranges):
+            yield from texts
+
+
+def _iter_html_elements(node, in_blockquote: bool = False) -> Iterator[Tuple[str, str, bool]]:
+    """
+    Yield (kind, text, in_blockquote) for the H1-H3 and <p> tags under node
+
+    A single depth-first walk that tracks blockquote nesting on the way down,
+    instead of find_all() plus a find_parent() lookup for every paragraph.
+    """
+    for child in node.children:
+        name = child.name
+        if name is None:
+            # Text, comments and other non-tag nodes
+            continue
+        # Strip the joined text: get_text(strip=True) strips every text fragment
+        # and would drop the spaces between inline elements ("<em>a</em> b" -> "ab")
+        if name in ('h1', 'h2', 'h3'):
+            yield 'heading', child.get_text().strip(), False
+        elif name == 'p':
+            yield 'p', child.get_text().strip(), in_blockquote
+        else:
+            yield from _iter_html_elements(child, in_blockquote or name == 'blockquote')
+
+
+# Pandoc reader for each supported extension (the ones it would infer itself)
+_PANDOC_INPUT_FORMATS = {'.md': 'markdown', '.docx': 'docx'}
+
+# Curly quotes Pandoc's HTML writer renders for Quoted inlines
+_PANDOC_QUOTE_MARKS = {'DoubleQuote': ('\u201c', '\u201d'), 'SingleQuote': ('\u2018', '\u2019')}
+
+
+def _pandoc_inline_text(inlines: list, notes: Optional[list] = None) -> str:
+    """
+    Flatten Pandoc AST inlines to plain text, as the HTML path's get_text() would
+
+    Note inlines contribute no body text; their block lists are appended to
+    notes, if given, to be emitted after the document body.
+    """
+    parts = []
+    for inline in inlines:
+        kind = inline['t']
+        content = inline.get('c')
+        if kind == 'Str':
+            parts.append(content)
+        elif kind in ('Space', 'SoftBreak'):
+            parts.append(' ')
+        elif kind == 'LineBreak':
+            parts.append('\n')
+        elif kind in ('Emph', 'Strong', 'Strikeout', 'Superscript', 'Subscript', 'SmallCaps', 'Underline'):
+            parts.append(_pandoc_inline_text(content, notes))
+        elif kind == 'Quoted':
+            opening, closing = _PANDOC_QUOTE_MARKS.get(content[0]['t'], ('"', '"'))
+            parts.append(opening + _pandoc_inline_text(content[1], notes) + closing)
+        elif kind in ('Cite', 'Span', 'Link'):
+            parts.append(_pandoc_inline_text(content[1], notes))
+        elif kind in ('Code', 'Math'):
+            parts.append(content[1])
+        elif kind == 'Note':
+            if notes is not None:
+                notes.append(content)
+        # Image and RawInline contribute no body text
+    return ''.join(parts)
+
+
+def _pandoc_table_cells(content: list) -> Iterator[list]:
+    """Yield the block list of every cell in a Pandoc Table's head, bodies and foot"""
+    _, _, _, head, bodies, foot = content
+    rows = list(head[1])
+    for body in bodies:
+        rows.extend(body[2])
+        rows.extend(body[3])
+    rows.extend(foot[1])
+    for row in rows:
+        for cell in row[1]:
+            yield cell[4]
+
+
+def _iter_pandoc_elements(blocks: list, in_blockquote: bool = False,
+                          notes: Optional[list] = None) -> Iterator[Tuple[str, str, bool]]:
+    """
+    Yield (kind, text, in_blockquote) for the headings and paragraphs of a Pandoc AST
+
+    Mirrors the HTML path: H1-H3 headers and Para blocks (HTML <p>) anywhere in
+    the document, including inside block quotes, divs, lists and table cells.
+    Footnotes met along the way are appended to notes.
+    """
+    for block in blocks:
+        kind = block['t']
+        content = block.get('c')
+        if kind == 'Header':
+            if content[0] <= 3:
+                yield 'heading', _pandoc_inline_text(content[2], notes).strip(), False
+        elif kind == 'Para':
+            yield 'p', _pandoc_inline_text(content, notes).strip(), in_blockquote
+        elif kind == 'Plain':
+            # No <p> in the HTML, but its footnotes still land in the footnotes section
+            _pandoc_inline_text(content, notes)
+        elif kind == 'BlockQuote':
+            yield from _iter_pandoc_elements(content, True, notes)
+        elif kind in ('Div', 'Figure'):
+            yield from _iter_pandoc_elements(content[-1], in_blockquote, notes)
+        elif kind in ('BulletList', 'OrderedList'):
+            items = content if kind == 'BulletList' else content[1]
+            for item in items:
+                yield from _iter_pandoc_elements(item, in_blockquote, notes)
+        elif kind == 'DefinitionList':
+            for _, definitions in content:
+                for definition in definitions:
+                    yield from _iter_pandoc_elements(definition, in_blockquote, notes)
+        elif kind == 'Table':
+            for cell_blocks in _pandoc_table_cells(content):
+                yield from _iter_pandoc_elements(cell_blocks, in_blockquote, notes)
+
+
+def _iter_pandoc_document(blocks: list) -> Iterator[Tuple[str, str, bool]]:
+    """
+    Yield the elements of a whole Pandoc AST, footnotes last
+
+    Pandoc's HTML writer collects footnotes into a section after the body, so
+    their paragraphs follow the document's own, in reference order.
+    """
+    notes: list = []
+    yield from _iter_pandoc_elements(blocks, False, notes)
+    # Footnotes may themselves reference footnotes, which extend the list
+    index = 0
+    while index < len(notes):
+        yield from _iter_pandoc_elements(notes[index], False, notes)
+        index += 1
+
+
 class BaseConverter(ABC):
     """Abstract base class for document converters"""
 
+    # Source label passed to the AI detector
+    _ai_source = "document"
+
+    def __init__(self, min_ai_words: int = 200):
+        """
+        Args:
+            min_ai_words: Documents with fewer words and no chapter markers skip the
+                AI request and use regex-based detection instead
+        """
+        self.min_ai_words = min_ai_words
+
     @abstractmethod
     def convert(self, input_path: str) -> IDMDocument:
         """Convert input file to IDM document"""
@@ -62,6 +325,36 @@ class BaseConverter(ABC):
         """Convert input file to IDM document using AI structure detection"""
         pass
 
+    @abstractmethod
+    def _read_text(self, input_path: str) -> str:
+        """Extract the plain text sent to AI structure detection"""
+        pass
+
+    def _convert_text(self, text: str, input_path: str) -> IDMDocument:
+        """
+        Regex-based conversion of text already returned by _read_text
+
+        Formats whose regex path works on the source file rather than its
+        plain text convert from input_path instead.
+        """
+        return self.convert(input_path)
+
+    def _convert_text_with_ai(self, text: str, input_path: str, ai_model: str | None = None) -> IDMDocument:
+        """AI-based conversion of text already returned by _read_text"""
+        # Tiny documents with no chapter markers gain nothing from an API round-trip
+        if _word_count(text) < self.min_ai_words and not _CHAPTER_MARKER_RE.search(text.lower()):
+            print(f"Document too short for AI detection, using regex-based detection for {input_path}")
+            return self._convert_text(text, input_path)
+
+        # Create basic metadata
+        metadata = _build_basic_metadata(input_path, text)
+
+        # Detect structure using AI
+        detection_result = detect_document_structure(text, {"source": self._ai_source}, model=ai_model)
+
+        # Map AI-detected structure to IDM objects
+        return self._map_ai_structure_to_idm(detection_result, metadata)
+
     def _map_ai_structure_to_idm(self, detection_result: dict, metadata: IDMMetadata) -> IDMDocument:
         """Map AI-detected structure to IDM objects"""
         structured_blocks = detection_result.get("structured_blocks", [])
@@ -71,98 +364,24 @@ class BaseConverter(ABC):
         metadata.detected_by_ai = True
         metadata.ai_cost = cost_summary.get("total_cost", 0.0)
 
-        chapters = []
-        front_matter = []
-        back_matter = []
-        current_chapter = None
-        current_blocks = []
+        state = _AIMappingState(metadata=metadata)
 
         for block in structured_blocks:
-            block_type = block.get("type", "paragraph")
             text = block.get("text", "").strip()
 
             if not text:
                 continue
 
-            if block_type == "front_matter":
-                front_matter.append(IDMParagraph(text=text, style="normal"))
-                metadata.has_front_matter = True
-            elif block_type == "back_matter":
-                back_matter.append(IDMParagraph(text=text, style="normal"))
-                metadata.has_back_matter = True
-            elif block_type == "chapter":
-                # Save previous chapter if exists
-                if current_chapter and current_blocks:
-                    current_chapter.blocks = current_blocks
-                    chapters.append(current_chapter)
+            # Unknown block types are mapped as paragraphs
+            _AI_BLOCK_HANDLERS.get(block.get("type", "paragraph"), _map_ai_paragraph)(state, block, text)
 
-                # Start new chapter
-                current_chapter = IDMChapter(
-                    title=text,
-                    blocks=[],
-                    number=len(chapters) + 1
-                )
-                current_blocks = []
-            elif block_type == "heading":
-                level = block.get("level", 1)
-                if level == 1 and not current_chapter:
-                    # H1 without chapter - treat as chapter title
-                    current_chapter = IDMChapter(
-                        title=text,
-                        blocks=[],
-                        number=len(chapters) + 1
-                    )
-                    current_blocks = []
-                else:
-                    # Add as heading block
-                    heading = IDMHeading(text=text, level=level)
-                    current_blocks.append(heading)
-            elif block_type == "quote":
-                attribution = block.get("metadata", {}).get("attribution", "")
-                quote = IDMQuote(text=text, attribution=attribution)
-                current_blocks.append(quote)
-            elif block_type == "footnote":
-                # Parse footnote number from metadata or reference
-                footnote_metadata = block.get("metadata", {})
-                footnote_number = footnote_metadata.get("number", 1)
-                if isinstance(footnote_number, str):
-                    # Try to extract number from string like "[1]" or "¹"
-                    number_match = re.search(r'\d+', footnote_number)
-                    footnote_number = int(number_match.group()) if number_match else 1
-
-                footnote = IDMFootnote(
-                    number=footnote_number,
-                    text=text,
-                    reference_location=footnote_metadata.get("reference_location", "")
-                )
-                if current_chapter:
-                    current_chapter.footnotes.append(footnote)
-            elif block_type == "image":
-                # Create paragraph with image style, preserving caption and metadata
-                image_metadata = block.get("metadata", {})
-                caption = image_metadata.get("caption", "")
-                full_bleed = image_metadata.get("full_bleed", False)
-
-                # Combine image description with caption if present
-                image_text = text
-                if caption:
-                    image_text = f"{text}\n{caption}"
-
-                paragraph = IDMParagraph(text=image_text, style="image")
-                # Store additional metadata in the paragraph object if needed
-                current_blocks.append(paragraph)
-            else:  # paragraph or unknown
-                style = block.get("style", "normal")
-                if style == "blockquote":
-                    paragraph = IDMParagraph(text=text, style=style, is_quote=True)
-                else:
-                    paragraph = IDMParagraph(text=text, style=style)
-                current_blocks.append(paragraph)
+        chapters = state.chapters
+        current_blocks = state.current_blocks
 
         # Add final chapter
-        if current_chapter and current_blocks:
-            current_chapter.blocks = current_blocks
-            chapters.append(current_chapter)
+        if state.current_chapter and current_blocks:
+            state.current_chapter.blocks = current_blocks
+            chapters.append(state.current_chapter)
 
         # If no chapters found, create one with all blocks
         if not chapters and current_blocks:
@@ -171,99 +390,214 @@ class BaseConverter(ABC):
         return IDMDocument(
             metadata=metadata,
             chapters=chapters,
-            front_matter=front_matter,
-            back_matter=back_matter
+            front_matter=state.front_matter,
+            back_matter=state.back_matter
         )
 
 
+# Shared stand-in for blocks without metadata, so none is allocated per block
+_EMPTY_METADATA = MappingProxyType({})
+
+
+@dataclass
+class _AIMappingState:
+    """Running state while mapping AI-detected blocks to IDM objects"""
+    metadata: IDMMetadata
+    chapters: List[IDMChapter] = field(default_factory=list)
+    front_matter: List[IDMParagraph] = field(default_factory=list)
+    back_matter: List[IDMParagraph] = field(default_factory=list)
+    current_chapter: Optional[IDMChapter] = None
+    current_blocks: list = field(default_factory=list)
+
+
+def _map_ai_front_matter(state: _AIMappingState, block: dict, text: str):
+    state.front_matter.append(IDMParagraph(text=text, style="normal"))
+    state.metadata.has_front_matter = True
+
+
+def _map_ai_back_matter(state: _AIMappingState, block: dict, text: str):
+    state.back_matter.append(IDMParagraph(text=text, style="normal"))
+    state.metadata.has_back_matter = True
+
+
+def _map_ai_chapter(state: _AIMappingState, block: dict, text: str):
+    # Save previous chapter if exists
+    if state.current_chapter and state.current_blocks:
+        state.current_chapter.blocks = state.current_blocks
+        state.chapters.append(state.current_chapter)
+
+    # Start new chapter
+    state.current_chapter = IDMChapter(
+        title=text,
+        blocks=[],
+        number=len(state.chapters) + 1
+    )
+    state.current_blocks = []
+
+
+def _map_ai_heading(state: _AIMappingState, block: dict, text: str):
+    level = block.get("level", 1)
+    if level == 1 and not state.current_chapter:
+        # H1 without chapter - treat as chapter title
+        state.current_chapter = IDMChapter(
+            title=text,
+            blocks=[],
+            number=len(state.chapters) + 1
+        )
+        state.current_blocks = []
+    else:
+        # Add as heading block
+        state.current_blocks.append(IDMHeading(text=text, level=level))
+
+
+def _map_ai_quote(state: _AIMappingState, block: dict, text: str):
+    attribution = (block.get("metadata") or _EMPTY_METADATA).get("attribution", "")
+    state.current_blocks.append(IDMQuote(text=text, attribution=attribution))
+
+
+def _map_ai_footnote(state: _AIMappingState, block: dict, text: str):
+    # Parse footnote number from metadata or reference
+    footnote_metadata = block.get("metadata") or _EMPTY_METADATA
+    footnote_number = footnote_metadata.get("number", 1)
+    if isinstance(footnote_number, str):
+        # Try to extract number from string like "[1]" or "¹"
+        number_match = _FOOTNOTE_NUM_RE.search(footnote_number)
+        footnote_number = int(number_match.group()) if number_match else 1
+
+    footnote = IDMFootnote(
+        number=footnote_number,
+        text=text,
+        reference_location=footnote_metadata.get("reference_location", "")
+    )
+    if state.current_chapter:
+        state.current_chapter.footnotes.append(footnote)
+
+
+def _map_ai_image(state: _AIMappingState, block: dict, text: str):
+    # Create paragraph with image style, preserving caption and metadata
+    image_metadata = block.get("metadata") or _EMPTY_METADATA
+    caption = image_metadata.get("caption", "")
+
+    # Combine image description with caption if present
+    image_text = text
+    if caption:
+        image_text = f"{text}\n{caption}"
+
+    state.current_blocks.append(IDMParagraph(text=image_text, style="image"))
+
+
+def _map_ai_paragraph(state: _AIMappingState, block: dict, text: str):
+    style = block.get("style", "normal")
+    if style == "blockquote":
+        paragraph = IDMParagraph(text=text, style=style, is_quote=True)
+    else:
+        paragraph = IDMParagraph(text=text, style=style)
+    state.current_blocks.append(paragraph)
+
+
+# AI block type -> handler(state, block, text)
+_AI_BLOCK_HANDLERS = {
+    "front_matter": _map_ai_front_matter,
+    "back_matter": _map_ai_back_matter,
+    "chapter": _map_ai_chapter,
+    "heading": _map_ai_heading,
+    "quote": _map_ai_quote,
+    "footnote": _map_ai_footnote,
+    "image": _map_ai_image,
+    "paragraph": _map_ai_paragraph,
+}
+
+
 class TextConverter(BaseConverter):
     """Converter for plain text files"""
 
+    _ai_source = "text_file"
+
+    def _read_text(self, input_path: str) -> str:
+        """Read the text file, decoding large files straight from a memory map"""
+        if os.path.getsize(input_path) < _MMAP_MIN_BYTES:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                return f.read()
+
+        with open(input_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            content = str(mm, 'utf-8')
+        # Match the universal newline handling of text mode
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
     def convert(self, input_path: str) -> IDMDocument:
         """Convert text file to IDM document"""
-        with open(input_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        return self._convert_text(self._read_text(input_path), input_path)
 
+    def _convert_text(self, content: str, input_path: str) -> IDMDocument:
+        """Convert text file content to IDM document"""
         # Create metadata
-        metadata = IDMMetadata()
-        filename = Path(input_path).stem
-        metadata.title = filename.replace('_', ' ').title()
-        metadata.word_count = len(content.split())
+        metadata = _build_basic_metadata(input_path, content)
+
+        # Split into paragraph blocks in one pass; blank and whitespace-only lines separate blocks
+        block_lines = []
+        for block in _PARA_SPLIT_RE.split(content):
+            lines = [line.rstrip() for line in block.split('\n') if line.strip()]
+            if lines:
+                block_lines.append(lines)
 
         # Split into chapters (basic heuristic: look for CHAPTER or numbered sections)
         chapters = []
-        lines = content.split('\n')
-
         current_chapter = None
         current_paragraphs = []
 
-        # Buffer for accumulating consecutive non-empty lines
-        paragraph_buffer = []
-
-        for line in lines:
-            stripped_line = line.strip()
-
-            # Check if this is a chapter header
-            # Recognized patterns: "Chapter 1", "Letter 1", "Part 1", "Section A", "1.", "I.", etc.
-            if stripped_line and (re.match(r'^(chapter|letter|part|section)\s+(\d+|[ivxlcdm]+|one|two|three|four|five|six|seven|eight|nine|ten|[a-z])', stripped_line.lower()) or re.match(r'^(\d+|[ivxlcdm]+)\.(\s+\S.{0,40})?$', stripped_line.lower())):
-                # Flush any buffered paragraph first
-                if paragraph_buffer:
-                    combined_text = self._join_lines_with_hyphenation(paragraph_buffer)
-                    current_paragraphs.append(IDMParagraph(text=combined_text))
-                    paragraph_buffer = []
-
-                # Save previous chapter if exists
-                if current_chapter and current_paragraphs:
-                    current_chapter.blocks = current_paragraphs
-                    chapters.append(current_chapter)
-
-                # Start new chapter
-                current_chapter = IDMChapter(
-                    title=stripped_line,
-                    number=len(chapters) + 1 if stripped_line.lower().startswith('chapter') else None
-                )
-                current_paragraphs = []
-            elif stripped_line:
-                # Add non-empty line to buffer
-                paragraph_buffer.append(line.rstrip())  # Keep original trailing spaces for potential hyphenation
-            else:
-                # Empty line - flush buffered paragraph
-                if paragraph_buffer:
-                    combined_text = self._join_lines_with_hyphenation(paragraph_buffer)
-                    current_paragraphs.append(IDMParagraph(text=combined_text))
-                    paragraph_buffer = []
+        for lines in block_lines:
+            # Lines from start up to the next chapter header form one paragraph;
+            # they are joined straight from the block instead of copied to a buffer
+            start = 0
+
+            for index, line in enumerate(lines):
+                stripped_line = line.lstrip()
+
+                # Check if this is a chapter header; most lines are ruled out by
+                # their first character before being lowercased and matched
+                first = stripped_line[0]
+                if (first in _HEADER_FIRST_CHARS or first.isdecimal()) \
+                        and _CHAPTER_OR_NUM_RE.match(lowered := stripped_line.lower()):
+                    # Flush any pending paragraph first
+                    if index > start:
+                        combined_text = self._join_lines_with_hyphenation(lines[start:index])
+                        current_paragraphs.append(IDMParagraph(text=combined_text))
+                    start = index + 1
+
+                    # Save previous chapter if exists
+                    if current_chapter and current_paragraphs:
+                        current_chapter.blocks = current_paragraphs
+                        chapters.append(current_chapter)
+
+                    # Start new chapter
+                    current_chapter = IDMChapter(
+                        title=stripped_line,
+                        number=len(chapters) + 1 if lowered.startswith('chapter') else None
+                    )
+                    current_paragraphs = []
 
-        # Flush final buffered paragraph
-        if paragraph_buffer:
-            combined_text = self._join_lines_with_hyphenation(paragraph_buffer)
-            current_paragraphs.append(IDMParagraph(text=combined_text))
+            # End of block - flush pending paragraph (lines keep the first line's leading spaces)
+            if start < len(lines):
+                combined_text = self._join_lines_with_hyphenation(lines[start:] if start else lines)
+                current_paragraphs.append(IDMParagraph(text=combined_text))
 
         # Add final chapter
         if current_chapter and current_paragraphs:
             current_chapter.blocks = current_paragraphs
             chapters.append(current_chapter)
 
-        # If no chapters found, create one chapter with all content
+        # If no chapters found, create one chapter with all content, header lines included
         if not chapters:
-            # Process lines into paragraphs using the same buffering logic
-            paragraphs = []
-            paragraph_buffer = []
-
-            for line in lines:
-                stripped_line = line.strip()
-                if stripped_line:
-                    paragraph_buffer.append(line.rstrip())
-                else:
-                    if paragraph_buffer:
-                        combined_text = self._join_lines_with_hyphenation(paragraph_buffer)
-                        paragraphs.append(IDMParagraph(text=combined_text))
-                        paragraph_buffer = []
-
-            # Flush final buffered paragraph
-            if paragraph_buffer:
-                combined_text = self._join_lines_with_hyphenation(paragraph_buffer)
-                paragraphs.append(IDMParagraph(text=combined_text))
-
+            if current_chapter is None:
+                # No header was ever seen, so the first pass already built every paragraph
+                paragraphs = current_paragraphs
+            else:
+                paragraphs = [
+                    IDMParagraph(text=self._join_lines_with_hyphenation(lines))
+                    for lines in block_lines
+                ]
             chapters = [IDMChapter(title="Main Content", blocks=paragraphs)]
 
         return IDMDocument(metadata=metadata, chapters=chapters)
@@ -273,46 +607,33 @@ class TextConverter(BaseConverter):
         if not lines:
             return ""
 
-        result = lines[0]
+        parts = [lines[0]]
 
         for line in lines[1:]:
             # Check if previous line ends with hyphen (indicating word continuation)
-            if result.endswith('-'):
+            if parts[-1].endswith('-'):
                 # Remove the hyphen and join directly
-                result = result[:-1] + line.lstrip()
+                parts[-1] = parts[-1][:-1]
             else:
                 # Join with space
-                result += ' ' + line.lstrip()
+                parts.append(' ')
+            parts.append(line.lstrip())
 
-        return result
+        return ''.join(parts)
 
     def convert_with_ai(self, input_path: str, ai_model: str | None = None) -> IDMDocument:
         """Convert text file to IDM document using AI structure detection"""
         if detect_document_structure is None:
             raise ImportError("AI structure detection not available. Install openai package.")
 
-        # Read full text content
-        with open(input_path, 'r', encoding='utf-8') as f:
-            text = f.read()
-
-        # Create basic metadata
-        metadata = IDMMetadata()
-        filename = Path(input_path).stem
-        metadata.title = filename.replace('_', ' ').title()
-        metadata.word_count = len(text.split())
-
-        # Detect structure using AI
-        detection_result = detect_document_structure(text, {"source": "text_file"}, model=ai_model)
-
-        # Map AI-detected structure to IDM objects
-        document = self._map_ai_structure_to_idm(detection_result, metadata)
-
-        return document
+        return self._convert_text_with_ai(self._read_text(input_path), input_path, ai_model)
 
 
 class PDFConverter(BaseConverter):
     """Converter for PDF files using pdfminer.six"""
 
+    _ai_source = "pdf_file"
+
     def _normalize_text(self, text: str) -> str:
         """Normalize text by replacing problematic characters"""
         # #region agent log
@@ -350,27 +671,61 @@ class PDFConverter(BaseConverter):
         
         return text
 
+    def _iter_page_lines(self, input_path: str, stats: dict) -> Iterator[str]:
+        """
+        Yield normalized text lines page by page
+
+        Lines are split exactly as if the whole document text had been split at
+        once; a trailing partial line is carried into the next page. Word and
+        character counts are accumulated into stats as pages are read.
+        """
+        carry = ''
+        for page_text in _iter_pdf_page_texts(input_path, LAParams()):
+            # Normalize text to remove problematic characters (critical for KDP)
+            page_text = self._normalize_text(page_text)
+            # Pages end with a form feed, so no word spans a page boundary
+            stats["word_count"] += _word_count(page_text)
+            stats["text_len"] += len(page_text)
+
+            lines = (carry + page_text).split('\n')
+            carry = lines.pop()
+            yield from lines
+        yield carry
+
+    def _read_text(self, input_path: str) -> str:
+        """Extract the full text of the PDF"""
+        if PDFPage is None:
+            raise ImportError("pdfminer.six is required for PDF conversion")
+        return ''.join(_iter_pdf_page_texts(input_path, LAParams()))
+
     def convert(self, input_path: str) -> IDMDocument:
         """Convert PDF file to IDM document"""
-        if extract_text is None:
+        if PDFPage is None:
             raise ImportError("pdfminer.six is required for PDF conversion")
 
-        # Extract text from PDF
-        laparams = LAParams()
-        text = extract_text(input_path, laparams=laparams)
-        
+        # Extract and process the PDF one page at a time
+        stats = {"word_count": 0, "text_len": 0}
+        return self._convert_lines(self._iter_page_lines(input_path, stats), input_path, stats)
+
+    def _convert_text(self, text: str, input_path: str) -> IDMDocument:
+        """Convert already extracted PDF text to IDM document"""
         # Normalize text to remove problematic characters (critical for KDP)
         text = self._normalize_text(text)
+        stats = {"word_count": _word_count(text), "text_len": len(text)}
+        return self._convert_lines(text.split('\n'), input_path, stats)
+
+    def _convert_lines(self, lines: Iterable[str], input_path: str, stats: dict) -> IDMDocument:
+        """
+        Build chapters and paragraphs from normalized PDF text lines
 
+        stats must hold the document's word_count and text_len once lines is
+        exhausted; _iter_page_lines fills them in as it reads pages.
+        """
         # Create metadata
-        metadata = IDMMetadata()
-        filename = Path(input_path).stem
-        metadata.title = filename.replace('_', ' ').title()
-        metadata.word_count = len(text.split())
+        metadata = _build_basic_metadata(input_path)
 
         # Split into chapters with proper structure detection
         chapters = []
-        lines = text.split('\n')
         
         current_chapter = None
         current_paragraphs = []
@@ -409,7 +764,7 @@ class PDFConverter(BaseConverter):
                     para_text = ' '.join(current_paragraph_lines)
                     if para_text.strip():
                         current_paragraphs.append(IDMParagraph(text=para_text))
-                    current_paragraph_lines = []
+                    current_paragraph_lines.clear()
                 
                 # Save previous chapter
                 if current_chapter is not None:
@@ -436,7 +791,7 @@ class PDFConverter(BaseConverter):
                         para_text = ' '.join(current_paragraph_lines)
                         if para_text.strip():
                             current_paragraphs.append(IDMParagraph(text=para_text))
-                        current_paragraph_lines = []
+                        current_paragraph_lines.clear()
                     # Add greeting as its own paragraph
                     current_paragraphs.append(IDMParagraph(text=stripped_line, style="greeting"))
                     just_started_chapter = False
@@ -463,7 +818,7 @@ class PDFConverter(BaseConverter):
                             para_text = ' '.join(current_paragraph_lines)
                             if para_text.strip():
                                 current_paragraphs.append(IDMParagraph(text=para_text))
-                            current_paragraph_lines = []
+                            current_paragraph_lines.clear()
                         # Start building subtitle
                         current_paragraphs.append(IDMParagraph(text=stripped_line, style="subtitle"))
                         building_subtitle = True
@@ -481,7 +836,7 @@ class PDFConverter(BaseConverter):
                     para_text = ' '.join(current_paragraph_lines)
                     if para_text.strip():
                         current_paragraphs.append(IDMParagraph(text=para_text))
-                    current_paragraph_lines = []
+                    current_paragraph_lines.clear()
         
         # Flush final paragraph
         if current_paragraph_lines:
@@ -501,12 +856,14 @@ class PDFConverter(BaseConverter):
         if not chapters:
             chapters = [IDMChapter(title="Content", blocks=[])]
 
+        metadata.word_count = stats["word_count"]
+
         # #region agent log
         chapter_info = []
         for ch in chapters:
             blocks = getattr(ch, 'blocks', [])
             chapter_info.append({"title": ch.title, "title_repr": repr(ch.title), "num_blocks": len(blocks)})
-        _debug_log("converters.py:PDFConverter:convert:result", "PDF conversion complete", {"num_chapters": len(chapters), "chapters": chapter_info, "total_text_len": len(text)}, "H2_empty")
+        _debug_log("converters.py:PDFConverter:convert:result", "PDF conversion complete", {"num_chapters": len(chapters), "chapters": chapter_info, "total_text_len": stats["text_len"]}, "H2_empty")
         # #endregion
 
         return IDMDocument(metadata=metadata, chapters=chapters)
@@ -516,67 +873,79 @@ class PDFConverter(BaseConverter):
         if detect_document_structure is None:
             raise ImportError("AI structure detection not available. Install openai package.")
 
-        if extract_text is None:
-            raise ImportError("pdfminer.six is required for PDF conversion")
-
-        # Extract text from PDF
-        laparams = LAParams()
-        text = extract_text(input_path, laparams=laparams)
+        return self._convert_text_with_ai(self._read_text(input_path), input_path, ai_model)
 
-        # Create basic metadata
-        metadata = IDMMetadata()
-        filename = Path(input_path).stem
-        metadata.title = filename.replace('_', ' ').title()
-        metadata.word_count = len(text.split())
 
-        # Detect structure using AI
-        detection_result = detect_document_structure(text, {"source": "pdf_file"}, model=ai_model)
+class PandocConverter(BaseConverter):
+    """Converter for DOCX and Markdown files using Pandoc"""
 
-        # Map AI-detected structure to IDM objects
-        document = self._map_ai_structure_to_idm(detection_result, metadata)
+    _ai_source = "pandoc_file"
 
-        return document
+    def _parse_pandoc(self, input_path: str, output_format: str, parse: Callable[[IO[bytes]], Any]) -> Any:
+        """Run Pandoc on input_path and hand its raw UTF-8 output stream to parse"""
+        # Name the input format Pandoc would infer from the extension, skipping detection
+        input_format = _PANDOC_INPUT_FORMATS.get(Path(input_path).suffix.lower())
+        command = ['pandoc', '-t', output_format, input_path]
+        if input_format:
+            command[1:1] = ['-f', input_format]
+        try:
+            proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except FileNotFoundError:
+            raise RuntimeError("Pandoc is required for DOCX/MD conversion")
 
+        try:
+            return parse(proc.stdout)
+        finally:
+            # A Pandoc failure takes precedence over whatever parse made of its partial output
+            proc.stdout.close()
+            if proc.wait() != 0:
+                raise RuntimeError("Pandoc is required for DOCX/MD conversion")
+
+    def _read_text(self, input_path: str) -> str:
+        """Convert to HTML with Pandoc and extract its plain text"""
+        if BeautifulSoup is None:
+            raise ImportError("beautifulsoup4 is required for Pandoc conversion")
 
-class PandocConverter(BaseConverter):
-    """Converter for DOCX and Markdown files using Pandoc"""
+        # Convert to HTML using Pandoc and extract its plain text
+        soup = self._parse_pandoc(
+            input_path, 'html', lambda stream: BeautifulSoup(stream, _BS_PARSER, from_encoding='utf-8')
+        )
+        return soup.get_text()
 
-    def convert(self, input_path: str) -> IDMDocument:
-        """Convert DOCX/MD file to IDM document using Pandoc"""
+    def _html_elements(self, input_path: str) -> List[Tuple[str, str, bool]]:
+        """Extract (kind, text, in_blockquote) elements from Pandoc's HTML output"""
         if BeautifulSoup is None:
             raise ImportError("beautifulsoup4 is required for Pandoc conversion")
 
-        # Convert to HTML using Pandoc
-        try:
-            result = subprocess.run(
-                ['pandoc', input_path, '-t', 'html'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            html_content = result.stdout
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            raise RuntimeError("Pandoc is required for DOCX/MD conversion")
+        # Parse HTML, building only the subtrees we extract content from
+        soup = self._parse_pandoc(
+            input_path, 'html',
+            lambda stream: BeautifulSoup(stream, _BS_PARSER, parse_only=_PANDOC_STRAINER, from_encoding='utf-8')
+        )
 
-        # Parse HTML
-        soup = BeautifulSoup(html_content, 'html.parser')
+        return list(_iter_html_elements(soup))
 
-        # Extract text for word count
-        text = soup.get_text()
+    def convert(self, input_path: str) -> IDMDocument:
+        """Convert DOCX/MD file to IDM document using Pandoc"""
+        # Read Pandoc's JSON AST directly; fall back to HTML if it cannot be read
+        try:
+            ast = self._parse_pandoc(input_path, 'json', json.load)
+            elements = list(_iter_pandoc_document(ast['blocks']))
+        except (ValueError, KeyError, TypeError, IndexError):
+            elements = self._html_elements(input_path)
 
         # Create metadata
-        metadata = IDMMetadata()
-        filename = Path(input_path).stem
-        metadata.title = filename.replace('_', ' ').title()
-        metadata.word_count = len(text.split())
+        metadata = _build_basic_metadata(input_path)
 
         # Extract content
         chapters = []
         current_chapter = None
         current_paragraphs = []
+        word_count = 0
 
-        for element in soup.find_all(['h1', 'h2', 'h3', 'p']):
-            if element.name in ['h1', 'h2', 'h3']:
+        for kind, text, in_blockquote in elements:
+            word_count += _word_count(text)
+            if kind == 'heading':
                 # Save previous chapter
                 if current_chapter and current_paragraphs:
                     current_chapter.blocks = current_paragraphs
@@ -584,17 +953,13 @@ class PandocConverter(BaseConverter):
 
                 # Start new chapter
                 current_chapter = IDMChapter(
-                    title=element.get_text().strip(),
+                    title=text,
                     number=None
                 )
                 current_paragraphs = []
-            elif element.name == 'p':
-                text = element.get_text().strip()
-                if text:
-                    style = "normal"
-                    if element.find_parent('blockquote'):
-                        style = "blockquote"
-                    current_paragraphs.append(IDMParagraph(text=text, style=style))
+            elif text:
+                style = "blockquote" if in_blockquote else "normal"
+                current_paragraphs.append(IDMParagraph(text=text, style=style))
 
         # Add final chapter
         if current_chapter and current_paragraphs:
@@ -603,13 +968,16 @@ class PandocConverter(BaseConverter):
 
         # If no chapters found, create one chapter
         if not chapters:
-            paragraphs = []
-            for p in soup.find_all('p'):
-                text = p.get_text().strip()
-                if text:
-                    paragraphs.append(IDMParagraph(text=text))
+            paragraphs = [
+                IDMParagraph(text=text)
+                for kind, text, _ in elements
+                if kind == 'p' and text
+            ]
             chapters = [IDMChapter(title="Document Content", blocks=paragraphs)]
 
+        # Word count covers the extracted headings and paragraphs
+        metadata.word_count = word_count
+
         return IDMDocument(metadata=metadata, chapters=chapters)
 
     def convert_with_ai(self, input_path: str, ai_model: str | None = None) -> IDMDocument:
@@ -617,38 +985,26 @@ class PandocConverter(BaseConverter):
         if detect_document_structure is None:
             raise ImportError("AI structure detection not available. Install openai package.")
 
-        if BeautifulSoup is None:
-            raise ImportError("beautifulsoup4 is required for Pandoc conversion")
-
-        # Convert to HTML using Pandoc
-        try:
-            result = subprocess.run(
-                ['pandoc', input_path, '-t', 'html'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            html_content = result.stdout
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            raise RuntimeError("Pandoc is required for DOCX/MD conversion")
-
-        # Parse HTML and extract plain text
-        soup = BeautifulSoup(html_content, 'html.parser')
-        text = soup.get_text()
+        return self._convert_text_with_ai(self._read_text(input_path), input_path, ai_model)
 
-        # Create basic metadata
-        metadata = IDMMetadata()
-        filename = Path(input_path).stem
-        metadata.title = filename.replace('_', ' ').title()
-        metadata.word_count = len(text.split())
 
-        # Detect structure using AI
-        detection_result = detect_document_structure(text, {"source": "pandoc_file"}, model=ai_model)
+# Converters are stateless, so one shared instance serves each extension
+_PANDOC_CONVERTER = PandocConverter()
+_CONVERTERS = {
+    '.txt': TextConverter(),
+    '.pdf': PDFConverter(),
+    '.docx': _PANDOC_CONVERTER,
+    '.md': _PANDOC_CONVERTER,
+}
 
-        # Map AI-detected structure to IDM objects
-        document = self._map_ai_structure_to_idm(detection_result, metadata)
 
-        return document
+def _get_converter(input_path: str) -> BaseConverter:
+    """Return the shared converter for input_path's extension"""
+    file_ext = Path(input_path).suffix.lower()
+    converter = _CONVERTERS.get(file_ext)
+    if converter is None:
+        raise ValueError(f"Unsupported file format: {file_ext}")
+    return converter
 
 
 def convert(input_path: str, use_ai: bool = False, ai_model: str | None = None) -> IDMDocument:
@@ -674,16 +1030,7 @@ def convert(input_path: str, use_ai: bool = False, ai_model: str | None = None)
     if use_ai and not os.getenv("OPENAI_API_KEY"):
         raise ValueError("OPENAI_API_KEY environment variable required for AI detection")
 
-    file_ext = Path(input_path).suffix.lower()
-
-    if file_ext == '.txt':
-        converter = TextConverter()
-    elif file_ext == '.pdf':
-        converter = PDFConverter()
-    elif file_ext in ['.docx', '.md']:
-        converter = PandocConverter()
-    else:
-        raise ValueError(f"Unsupported file format: {file_ext}")
+    converter = _get_converter(input_path)
 
     if use_ai:
         print(f"Using AI-powered structure detection for {input_path}")
@@ -693,6 +1040,69 @@ def convert(input_path: str, use_ai: bool = False, ai_model: str | None = None)
         return converter.convert(input_path)
 
 
+def _disable_parallel_pdf_pages():
+    """Process pool initializer: extract PDF pages serially inside file-level workers"""
+    global _PARALLEL_PDF_PAGES
+    _PARALLEL_PDF_PAGES = False
+
+
+def _convert_file(input_path: str) -> IDMDocument:
+    """Regex-based conversion of one file (process pool worker)"""
+    return _get_converter(input_path).convert(input_path)
+
+
+def _read_file_text(input_path: str) -> str:
+    """Extract one file's plain text for AI detection (process pool worker)"""
+    return _get_converter(input_path)._read_text(input_path)
+
+
+def convert_many(input_paths: List[str], use_ai: bool = False, ai_model: str | None = None,
+                 max_workers: Optional[int] = None) -> List[IDMDocument]:
+    """
+    Convert several files, parsing them in parallel worker processes
+
+    Text extraction and regex structure detection are CPU-bound, so each file
+    is handled in a ProcessPoolExecutor. With use_ai, AI detection runs in this
+    process on each file's text as soon as it has been extracted, overlapping
+    the I/O-bound API calls with the extraction of the remaining files.
+    Documents are detected one at a time so each keeps its own cost summary;
+    chunks within a document are already sent concurrently.
+
+    Args:
+        input_paths: Paths to input files (.txt, .pdf, .docx, .md)
+        use_ai: Whether to use AI-powered structure detection
+        ai_model: OpenAI model to use for AI detection (default: gpt-4-turbo-preview)
+        max_workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        IDMDocument instances in the same order as input_paths
+
+    Raises:
+        ValueError: If a file format is not supported
+        ImportError: If required dependencies are missing
+    """
+    for input_path in input_paths:
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+        _get_converter(input_path)
+
+    if use_ai:
+        if detect_document_structure is None:
+            raise ImportError("AI structure detection not available. Install openai package.")
+        if not os.getenv("OPENAI_API_KEY"):
+            raise ValueError("OPENAI_API_KEY environment variable required for AI detection")
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_disable_parallel_pdf_pages) as executor:
+        if not use_ai:
+            return list(executor.map(_convert_file, input_paths))
+
+        futures = [executor.submit(_read_file_text, input_path) for input_path in input_paths]
+        return [
+            _get_converter(input_path)._convert_text_with_ai(future.result(), input_path, ai_model)
+            for input_path, future in zip(input_paths, futures)
+        ]
+
+
 def compare_detection_methods(input_path: str) -> dict:
     """
     Compare regex vs AI detection methods for the same file
@@ -713,10 +1123,19 @@ def compare_detection_methods(input_path: str) -> dict:
         "comparison": {}
     }
 
+    # Extract the text once and run both detection methods on it
+    try:
+        converter = _get_converter(input_path)
+        text = converter._read_text(input_path)
+    except Exception as e:
+        results["regex"]["error"] = str(e)
+        results["ai"]["error"] = str(e)
+        return results
+
     try:
         # Run regex detection
         print("Running regex detection...")
-        regex_doc = convert(input_path, use_ai=False)
+        regex_doc = converter._convert_text(text, input_path)
         results["regex"] = {
             "chapters_detected": len(regex_doc.chapters),
             "paragraphs_detected": sum(len(chapter.paragraphs) for chapter in regex_doc.chapters),
@@ -729,7 +1148,11 @@ def compare_detection_methods(input_path: str) -> dict:
     try:
         # Run AI detection
         print("Running AI detection...")
-        ai_doc = convert(input_path, use_ai=True)
+        if detect_document_structure is None:
+            raise ImportError("AI structure detection not available. Install openai package.")
+        if not os.getenv("OPENAI_API_KEY"):
+            raise ValueError("OPENAI_API_KEY environment variable required for AI detection")
+        ai_doc = converter._convert_text_with_ai(text, input_path)
         results["ai"] = {
             "chapters_detected": len(ai_doc.chapters),
             "blocks_detected": sum(len(chapter.blocks) for chapter in ai_doc.chapters),
@@ -6,15 +6,40 @@ including semantic HTML5, nav.xhtml, embedded fonts, and footnote conversion.
 """
 
 import os
-import re
+import posixpath
 import subprocess
 import tempfile
 import zipfile
 import json
-from pathlib import Path
-from typing import Dict, List, Optional, Any
-from xml.dom import minidom
-from xml.etree import ElementTree as ET
+from functools import lru_cache
+from io import BytesIO, StringIO
+from typing import Callable, Dict, List, Optional, Any, Set, Union
+
+# Prefer libxml2-backed lxml for OPF parsing and serialization; its ElementTree
+# API is a superset of the stdlib one used below
+try:
+    from lxml import etree as ET
+except ImportError:
+    from xml.etree import ElementTree as ET
+
+# OPF namespaces; registering their prefixes keeps them on serialized elements
+_OPF_NAMESPACES = {
+    'opf': 'http://www.idpf.org/2007/opf',
+    'dc': 'http://purl.org/dc/elements/1.1/'
+}
+ET.register_namespace('opf', _OPF_NAMESPACES['opf'])
+ET.register_namespace('dc', _OPF_NAMESPACES['dc'])
+
+# Element names created in the OPF, built once with their namespace already split off
+_OPF_ITEM = ET.QName(_OPF_NAMESPACES['opf'], 'item')
+_OPF_ITEMREF = ET.QName(_OPF_NAMESPACES['opf'], 'itemref')
+_DC_CREATOR = ET.QName(_OPF_NAMESPACES['dc'], 'creator')
+_DC_LANGUAGE = ET.QName(_OPF_NAMESPACES['dc'], 'language')
+
+_CONTAINER_ROOTFILE = './/{urn:oasis:names:tc:opendocument:xmlns:container}rootfile'
+
+# Fonts and images are already compressed; deflating them again costs CPU for no gain
+_STORED_EXTENSIONS = ('.ttf', '.otf', '.woff', '.woff2', '.jpg', '.jpeg', '.png', '.gif')
 
 # #region agent log
 _DEBUG_LOG_PATH = "/Users/nik/Downloads/KDP-Formatter-main/.cursor/debug.log"
@@ -30,6 +55,92 @@ except ImportError:
     from idm_schema import IDMDocument, IDMChapter, IDMParagraph, IDMHeading, IDMQuote, IDMFootnote
 
 
+def _normalize_kdp_text(text: str) -> str:
+    """Replace problematic Unicode characters for KDP compatibility"""
+    # Replace non-breaking spaces with regular spaces (critical for KDP)
+    text = text.replace('\xa0', ' ')
+    # Replace other problematic Unicode whitespace
+    text = text.replace('\u2002', ' ')  # en space
+    text = text.replace('\u2003', ' ')  # em space
+    text = text.replace('\u2009', ' ')  # thin space
+    text = text.replace('\u200a', ' ')  # hair space
+    text = text.replace('\u200b', '')   # zero-width space
+    text = text.replace('\u00ad', '')   # soft hyphen
+    return text
+
+
+# HTML tag for each IDMParagraph style
+_PARAGRAPH_TAGS = {
+    'normal': 'p',
+    'heading1': 'h1',
+    'heading2': 'h2',
+    'heading3': 'h3',
+    'blockquote': 'blockquote'
+}
+
+# Paragraph class attribute keyed by (is_first_after_heading, is_quote)
+_PARAGRAPH_CLASS_ATTRS = {
+    (False, False): '',
+    (True, False): ' class="first-para"',
+    (False, True): ' class="quote"',
+    (True, True): ' class="first-para quote"'
+}
+
+
+# Keyed by the text itself rather than stored on IDM objects, whose text is mutable
+# (converters extend paragraphs in place); re-emitting a document hits this cache
+# with the same string objects, whose hashes CPython has already cached
+@lru_cache(maxsize=8192)
+def _escape_html_text(text: str) -> str:
+    """Normalize text and escape its HTML entities, caching repeated strings"""
+    # Chained str.replace beats both str.translate and re.sub with a callback here: it
+    # copies only when it finds a match, and on clean text the chain is cheaper than
+    # even a regex "needs escaping" pre-check
+    return (_normalize_kdp_text(text)
+            .replace('&', '&amp;')
+            .replace('<', '&lt;')
+            .replace('>', '&gt;')
+            .replace('"', '&quot;')
+            .replace("'", '&#39;'))
+
+
+# Paragraph styles rendered as headings
+_HEADING_STYLES = frozenset({"heading1", "heading2", "heading3"})
+
+
+def _write_paragraph_block(generator: "EPUBGenerator", write: Callable[[str], Any], block: IDMParagraph,
+                           previous_block_was_heading: bool) -> bool:
+    """Write a paragraph block, returning whether it counts as a heading"""
+    if block.style in _HEADING_STYLES:
+        # Render as heading and keep heading context
+        generator._write_paragraph_html(write, block, False)  # Will output <h1/2/3>
+        return True
+    generator._write_paragraph_html(write, block, previous_block_was_heading)
+    return False
+
+
+def _write_heading_block(generator: "EPUBGenerator", write: Callable[[str], Any], block: IDMHeading,
+                         previous_block_was_heading: bool) -> bool:
+    """Write a heading block, which always sets heading context"""
+    generator._write_heading_html(write, block)
+    return True
+
+
+def _write_quote_block(generator: "EPUBGenerator", write: Callable[[str], Any], block: IDMQuote,
+                       previous_block_was_heading: bool) -> bool:
+    """Write a quote block, leaving heading context unchanged"""
+    generator._write_quote_html(write, block)
+    return previous_block_was_heading
+
+
+# IDM block type -> writer(generator, write, block, previous_block_was_heading)
+_BLOCK_WRITERS = {
+    IDMParagraph: _write_paragraph_block,
+    IDMHeading: _write_heading_block,
+    IDMQuote: _write_quote_block,
+}
+
+
 class EPUBGenerator:
     """Generator for converting IDM documents to EPUB 3 format"""
 
@@ -97,7 +208,9 @@ class EPUBGenerator:
 
     def _generate_html_content(self, document: IDMDocument) -> str:
         """Generate semantic HTML5 content from IDM document"""
-        html_parts = []
+        # Every element is written straight into one buffer, one line per element
+        buffer = StringIO()
+        write = buffer.write
 
         # HTML5 doctype and head
         body_classes = []
@@ -107,7 +220,7 @@ class EPUBGenerator:
             body_classes.append('no-indent')
 
         body_class_attr = f' class="{" ".join(body_classes)}"' if body_classes else ''
-        html_parts.append("""<!DOCTYPE html>
+        write("""<!DOCTYPE html>
 <html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="en">
 <head>
     <meta charset="utf-8"/>
@@ -115,139 +228,128 @@ class EPUBGenerator:
     <title>{title}</title>
 </head>
 <body{body_class_attr}>
+
 """.format(title=document.metadata.title or "Untitled", body_class_attr=body_class_attr))
 
         # Front matter
         if document.front_matter:
-            html_parts.append('<section epub:type="frontmatter">')
+            write('<section epub:type="frontmatter">\n')
             for para in document.front_matter:
-                html_parts.append(self._paragraph_to_html(para))
-            html_parts.append('</section>')
+                self._write_paragraph_html(write, para)
+            write('</section>\n')
 
-        # Chapters
+        # Chapters, each rendered into its own string; rendering stays in this process
+        # because pickling chapters to a worker pool costs more than rendering them
         for idx, chapter in enumerate(document.chapters):
-            # Normalize chapter title to remove non-breaking spaces
-            chapter_title = self._normalize_text(chapter.title)
-            
-            # #region agent log
-            blocks = getattr(chapter, 'blocks', None) or getattr(chapter, 'paragraphs', [])
-            _debug_log(f"epub_generator.py:chapter:{idx}", "Processing chapter", {"title": chapter_title, "orig_title_repr": repr(chapter.title), "num_blocks": len(blocks), "block_types": [type(b).__name__ for b in blocks[:5]]}, "H2_empty")
-            # #endregion
-            html_parts.append(f'<section class="chapter" epub:type="chapter">')
-            html_parts.append(f'<h1 class="chapter-title">{self._escape_html(chapter_title)}</h1>')
-
-            # Track if previous block was a heading (chapter title counts as heading)
-            previous_block_was_heading = True
-
-            # Safe fallback for blocks - preserves compatibility with earlier IDMs
-            blocks = getattr(chapter, 'blocks', None)
-            if not blocks:
-                blocks = getattr(chapter, 'paragraphs', [])
-
-            for block in blocks:
-                if isinstance(block, IDMParagraph) and block.style in {"heading1","heading2","heading3"}:
-                    # Render as heading and keep heading context
-                    html_parts.append(self._paragraph_to_html(block, False))  # Will output <h1/2/3>
-                    previous_block_was_heading = True
-                elif isinstance(block, IDMParagraph):
-                    html_parts.append(self._paragraph_to_html(block, previous_block_was_heading))
-                    previous_block_was_heading = False
-                elif isinstance(block, IDMHeading):
-                    html_parts.append(self._heading_to_html(block))
-                    previous_block_was_heading = True
-                elif isinstance(block, IDMQuote):
-                    html_parts.append(self._quote_to_html(block))
-                    # Do not reset previous_block_was_heading here
-
-            html_parts.append('</section>')
+            write(self._chapter_html(idx, chapter))
 
         # Endnotes section (converted from footnotes)
         if any(chapter.footnotes for chapter in document.chapters):
-            html_parts.append(self._generate_endnotes_section(document.chapters))
+            self._write_endnotes_section(write, document.chapters)
 
         # Back matter
         if document.back_matter:
-            html_parts.append('<section epub:type="backmatter">')
+            write('<section epub:type="backmatter">\n')
             for para in document.back_matter:
-                html_parts.append(self._paragraph_to_html(para))
-            html_parts.append('</section>')
+                self._write_paragraph_html(write, para)
+            write('</section>\n')
 
         # HTML footer
-        html_parts.append("""
+        write("""
 </body>
 </html>""")
 
-        return '\n'.join(html_parts)
+        return buffer.getvalue()
 
-    def _paragraph_to_html(self, paragraph: IDMParagraph, is_first_after_heading: bool = False) -> str:
-        """Convert IDM paragraph to HTML"""
-        # Determine tag based on style
-        tag_map = {
-            'normal': 'p',
-            'heading1': 'h1',
-            'heading2': 'h2',
-            'heading3': 'h3',
-            'blockquote': 'blockquote'
-        }
+    def _chapter_html(self, idx: int, chapter: IDMChapter) -> str:
+        """Render one chapter as an HTML section, independently of the rest of the document"""
+        buffer = StringIO()
+        write = buffer.write
 
-        tag = tag_map.get(paragraph.style, 'p')
+        # Normalize chapter title to remove non-breaking spaces
+        chapter_title = self._normalize_text(chapter.title)
+        
+        # #region agent log
+        blocks = getattr(chapter, 'blocks', None) or getattr(chapter, 'paragraphs', [])
+        _debug_log(f"epub_generator.py:chapter:{idx}", "Processing chapter", {"title": chapter_title, "orig_title_repr": repr(chapter.title), "num_blocks": len(blocks), "block_types": [type(b).__name__ for b in blocks[:5]]}, "H2_empty")
+        # #endregion
+        write('<section class="chapter" epub:type="chapter">\n<h1 class="chapter-title">')
+        write(self._escape_html(chapter_title))
+        write('</h1>\n')
+
+        # Track if previous block was a heading (chapter title counts as heading)
+        previous_block_was_heading = True
 
-        # Build classes and attributes
-        classes = []
-        attrs = []
+        # Safe fallback for blocks - preserves compatibility with earlier IDMs
+        blocks = getattr(chapter, 'blocks', None)
+        if not blocks:
+            blocks = getattr(chapter, 'paragraphs', [])
 
-        if is_first_after_heading:
-            classes.append('first-para')
+        for block in blocks:
+            # Dispatch on the exact block type; unknown blocks are skipped
+            writer = _BLOCK_WRITERS.get(type(block))
+            if writer is not None:
+                previous_block_was_heading = writer(self, write, block, previous_block_was_heading)
 
-        if paragraph.is_quote:
-            classes.append('quote')
+        write('</section>\n')
+
+        return buffer.getvalue()
+
+    def _write_paragraph_html(self, write: Callable[[str], Any], paragraph: IDMParagraph,
+                              is_first_after_heading: bool = False) -> None:
+        """Write IDM paragraph as an HTML line"""
+        # Determine tag based on style
+        tag = _PARAGRAPH_TAGS.get(paragraph.style, 'p')
 
         # Use local text variable to avoid mutating paragraph.text
         text = paragraph.text
         if paragraph.footnote_refs:
-            # Add footnote reference links with IDs for backlinks
+            # Add footnote reference links with IDs for backlinks; each number is
+            # converted to text once rather than formatted three times
             footnote_links = []
             for ref_num in paragraph.footnote_refs:
-                footnote_links.append(f'<a id="noteref-{ref_num}" epub:type="noteref" href="#endnote-{ref_num}">[{ref_num}]</a>')
+                ref = str(ref_num)
+                footnote_links.append(f'<a id="noteref-{ref}" epub:type="noteref" href="#endnote-{ref}">[{ref}]</a>')
             footnote_refs_html = ''.join(footnote_links)
             # Append footnote references to the text
             text += f' {footnote_refs_html}'
 
-        class_attr = f' class="{" ".join(classes)}"' if classes else ''
+        # Class attribute for the (first after heading, quote) combination
+        class_attr = _PARAGRAPH_CLASS_ATTRS[bool(is_first_after_heading), bool(paragraph.is_quote)]
 
-        # Escape HTML entities
-        escaped_text = self._escape_html(text)
+        # Escape HTML entities; the escaped text is written as-is rather than copied into a tag string
+        write(f'<{tag}{class_attr}>')
+        write(self._escape_html(text))
+        write(f'</{tag}>\n')
 
-        return f'<{tag}{class_attr}>{escaped_text}</{tag}>'
-
-    def _heading_to_html(self, heading: IDMHeading) -> str:
-        """Convert IDM heading to HTML"""
+    def _write_heading_html(self, write: Callable[[str], Any], heading: IDMHeading) -> None:
+        """Write IDM heading as an HTML line"""
         tag = f'h{heading.level}'
-        text = self._escape_html(heading.text)
-        return f'<{tag}>{text}</{tag}>'
+        write(f'<{tag}>')
+        write(self._escape_html(heading.text))
+        write(f'</{tag}>\n')
 
-    def _quote_to_html(self, quote: IDMQuote) -> str:
-        """Convert IDM quote to HTML"""
+    def _write_quote_html(self, write: Callable[[str], Any], quote: IDMQuote) -> None:
+        """Write IDM quote as an HTML line"""
         text = self._escape_html(quote.text)
         cite_attr = f' cite="{self._escape_html(quote.attribution)}"' if quote.attribution else ''
-        return f'<blockquote{cite_attr}><p>{text}</p></blockquote>'
+        write(f'<blockquote{cite_attr}><p>')
+        write(text)
+        write('</p></blockquote>\n')
 
-    def _generate_endnotes_section(self, chapters: List[IDMChapter]) -> str:
-        """Generate endnotes section from chapter footnotes"""
-        html_parts = []
-        html_parts.append('<section class="endnotes" epub:type="endnotes">')
-        html_parts.append('<h1>Notes</h1>')
+    def _write_endnotes_section(self, write: Callable[[str], Any], chapters: List[IDMChapter]) -> None:
+        """Write endnotes section from chapter footnotes"""
+        write('<section class="endnotes" epub:type="endnotes">\n<h1>Notes</h1>\n')
 
-        footnote_count = 1
         for chapter in chapters:
             for footnote in chapter.footnotes:
-                html_parts.append(f'<div class="endnote" id="endnote-{footnote.number}">')
-                html_parts.append(f'<p class="endnote-number"><a href="#noteref-{footnote.number}">[{footnote.number}]</a></p>')
-                html_parts.append(f'<p class="endnote-text">{self._escape_html(footnote.text)}</p>')
-                html_parts.append('</div>')
+                write(f'<div class="endnote" id="endnote-{footnote.number}">\n'
+                      f'<p class="endnote-number"><a href="#noteref-{footnote.number}">[{footnote.number}]</a></p>\n'
+                      f'<p class="endnote-text">')
+                write(self._escape_html(footnote.text))
+                write('</p>\n</div>\n')
 
-        html_parts.append('</section>')
-        return '\n'.join(html_parts)
+        write('</section>\n')
 
     def _create_metadata_dict(self, document: IDMDocument) -> Dict[str, Any]:
         """Create metadata dictionary for Pandoc"""
@@ -268,21 +370,15 @@ class EPUBGenerator:
         if not os.path.exists(self.css_path):
             raise RuntimeError(f"CSS file not found: {self.css_path}")
 
-        # Create temporary HTML file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-            f.write(html_content)
-            temp_html_path = f.name
-
         # Create temporary EPUB path if needed
         temp_epub_path = output_path
         if not output_path.endswith('.epub'):
             temp_epub_path = output_path.replace('.epub', '_temp.epub')
 
         try:
-            # Build Pandoc command
+            # Build Pandoc command; with no input file it reads the HTML from stdin
             cmd = [
                 'pandoc',
-                temp_html_path,
                 '-f', 'html',
                 '-t', 'epub3',
                 '-o', temp_epub_path,
@@ -296,16 +392,13 @@ class EPUBGenerator:
             for key, value in metadata.items():
                 cmd.extend(['--metadata', f'{key}={value}'])
 
-            # Run Pandoc
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            # Run Pandoc, piping the HTML in rather than round-tripping it through a temp file
+            result = subprocess.run(cmd, input=html_content.encode('utf-8'), capture_output=True, check=True)
 
             return temp_epub_path
 
         except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Pandoc conversion failed: {e.stderr}")
-        finally:
-            # Clean up temporary HTML file
-            os.unlink(temp_html_path)
+            raise RuntimeError(f"Pandoc conversion failed: {e.stderr.decode('utf-8', errors='replace')}")
 
     def _post_process_epub(self, epub_path: str) -> None:
         """Post-process EPUB for KDP compliance"""
@@ -313,101 +406,95 @@ class EPUBGenerator:
         _debug_log("epub_generator.py:_post_process_epub:start", "Starting post-processing", {"epub_path": epub_path}, "H3_opf")
         # #endregion
         
-        # Create temporary directory for EPUB contents
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Unzip EPUB
+        # Only the OPF, nav.xhtml and fonts change, so the EPUB is rewritten entry by entry
+        # instead of being extracted and zipped back up; additions maps archive names to
+        # new content (bytes) or to a file to copy in (path)
+        additions: Dict[str, Union[bytes, str]] = {}
+        fd, temp_epub_path = tempfile.mkstemp(suffix='.epub', dir=os.path.dirname(os.path.abspath(epub_path)))
+        os.close(fd)
+
+        try:
             with zipfile.ZipFile(epub_path, 'r') as epub_zip:
-                epub_zip.extractall(temp_dir)
+                names = epub_zip.namelist()
                 # #region agent log
-                _debug_log("epub_generator.py:_post_process_epub:extracted", "EPUB extracted", {"files": epub_zip.namelist()}, "H3_opf")
+                _debug_log("epub_generator.py:_post_process_epub:extracted", "EPUB extracted", {"files": names}, "H3_opf")
                 # #endregion
 
-            # Enhance OPF metadata
-            self._enhance_opf_metadata(temp_dir)
+                # Parse the OPF once; every pass below edits the same tree
+                opf_name = self._find_opf_file(epub_zip)
+                if opf_name:
+                    with epub_zip.open(opf_name) as opf_file:
+                        tree = ET.parse(opf_file)
+
+                    # Enhance OPF metadata
+                    self._enhance_opf_metadata(tree)
 
-            # Generate nav.xhtml
-            self._generate_nav_xhtml(temp_dir)
+                    # Generate nav.xhtml
+                    self._generate_nav_xhtml(tree, opf_name, set(names), additions)
 
-            # Embed fonts
-            self._embed_fonts(temp_dir)
+                    # Embed fonts
+                    self._embed_fonts(tree, opf_name, additions)
 
-            # Convert footnotes to endnotes with backlinks
-            self._convert_footnotes_to_endnotes(temp_dir)
+                    # Replace the OPF with the enhanced tree
+                    opf_content = BytesIO()
+                    tree.write(opf_content, encoding='utf-8', xml_declaration=True)
+                    additions[opf_name] = opf_content.getvalue()
 
-            # Re-zip as EPUB
-            self._repackage_epub(temp_dir, epub_path)
+                # Convert footnotes to endnotes with backlinks
+                self._convert_footnotes_to_endnotes(epub_zip)
+
+                # Re-zip as EPUB
+                self._repackage_epub(epub_zip, additions, temp_epub_path)
+
+            os.replace(temp_epub_path, epub_path)
+        finally:
+            if os.path.exists(temp_epub_path):
+                os.unlink(temp_epub_path)
             
-            # #region agent log
-            _debug_log("epub_generator.py:_post_process_epub:complete", "Post-processing complete", {}, "H3_opf")
-            # #endregion
-
-    def _enhance_opf_metadata(self, epub_dir: str) -> None:
-        """Enhance OPF metadata for KDP compliance"""
-        opf_path = self._find_opf_file(epub_dir)
-        if not opf_path:
-            return
-
-        # Parse OPF file with proper namespaces
-        ET.register_namespace('opf', 'http://www.idpf.org/2007/opf')
-        ET.register_namespace('dc', 'http://purl.org/dc/elements/1.1/')
-        tree = ET.parse(opf_path)
-        root = tree.getroot()
+        # #region agent log
+        _debug_log("epub_generator.py:_post_process_epub:complete", "Post-processing complete", {}, "H3_opf")
+        # #endregion
 
-        ns = {
-            'opf': 'http://www.idpf.org/2007/opf',
-            'dc': 'http://purl.org/dc/elements/1.1/'
-        }
+    def _enhance_opf_metadata(self, tree: Any) -> None:
+        """Enhance the parsed OPF's metadata for KDP compliance"""
+        root = tree.getroot()
 
         # Add Dublin Core metadata if missing
-        metadata_elem = root.find('.//opf:metadata', ns)
+        metadata_elem = root.find('.//opf:metadata', _OPF_NAMESPACES)
         if metadata_elem is not None:
             # Add creator if missing
-            if metadata_elem.find('.//dc:creator', ns) is None:
-                creator = ET.SubElement(metadata_elem, '{http://purl.org/dc/elements/1.1/}creator')
+            if metadata_elem.find('.//dc:creator', _OPF_NAMESPACES) is None:
+                creator = ET.SubElement(metadata_elem, _DC_CREATOR)
                 creator.text = "Unknown Author"
 
             # Add language if missing
-            if metadata_elem.find('.//dc:language', ns) is None:
-                language = ET.SubElement(metadata_elem, '{http://purl.org/dc/elements/1.1/}language')
+            if metadata_elem.find('.//dc:language', _OPF_NAMESPACES) is None:
+                language = ET.SubElement(metadata_elem, _DC_LANGUAGE)
                 language.text = "en"
 
-        # Write back enhanced OPF
-        tree.write(opf_path, encoding='utf-8', xml_declaration=True)
-
-    def _generate_nav_xhtml(self, epub_dir: str) -> Optional[str]:
-        """Generate nav.xhtml table of contents if not already present"""
-        # Find OPF file and compute OPF directory
-        opf_path = self._find_opf_file(epub_dir)
-        if not opf_path:
-            return None
-
-        opf_dir = os.path.dirname(opf_path)
-        nav_path = os.path.join(opf_dir, 'nav.xhtml')
+    def _generate_nav_xhtml(self, tree: Any, opf_name: str, names: Set[str],
+                            additions: Dict[str, Union[bytes, str]]) -> Optional[str]:
+        """Generate nav.xhtml table of contents if not already present, adding it to the parsed OPF"""
+        # nav.xhtml sits next to the OPF in the archive
+        nav_name = posixpath.join(posixpath.dirname(opf_name), 'nav.xhtml')
 
         # Check if nav.xhtml already exists (generated by Pandoc)
-        if os.path.exists(nav_path):
-            return nav_path
+        if nav_name in names:
+            return nav_name
 
-        # Parse OPF to get spine items with proper namespaces
-        ET.register_namespace('opf', 'http://www.idpf.org/2007/opf')
-        tree = ET.parse(opf_path)
+        # Get spine items from the OPF
         root = tree.getroot()
 
-        ns = {
-            'opf': 'http://www.idpf.org/2007/opf',
-            'dc': 'http://purl.org/dc/elements/1.1/'
-        }
-
         spine_items = []
-        spine_elem = root.find('.//opf:spine', ns)
+        spine_elem = root.find('.//opf:spine', _OPF_NAMESPACES)
         if spine_elem is not None:
             for itemref in spine_elem:
                 idref = itemref.get('idref')
                 if idref:
                     spine_items.append(idref)
 
-        # Generate nav.xhtml content
-        nav_content = """<?xml version="1.0" encoding="utf-8"?>
+        # Generate nav.xhtml content, one list entry per spine item
+        nav_parts = ["""<?xml version="1.0" encoding="utf-8"?>
 <html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
 <head>
     <title>Table of Contents</title>
@@ -416,29 +503,28 @@ class EPUBGenerator:
     <nav epub:type="toc">
         <h1>Table of Contents</h1>
         <ol>
-"""
+"""]
 
         for item_id in spine_items:
             # Get title from manifest item
-            manifest_item = root.find(f'.//opf:item[@id="{item_id}"]', ns)
+            manifest_item = root.find(f'.//opf:item[@id="{item_id}"]', _OPF_NAMESPACES)
             if manifest_item is not None:
                 href = manifest_item.get('href', '')
                 title = href.replace('.xhtml', '').replace('_', ' ').title()
-                nav_content += f'            <li><a href="{href}">{title}</a></li>\n'
+                nav_parts.append(f'            <li><a href="{href}">{title}</a></li>\n')
 
-        nav_content += """        </ol>
+        nav_parts.append("""        </ol>
     </nav>
 </body>
-</html>"""
+</html>""")
 
-        # Write nav.xhtml
-        with open(nav_path, 'w', encoding='utf-8') as f:
-            f.write(nav_content)
+        # Add nav.xhtml to the archive
+        additions[nav_name] = ''.join(nav_parts).encode('utf-8')
 
         # Update OPF manifest to include nav.xhtml
-        manifest_elem = root.find('.//opf:manifest', ns)
+        manifest_elem = root.find('.//opf:manifest', _OPF_NAMESPACES)
         if manifest_elem is not None:
-            nav_item = ET.SubElement(manifest_elem, '{http://www.idpf.org/2007/opf}item')
+            nav_item = ET.SubElement(manifest_elem, _OPF_ITEM)
             nav_item.set('id', 'nav')
             nav_item.set('href', 'nav.xhtml')
             nav_item.set('media-type', 'application/xhtml+xml')
@@ -446,97 +532,104 @@ class EPUBGenerator:
 
         # Update spine to include nav
         if spine_elem is not None:
-            nav_itemref = ET.SubElement(spine_elem, '{http://www.idpf.org/2007/opf}itemref')
+            nav_itemref = ET.SubElement(spine_elem, _OPF_ITEMREF)
             nav_itemref.set('idref', 'nav')
             nav_itemref.set('linear', 'no')
 
-        tree.write(opf_path, encoding='utf-8', xml_declaration=True)
-
-        return nav_path
+        return nav_name
 
-    def _embed_fonts(self, epub_dir: str) -> None:
-        """Embed OFL-licensed fonts in EPUB if not already handled by Pandoc"""
+    def _embed_fonts(self, tree: Any, opf_name: str, additions: Dict[str, Union[bytes, str]]) -> None:
+        """Embed OFL-licensed fonts in EPUB if not already handled by Pandoc, listing them in the parsed OPF"""
         fonts_to_embed = [
             ('SourceSerif4-Regular.ttf', 'font-regular'),
             ('SourceSerif4-Semibold.ttf', 'font-semibold')
         ]
 
-        # Find OPF file and compute OPF directory
-        opf_path = self._find_opf_file(epub_dir)
-        if not opf_path:
-            return
-
-        opf_dir = os.path.dirname(opf_path)
-        fonts_dir = os.path.join(opf_dir, 'fonts')
-        os.makedirs(fonts_dir, exist_ok=True)
+        # Fonts go in a subdirectory next to the OPF
+        fonts_dir = posixpath.join(posixpath.dirname(opf_name), 'fonts')
 
-        # Parse OPF with proper namespaces
-        ET.register_namespace('opf', 'http://www.idpf.org/2007/opf')
-        tree = ET.parse(opf_path)
         root = tree.getroot()
 
-        ns = {
-            'opf': 'http://www.idpf.org/2007/opf',
-            'dc': 'http://purl.org/dc/elements/1.1/'
-        }
-
-        manifest_elem = root.find('.//opf:manifest', ns)
+        manifest_elem = root.find('.//opf:manifest', _OPF_NAMESPACES)
 
         if manifest_elem is not None:
             for font_file, font_id in fonts_to_embed:
                 font_src_path = os.path.join(self.fonts_dir, font_file)
                 if os.path.exists(font_src_path):
                     # Check if font is already in manifest (embedded by Pandoc)
-                    existing_font = manifest_elem.find(f'.//opf:item[@href="{font_file}"]', ns)
+                    existing_font = manifest_elem.find(f'.//opf:item[@href="{font_file}"]', _OPF_NAMESPACES)
                     if existing_font is not None:
                         continue  # Already embedded by Pandoc
 
-                    # Copy font to OPF fonts subdirectory
-                    font_dest_path = os.path.join(fonts_dir, font_file)
-                    with open(font_src_path, 'rb') as src, open(font_dest_path, 'wb') as dest:
-                        dest.write(src.read())
+                    # Copy font into the OPF fonts subdirectory when repackaging; ZipFile.write
+                    # streams it in chunks rather than reading the whole file into memory
+                    additions[posixpath.join(fonts_dir, font_file)] = font_src_path
 
                     # Add to manifest with namespaced tag and correct media type
-                    font_item = ET.SubElement(manifest_elem, '{http://www.idpf.org/2007/opf}item')
+                    font_item = ET.SubElement(manifest_elem, _OPF_ITEM)
                     font_item.set('id', font_id)
                     font_item.set('href', f'fonts/{font_file}')
                     font_item.set('media-type', 'font/ttf')
 
-        tree.write(opf_path, encoding='utf-8', xml_declaration=True)
-
-    def _convert_footnotes_to_endnotes(self, epub_dir: str) -> None:
+    def _convert_footnotes_to_endnotes(self, epub_zip: zipfile.ZipFile) -> None:
         """Convert footnotes to endnotes with backlinks (placeholder - Pandoc handles this)"""
         # Pandoc's epub3 output already handles footnote conversion
         # This method is for any additional post-processing if needed
         pass
 
-    def _repackage_epub(self, epub_dir: str, output_path: str) -> None:
-        """Repackage directory contents as EPUB file"""
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as epub_zip:
-            # Add mimetype first (must be uncompressed)
-            mimetype_path = os.path.join(epub_dir, 'mimetype')
-            if os.path.exists(mimetype_path):
-                epub_zip.write(mimetype_path, 'mimetype', zipfile.ZIP_STORED)
+    def _repackage_epub(self, epub_zip: zipfile.ZipFile, additions: Dict[str, Union[bytes, str]],
+                        output_path: str) -> None:
+        """Repackage EPUB entries as a new EPUB file, applying additions"""
+        pending = dict(additions)
+
+        def write_addition(out_zip: zipfile.ZipFile, name: str, source: Union[bytes, str]) -> None:
+            compress_type = zipfile.ZIP_STORED if name.lower().endswith(_STORED_EXTENSIONS) else None
+            if isinstance(source, bytes):
+                out_zip.writestr(name, source, compress_type)
             else:
+                out_zip.write(source, name, compress_type)
+
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as out_zip:
+            # Add mimetype first (must be uncompressed)
+            try:
+                mimetype = epub_zip.read('mimetype')
+            except KeyError:
                 # Create mimetype file
-                epub_zip.writestr('mimetype', 'application/epub+zip', zipfile.ZIP_STORED)
-
-            # Add all other files
-            for root, dirs, files in os.walk(epub_dir):
-                for file in files:
-                    if file == 'mimetype':
-                        continue  # Already added
-
-                    file_path = os.path.join(root, file)
-                    arc_path = os.path.relpath(file_path, epub_dir)
-                    epub_zip.write(file_path, arc_path)
-
-    def _find_opf_file(self, epub_dir: str) -> Optional[str]:
-        """Find the OPF file in the EPUB directory"""
-        for root, dirs, files in os.walk(epub_dir):
-            for file in files:
-                if file.endswith('.opf'):
-                    return os.path.join(root, file)
+                mimetype = 'application/epub+zip'
+            out_zip.writestr('mimetype', mimetype, zipfile.ZIP_STORED)
+
+            # Copy all other entries, replacing the ones that changed in place
+            for info in epub_zip.infolist():
+                if info.filename == 'mimetype':
+                    continue  # Already added
+
+                if info.filename in pending:
+                    write_addition(out_zip, info.filename, pending.pop(info.filename))
+                elif info.filename.lower().endswith(_STORED_EXTENSIONS):
+                    out_zip.writestr(info, epub_zip.read(info), zipfile.ZIP_STORED)
+                else:
+                    out_zip.writestr(info, epub_zip.read(info))
+
+            # Add new entries
+            for name, source in pending.items():
+                write_addition(out_zip, name, source)
+
+    def _find_opf_file(self, epub_zip: zipfile.ZipFile) -> Optional[str]:
+        """Find the OPF entry in the EPUB archive"""
+        # The OCF container names the package document; only scan entry names without one
+        try:
+            with epub_zip.open('META-INF/container.xml') as container_file:
+                container = ET.parse(container_file)
+            rootfile = container.find(_CONTAINER_ROOTFILE)
+            full_path = rootfile.get('full-path') if rootfile is not None else None
+            if full_path and full_path in epub_zip.namelist():
+                return full_path
+        except (KeyError, ET.ParseError):
+            pass
+
+        for name in epub_zip.namelist():
+            if name.endswith('.opf'):
+                return name
         return None
 
     def _check_pandoc_available(self) -> None:
@@ -549,16 +642,7 @@ class EPUBGenerator:
 
     def _normalize_text(self, text: str) -> str:
         """Normalize text by replacing problematic Unicode characters for KDP compatibility"""
-        # Replace non-breaking spaces with regular spaces (critical for KDP)
-        text = text.replace('\xa0', ' ')
-        # Replace other problematic Unicode whitespace
-        text = text.replace('\u2002', ' ')  # en space
-        text = text.replace('\u2003', ' ')  # em space
-        text = text.replace('\u2009', ' ')  # thin space
-        text = text.replace('\u200a', ' ')  # hair space
-        text = text.replace('\u200b', '')   # zero-width space
-        text = text.replace('\u00ad', '')   # soft hyphen
-        return text
+        return _normalize_kdp_text(text)
 
     def _escape_html(self, text: str) -> str:
         """Escape HTML entities in text"""
@@ -569,14 +653,8 @@ class EPUBGenerator:
             _debug_log("epub_generator.py:_escape_html:nbsp", "Found non-breaking spaces BEFORE normalization", {"count": nbsp_count, "text_preview": repr(text[:100])}, "H1_chars")
         # #endregion
         
-        # Normalize text first to remove problematic Unicode characters
-        text = self._normalize_text(text)
-        
-        return (text.replace('&', '&amp;')
-                    .replace('<', '&lt;')
-                    .replace('>', '&gt;')
-                    .replace('"', '&quot;')
-                    .replace("'", '&#39;'))
+        # Normalize text first to remove problematic Unicode characters, then escape
+        return _escape_html_text(text)
 
 
 def generate_epub(document: IDMDocument, output_path: str, css_path: Optional[str] = None, fonts_dir: Optional[str] = None,
@@ -5,13 +5,17 @@ This module validates generated EPUB files for KDP compatibility using epubcheck
 and custom validation checks.
 """
 
+import html
 import os
+import re
 import subprocess
 import zipfile
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
 from xml.etree import ElementTree as ET
 
 try:
@@ -19,6 +23,18 @@ try:
 except ImportError:
     etree = None
 
+# Stream OPF files with lxml's C parser when available
+_iterparse = etree.iterparse if etree is not None else ET.iterparse
+
+_OPF_METADATA_TAG = '{http://www.idpf.org/2007/opf}metadata'
+
+# Dublin Core tag -> required metadata field it provides
+_DC_FIELD_TAGS = {
+    '{http://purl.org/dc/elements/1.1/}title': 'title',
+    '{http://purl.org/dc/elements/1.1/}creator': 'creator',
+    '{http://purl.org/dc/elements/1.1/}language': 'language',
+}
+
 
 @dataclass
 class ValidationCheck:
@@ -83,12 +99,33 @@ def validate_epub_file(epub_path: str) -> EPUBValidationReport:
             warnings=[]
         )
 
+    # Reject files without the OCF mimetype header before starting any checks
+    header_error = _check_epub_header(epub_path)
+    if header_error:
+        return EPUBValidationReport(
+            epub_path=epub_path,
+            overall_status="error",
+            checks=[ValidationCheck(
+                "epub_header",
+                "error",
+                f"Not a valid EPUB: {header_error}"
+            )],
+            epubcheck_output="",
+            kdp_blockers=[f"epub_header: {header_error}"],
+            warnings=[]
+        )
+
     checks = []
     kdp_blockers = []
     warnings = []
 
-    # Run epubcheck
-    epubcheck_result = _run_epubcheck(epub_path)
+    # Run the custom KDP checks on a worker thread while epubcheck's JVM runs;
+    # the checks themselves take about a millisecond and stay serial
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        kdp_checks_future = executor.submit(_run_kdp_checks, epub_path)
+        epubcheck_result = _run_epubcheck(epub_path)
+        custom_checks = kdp_checks_future.result()
+
     checks.extend(epubcheck_result["checks"])
 
     # Add epubcheck output to report
@@ -101,8 +138,7 @@ def validate_epub_file(epub_path: str) -> EPUBValidationReport:
         elif check.status == "warning":
             warnings.append(f"{check.check_name}: {check.message}")
 
-    # Run custom KDP checks
-    custom_checks = _run_kdp_checks(epub_path)
+    # Add custom KDP checks
     checks.extend(custom_checks)
 
     # Update blockers and warnings from custom checks
@@ -133,9 +169,57 @@ def validate_epub_file(epub_path: str) -> EPUBValidationReport:
     )
 
 
+def validate_epub_files(epub_paths: List[str], max_workers: Optional[int] = None) -> List[EPUBValidationReport]:
+    """
+    Validate several EPUB files for KDP compatibility concurrently
+
+    Each file is still checked by its own epubcheck process (the CLI takes a
+    single EPUB), but those JVMs start and run side by side rather than one
+    after another, and the installation probe is shared by all of them.
+    Threads suffice since the work happens in the child processes.
+
+    Args:
+        epub_paths: Paths to the EPUB files to validate
+        max_workers: Number of files validated at once (defaults to the CPU count)
+
+    Returns:
+        EPUBValidationReport instances in the same order as epub_paths
+    """
+    # Probe once up front so concurrent validations don't each start a probe
+    _find_epubcheck_command()
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(executor.map(validate_epub_file, epub_paths))
+
+
+# OCF requires an uncompressed "mimetype" first entry with no extra field, so a
+# valid EPUB starts with this local file header followed by the media type
+_EPUB_HEADER_LENGTH = 58
+
+
+def _check_epub_header(epub_path: str) -> Optional[str]:
+    """Check the fixed EPUB header bytes, returning a problem description or None"""
+    try:
+        with open(epub_path, 'rb') as f:
+            header = f.read(_EPUB_HEADER_LENGTH)
+    except OSError as e:
+        return f"could not read file: {e}"
+
+    if header[:4] != b'PK\x03\x04':
+        return "file is not a ZIP archive"
+    if header[30:38] != b'mimetype':
+        return "first archive entry is not mimetype"
+    if header[8:10] != b'\x00\x00' or header[28:30] != b'\x00\x00':
+        return "mimetype entry is compressed or has an extra field"
+    if header[38:58] != b'application/epub+zip':
+        return "mimetype entry is not application/epub+zip"
+    return None
+
+
 def _run_epubcheck(epub_path: str) -> Dict[str, Any]:
     """Run epubcheck and parse results"""
-    if not _check_epubcheck_installed():
+    command = _find_epubcheck_command()
+    if command is None:
         return {
             "checks": [ValidationCheck(
                 "epubcheck",
@@ -145,42 +229,42 @@ def _run_epubcheck(epub_path: str) -> Dict[str, Any]:
             "output": "epubcheck not available"
         }
 
-    # Try wrapper script first, then fallback to JAR
-    epubcheck_cmds = [
-        ['epubcheck', epub_path],
-        ['java', '-jar', '/opt/epubcheck/epubcheck.jar', epub_path]
-    ]
-
-    for cmd in epubcheck_cmds:
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+    # Run the command variant that answered the installation probe, asking
+    # for the structured JSON report on stdout. The output is captured whole:
+    # the report is a single JSON document and the raw text is kept for the
+    # HTML report, so reading it line by line would not bound memory
+    try:
+        result = subprocess.run(
+            [*command, '--json', '-', '--quiet', epub_path],
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
 
-            # Parse epubcheck output
+        # Parse the JSON report, falling back to the console text for
+        # epubcheck versions that can't write it to stdout
+        checks = _parse_epubcheck_json(result.stdout)
+        if checks is None:
             checks = _parse_epubcheck_output(result.stdout + result.stderr)
 
-            return {
-                "checks": checks,
-                "output": result.stdout + result.stderr
-            }
-
-        except subprocess.TimeoutExpired:
-            return {
-                "checks": [ValidationCheck(
-                    "epubcheck",
-                    "error",
-                    "epubcheck timed out after 60 seconds"
-                )],
-                "output": "timeout"
-            }
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            continue  # Try next command
-
-    # If all commands failed
+        return {
+            "checks": checks,
+            "output": result.stdout + result.stderr
+        }
+
+    except subprocess.TimeoutExpired:
+        return {
+            "checks": [ValidationCheck(
+                "epubcheck",
+                "error",
+                "epubcheck timed out after 60 seconds"
+            )],
+            "output": "timeout"
+        }
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        pass
+
+    # If the command could not be run
     return {
         "checks": [ValidationCheck(
             "epubcheck",
@@ -191,8 +275,62 @@ def _run_epubcheck(epub_path: str) -> Dict[str, Any]:
     }
 
 
+# epubcheck JSON severity -> (check name, check status); INFO/USAGE are dropped
+_EPUBCHECK_SEVERITIES = {
+    'FATAL': ("epubcheck_error", "fail"),
+    'ERROR': ("epubcheck_error", "fail"),
+    'WARNING': ("epubcheck_warning", "warning"),
+}
+
+
+def _parse_epubcheck_json(output: str) -> Optional[List[ValidationCheck]]:
+    """Parse an epubcheck JSON report into validation checks, or None if there isn't one"""
+    start = output.find('{')
+    if start < 0:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(output, start)
+        messages = data['messages']
+    except (ValueError, TypeError, KeyError):
+        return None
+
+    checks = []
+    for record in messages:
+        mapped = _EPUBCHECK_SEVERITIES.get(record.get('severity'))
+        if mapped is None:
+            continue
+        check_name, status = mapped
+        locations = [
+            f"{location.get('path')}:{location.get('line')}:{location.get('column')}"
+            for location in record.get('locations') or ()
+        ]
+        checks.append(ValidationCheck(
+            check_name,
+            status,
+            record.get('message', ''),
+            {"id": record.get('ID'), "locations": locations}
+        ))
+
+    if not checks:
+        checks.append(ValidationCheck(
+            "epubcheck_validation",
+            "pass",
+            "EPUB passed epubcheck validation with no errors or warnings"
+        ))
+
+    return checks
+
+
+# One console message per line, e.g. "ERROR(RSC-005): OEBPS/ch1.xhtml(12,5): ..."
+# from epubcheck 4+ or "WARNING: ..." from older releases
+_EPUBCHECK_LINE_RE = re.compile(
+    r'^[ \t]*(FATAL|ERROR|WARNING)(?:\(([^)\n]*)\))?(?::|[ \t]|$)[ \t]*(.*?)[ \t\r]*$',
+    re.MULTILINE
+)
+
+
 def _parse_epubcheck_output(output: str) -> List[ValidationCheck]:
-    """Parse epubcheck output into validation checks"""
+    """Parse epubcheck console output into validation checks"""
     checks = []
 
     if "No errors or warnings detected" in output:
@@ -204,28 +342,15 @@ def _parse_epubcheck_output(output: str) -> List[ValidationCheck]:
         return checks
 
     # Parse errors and warnings
-    lines = output.split('\n')
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        if line.startswith('ERROR'):
-            # Extract error message
-            message = line[6:].strip()  # Remove "ERROR:" prefix
-            checks.append(ValidationCheck(
-                "epubcheck_error",
-                "fail",
-                message
-            ))
-        elif line.startswith('WARNING'):
-            # Extract warning message
-            message = line[8:].strip()  # Remove "WARNING:" prefix
-            checks.append(ValidationCheck(
-                "epubcheck_warning",
-                "warning",
-                message
-            ))
+    for match in _EPUBCHECK_LINE_RE.finditer(output):
+        severity, message_id, message = match.groups()
+        check_name, status = _EPUBCHECK_SEVERITIES[severity]
+        checks.append(ValidationCheck(
+            check_name,
+            status,
+            message,
+            {"id": message_id} if message_id else None
+        ))
 
     if not checks:
         # If we couldn't parse specific errors but there was output, assume failure
@@ -238,57 +363,84 @@ def _parse_epubcheck_output(output: str) -> List[ValidationCheck]:
     return checks
 
 
-def _run_kdp_checks(epub_path: str) -> List[ValidationCheck]:
-    """Run custom KDP-specific validation checks"""
-    checks = []
-
-    # Check file count
-    checks.append(_check_file_count(epub_path))
-
-    # Check file sizes
-    checks.append(_check_file_sizes(epub_path))
-
-    # Check metadata
-    checks.append(_check_metadata(epub_path))
-
-    # Check nav.xhtml
-    checks.append(_check_nav_xhtml(epub_path))
-
-    # Check fonts
-    checks.append(_check_fonts(epub_path))
+@dataclass
+class _EPUBEntries:
+    """EPUB archive entries classified for the KDP checks"""
+    html_files: List[str] = field(default_factory=list)
+    oversized_files: List[str] = field(default_factory=list)
+    nav_files: List[str] = field(default_factory=list)
+    font_files: List[str] = field(default_factory=list)
+    ofl_license_files: List[str] = field(default_factory=list)
+    opf_file: Optional[str] = None
+    has_mimetype: bool = False
+    has_container: bool = False
+
+
+def _scan_entries(epub_zip: zipfile.ZipFile) -> _EPUBEntries:
+    """Classify every EPUB entry for the KDP checks in a single pass"""
+    entries = _EPUBEntries()
+    for info in epub_zip.infolist():
+        name = info.filename
+        lower = name.lower()
+
+        if name.endswith(('.xhtml', '.html')):
+            entries.html_files.append(name)
+        if info.file_size > 30 * 1024 * 1024:  # 30MB
+            entries.oversized_files.append(name)
+        if 'nav.xhtml' in name:
+            entries.nav_files.append(name)
+        if lower.endswith(('.ttf', '.otf', '.woff', '.woff2')):
+            entries.font_files.append(name)
+        elif 'ofl' in lower and lower.endswith('.txt'):
+            entries.ofl_license_files.append(name)
+        if entries.opf_file is None and name.endswith('.opf'):
+            entries.opf_file = name
+
+    # Fixed names are looked up in the archive's own name -> ZipInfo index
+    entries.has_mimetype = 'mimetype' in epub_zip.NameToInfo
+    entries.has_container = 'META-INF/container.xml' in epub_zip.NameToInfo
+
+    return entries
 
-    # Check structure
-    checks.append(_check_structure(epub_path))
 
-    return checks
+def _run_kdp_checks(epub_path: str) -> List[ValidationCheck]:
+    """Run custom KDP-specific validation checks"""
+    # Open the EPUB and classify its entries once, sharing both across all checks
+    try:
+        with zipfile.ZipFile(epub_path, 'r') as epub_zip:
+            entries = _scan_entries(epub_zip)
+            return [check(epub_zip, entries) for check, _, _ in _KDP_CHECKS]
+    except Exception as e:
+        return [
+            ValidationCheck(check_name, "error", f"Failed to check {subject}: {str(e)}")
+            for _, check_name, subject in _KDP_CHECKS
+        ]
 
 
-def _check_file_count(epub_path: str) -> ValidationCheck:
+def _check_file_count(epub_zip: zipfile.ZipFile, entries: _EPUBEntries) -> ValidationCheck:
     """Check that EPUB has reasonable file count (< 300 HTML files)"""
     try:
-        with zipfile.ZipFile(epub_path, 'r') as epub_zip:
-            files = epub_zip.namelist()
-            html_files = [f for f in files if f.endswith(('.xhtml', '.html'))]
+        html_files = entries.html_files
 
-            if len(html_files) > 300:
-                return ValidationCheck(
-                    "file_count",
-                    "fail",
-                    f"Too many HTML files: {len(html_files)} (KDP limit: 300)",
-                    {"html_files": len(html_files), "limit": 300}
-                )
-            elif len(html_files) == 0:
-                return ValidationCheck(
-                    "file_count",
-                    "fail",
-                    "No HTML files found in EPUB"
-                )
-            else:
-                return ValidationCheck(
-                    "file_count",
-                    "pass",
-                    f"HTML file count: {len(html_files)} (within KDP limit of 300)"
-                )
+        if len(html_files) > 300:
+            return ValidationCheck(
+                "file_count",
+                "fail",
+                f"Too many HTML files: {len(html_files)} (KDP limit: 300)",
+                {"html_files": len(html_files), "limit": 300}
+            )
+        elif len(html_files) == 0:
+            return ValidationCheck(
+                "file_count",
+                "fail",
+                "No HTML files found in EPUB"
+            )
+        else:
+            return ValidationCheck(
+                "file_count",
+                "pass",
+                f"HTML file count: {len(html_files)} (within KDP limit of 300)"
+            )
     except Exception as e:
         return ValidationCheck(
             "file_count",
@@ -297,29 +449,24 @@ def _check_file_count(epub_path: str) -> ValidationCheck:
         )
 
 
-def _check_file_sizes(epub_path: str) -> ValidationCheck:
+def _check_file_sizes(epub_zip: zipfile.ZipFile, entries: _EPUBEntries) -> ValidationCheck:
     """Check that individual files are under 30MB"""
     try:
-        with zipfile.ZipFile(epub_path, 'r') as epub_zip:
-            oversized_files = []
-
-            for file_info in epub_zip.filelist:
-                if file_info.file_size > 30 * 1024 * 1024:  # 30MB
-                    oversized_files.append(file_info.filename)
+        oversized_files = entries.oversized_files
 
-            if oversized_files:
-                return ValidationCheck(
-                    "file_sizes",
-                    "fail",
-                    f"Files exceed 30MB limit: {', '.join(oversized_files)}",
-                    {"oversized_files": oversized_files, "limit_mb": 30}
-                )
-            else:
-                return ValidationCheck(
-                    "file_sizes",
-                    "pass",
-                    "All files are under 30MB limit"
-                )
+        if oversized_files:
+            return ValidationCheck(
+                "file_sizes",
+                "fail",
+                f"Files exceed 30MB limit: {', '.join(oversized_files)}",
+                {"oversized_files": oversized_files, "limit_mb": 30}
+            )
+        else:
+            return ValidationCheck(
+                "file_sizes",
+                "pass",
+                "All files are under 30MB limit"
+            )
     except Exception as e:
         return ValidationCheck(
             "file_sizes",
@@ -328,66 +475,81 @@ def _check_file_sizes(epub_path: str) -> ValidationCheck:
         )
 
 
-def _check_metadata(epub_path: str) -> ValidationCheck:
-    """Check for required metadata (title, author, language)"""
-    try:
-        with zipfile.ZipFile(epub_path, 'r') as epub_zip:
-            # Find OPF file
-            opf_file = None
-            for filename in epub_zip.namelist():
-                if filename.endswith('.opf'):
-                    opf_file = filename
-                    break
-
-            if not opf_file:
-                return ValidationCheck(
-                    "metadata",
-                    "fail",
-                    "No OPF file found in EPUB"
-                )
-
-            # Parse OPF file
-            with epub_zip.open(opf_file) as f:
-                opf_content = f.read().decode('utf-8')
+def _read_opf_metadata(opf_file) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Stream an OPF file and read its first metadata section
 
-            # Parse XML
-            root = ET.fromstring(opf_content)
+    Parsing stops at the end of that section, and elements are cleared as soon
+    as they have been seen, so the manifest and spine are never built.
 
-            # Check Dublin Core metadata
-            dc_ns = '{http://purl.org/dc/elements/1.1/}'
-            metadata_elem = root.find('.//{http://www.idpf.org/2007/opf}metadata')
+    Returns:
+        Text of the first title, creator and language inside the section, keyed
+        by field name, or None if the OPF has no metadata section
+    """
+    fields = None
+    for event, elem in _iterparse(opf_file, events=('start', 'end')):
+        if elem.tag == _OPF_METADATA_TAG:
+            if event == 'start' and fields is None:
+                fields = {}
+            elif event == 'end':
+                break
+        elif event == 'end':
+            if fields is not None and elem.tag in _DC_FIELD_TAGS:
+                fields.setdefault(_DC_FIELD_TAGS[elem.tag], elem.text)
+            elem.clear()
+
+    return fields
+
+
+def _check_metadata(epub_zip: zipfile.ZipFile, entries: _EPUBEntries) -> ValidationCheck:
+    """Check for required metadata (title, author, language)"""
+    try:
+        # Find OPF file
+        opf_file = entries.opf_file
 
-            if metadata_elem is None:
-                return ValidationCheck(
-                    "metadata",
-                    "fail",
-                    "No metadata section found in OPF"
-                )
+        if not opf_file:
+            return ValidationCheck(
+                "metadata",
+                "fail",
+                "No OPF file found in EPUB"
+            )
 
-            title = metadata_elem.find(f'.//{dc_ns}title')
-            creator = metadata_elem.find(f'.//{dc_ns}creator')
-            language = metadata_elem.find(f'.//{dc_ns}language')
+        # Stream the OPF up to the end of its metadata section; the parser reads
+        # the raw archive bytes and takes the encoding from the XML declaration
+        with epub_zip.open(opf_file) as f:
+            fields = _read_opf_metadata(f)
 
-            missing = []
-            if title is None or not title.text:
-                missing.append("title")
-            if creator is None or not creator.text:
-                missing.append("author")
-            if language is None or not language.text:
-                missing.append("language")
+        if fields is None:
+            return ValidationCheck(
+                "metadata",
+                "fail",
+                "No metadata section found in OPF"
+            )
 
-            if missing:
-                return ValidationCheck(
-                    "metadata",
-                    "fail",
-                    f"Missing required metadata: {', '.join(missing)}"
-                )
-            else:
-                return ValidationCheck(
-                    "metadata",
-                    "pass",
-                    f"Metadata present: title='{title.text}', author='{creator.text}', language='{language.text}'"
-                )
+        title = fields.get('title')
+        creator = fields.get('creator')
+        language = fields.get('language')
+
+        missing = []
+        if not title:
+            missing.append("title")
+        if not creator:
+            missing.append("author")
+        if not language:
+            missing.append("language")
+
+        if missing:
+            return ValidationCheck(
+                "metadata",
+                "fail",
+                f"Missing required metadata: {', '.join(missing)}"
+            )
+        else:
+            return ValidationCheck(
+                "metadata",
+                "pass",
+                f"Metadata present: title='{title}', author='{creator}', language='{language}'"
+            )
 
     except Exception as e:
         return ValidationCheck(
@@ -397,25 +559,22 @@ def _check_metadata(epub_path: str) -> ValidationCheck:
         )
 
 
-def _check_nav_xhtml(epub_path: str) -> ValidationCheck:
+def _check_nav_xhtml(epub_zip: zipfile.ZipFile, entries: _EPUBEntries) -> ValidationCheck:
     """Check for nav.xhtml file"""
     try:
-        with zipfile.ZipFile(epub_path, 'r') as epub_zip:
-            files = epub_zip.namelist()
-
-            nav_files = [f for f in files if 'nav.xhtml' in f]
-            if not nav_files:
-                return ValidationCheck(
-                    "nav_xhtml",
-                    "fail",
-                    "No nav.xhtml file found (required for EPUB 3)"
-                )
-            else:
-                return ValidationCheck(
-                    "nav_xhtml",
-                    "pass",
-                    f"nav.xhtml found: {nav_files[0]}"
-                )
+        nav_files = entries.nav_files
+        if not nav_files:
+            return ValidationCheck(
+                "nav_xhtml",
+                "fail",
+                "No nav.xhtml file found (required for EPUB 3)"
+            )
+        else:
+            return ValidationCheck(
+                "nav_xhtml",
+                "pass",
+                f"nav.xhtml found: {nav_files[0]}"
+            )
     except Exception as e:
         return ValidationCheck(
             "nav_xhtml",
@@ -424,36 +583,33 @@ def _check_nav_xhtml(epub_path: str) -> ValidationCheck:
         )
 
 
-def _check_fonts(epub_path: str) -> ValidationCheck:
+def _check_fonts(epub_zip: zipfile.ZipFile, entries: _EPUBEntries) -> ValidationCheck:
     """Check for embedded fonts"""
     try:
-        with zipfile.ZipFile(epub_path, 'r') as epub_zip:
-            files = epub_zip.namelist()
-
-            font_files = [f for f in files if f.lower().endswith(('.ttf', '.otf', '.woff', '.woff2'))]
+        font_files = entries.font_files
 
-            if not font_files:
+        if not font_files:
+            return ValidationCheck(
+                "fonts",
+                "warning",
+                "No embedded fonts found (fonts recommended for consistent rendering)"
+            )
+        else:
+            # Check for OFL license when fonts are present
+            ofl_license_files = entries.ofl_license_files
+            if not ofl_license_files:
                 return ValidationCheck(
                     "fonts",
                     "warning",
-                    "No embedded fonts found (fonts recommended for consistent rendering)"
+                    f"Embedded fonts found: {len(font_files)} ({', '.join(font_files)}), but no OFL license text detected. Ensure font licensing compliance.",
+                    {"font_files": font_files, "ofl_license_missing": True}
                 )
             else:
-                # Check for OFL license when fonts are present
-                ofl_license_files = [f for f in files if 'ofl' in f.lower() and f.lower().endswith('.txt')]
-                if not ofl_license_files:
-                    return ValidationCheck(
-                        "fonts",
-                        "warning",
-                        f"Embedded fonts found: {len(font_files)} ({', '.join(font_files)}), but no OFL license text detected. Ensure font licensing compliance.",
-                        {"font_files": font_files, "ofl_license_missing": True}
-                    )
-                else:
-                    return ValidationCheck(
-                        "fonts",
-                        "pass",
-                        f"Embedded fonts found: {len(font_files)} ({', '.join(font_files)}) with OFL license ({', '.join(ofl_license_files)})"
-                    )
+                return ValidationCheck(
+                    "fonts",
+                    "pass",
+                    f"Embedded fonts found: {len(font_files)} ({', '.join(font_files)}) with OFL license ({', '.join(ofl_license_files)})"
+                )
     except Exception as e:
         return ValidationCheck(
             "fonts",
@@ -462,37 +618,34 @@ def _check_fonts(epub_path: str) -> ValidationCheck:
         )
 
 
-def _check_structure(epub_path: str) -> ValidationCheck:
+def _check_structure(epub_zip: zipfile.ZipFile, entries: _EPUBEntries) -> ValidationCheck:
     """Check basic EPUB structure"""
     try:
-        with zipfile.ZipFile(epub_path, 'r') as epub_zip:
-            files = epub_zip.namelist()
-
-            # Check for required files
-            has_mimetype = 'mimetype' in files
-            has_container = 'META-INF/container.xml' in files
-            has_opf = any(f.endswith('.opf') for f in files)
-
-            missing = []
-            if not has_mimetype:
-                missing.append("mimetype")
-            if not has_container:
-                missing.append("META-INF/container.xml")
-            if not has_opf:
-                missing.append("OPF file")
-
-            if missing:
-                return ValidationCheck(
-                    "structure",
-                    "fail",
-                    f"Missing required EPUB files: {', '.join(missing)}"
-                )
-            else:
-                return ValidationCheck(
-                    "structure",
-                    "pass",
-                    "EPUB structure is valid (mimetype, container.xml, OPF present)"
-                )
+        # Check for required files
+        has_mimetype = entries.has_mimetype
+        has_container = entries.has_container
+        has_opf = entries.opf_file is not None
+
+        missing = []
+        if not has_mimetype:
+            missing.append("mimetype")
+        if not has_container:
+            missing.append("META-INF/container.xml")
+        if not has_opf:
+            missing.append("OPF file")
+
+        if missing:
+            return ValidationCheck(
+                "structure",
+                "fail",
+                f"Missing required EPUB files: {', '.join(missing)}"
+            )
+        else:
+            return ValidationCheck(
+                "structure",
+                "pass",
+                "EPUB structure is valid (mimetype, container.xml, OPF present)"
+            )
 
     except Exception as e:
         return ValidationCheck(
@@ -502,32 +655,72 @@ def _check_structure(epub_path: str) -> ValidationCheck:
         )
 
 
+# KDP check -> (check name, subject of its error message)
+_KDP_CHECKS = (
+    (_check_file_count, "file_count", "file count"),
+    (_check_file_sizes, "file_sizes", "file sizes"),
+    (_check_metadata, "metadata", "metadata"),
+    (_check_nav_xhtml, "nav_xhtml", "nav.xhtml"),
+    (_check_fonts, "fonts", "fonts"),
+    (_check_structure, "structure", "EPUB structure"),
+)
+
+
+# epubcheck command prefixes in order of preference: wrapper script, then JAR
+_EPUBCHECK_COMMANDS = (
+    ('epubcheck',),
+    ('java', '-jar', '/opt/epubcheck/epubcheck.jar'),
+)
+
+
+@lru_cache(maxsize=1)
+def _find_epubcheck_command() -> Optional[Tuple[str, ...]]:
+    """Find a working epubcheck command prefix, probing (and starting the JVM) once per process"""
+    for command in _EPUBCHECK_COMMANDS:
+        try:
+            result = subprocess.run(
+                [*command, '--version'],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+            if result.returncode == 0:
+                return command
+        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+            pass
+
+    return None
+
+
 def _check_epubcheck_installed() -> bool:
     """Check if epubcheck is installed"""
-    try:
-        # Try the wrapper script first
-        result = subprocess.run(
-            ['epubcheck', '--version'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        if result.returncode == 0:
-            return True
-    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-        pass
-
-    # Fallback to JAR path
-    try:
-        result = subprocess.run(
-            ['java', '-jar', '/opt/epubcheck/epubcheck.jar', '--version'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        return result.returncode == 0
-    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-        return False
+    return _find_epubcheck_command() is not None
+
+
+# Fixed preamble of the HTML validation report
+_REPORT_HTML_HEAD = (
+    "<!DOCTYPE html>\n"
+    "<html>\n<head>\n"
+    "<meta charset='utf-8'>\n"
+    "<title>EPUB Validation Report</title>\n"
+    "<style>\n"
+    "body { font-family: Arial, sans-serif; margin: 20px; }\n"
+    ".pass { color: green; }\n"
+    ".fail { color: red; }\n"
+    ".warning { color: orange; }\n"
+    ".error { color: red; font-weight: bold; }\n"
+    "h1, h2 { color: #333; }\n"
+    ".summary { background: #f5f5f5; padding: 10px; border-radius: 5px; margin: 10px 0; }\n"
+    "</style>\n"
+    "</head>\n<body>\n"
+)
+
+_STATUS_ICONS = {
+    'pass': '✓',
+    'fail': '✗',
+    'warning': '⚠',
+    'error': '✗'
+}
 
 
 def generate_epub_validation_report(report: EPUBValidationReport, output_path: str):
@@ -538,70 +731,58 @@ def generate_epub_validation_report(report: EPUBValidationReport, output_path: s
         report: EPUBValidationReport to write
         output_path: Path to write the report (HTML format)
     """
+    # Assemble the page in memory and write it once; report strings come from
+    # file names and epubcheck output, so they are escaped before interpolation
+    escape = html.escape
+    parts = [_REPORT_HTML_HEAD]
+    add = parts.append
+
+    add("<h1>EPUB Validation Report</h1>\n")
+    add(f"<p><strong>File:</strong> {escape(report.epub_path)}</p>\n")
+    status = escape(report.overall_status)
+    add(f"<p><strong>Overall Status:</strong> <span class='{status}'>{escape(report.overall_status.upper())}</span></p>\n")
+
+    # KDP Blockers
+    if report.kdp_blockers:
+        add("<h2>KDP Blockers</h2>\n<ul>\n")
+        for blocker in report.kdp_blockers:
+            add(f"<li class='fail'>{escape(blocker)}</li>\n")
+        add("</ul>\n")
+
+    # Warnings
+    if report.warnings:
+        add("<h2>Warnings</h2>\n<ul>\n")
+        for warning in report.warnings:
+            add(f"<li class='warning'>{escape(warning)}</li>\n")
+        add("</ul>\n")
+
+    # Detailed Checks
+    add("<h2>Detailed Checks</h2>\n")
+    for check in report.checks:
+        status_icon = _STATUS_ICONS.get(check.status, '?')
+        status = escape(check.status)
+        add(
+            f"<div class='summary'>\n"
+            f"<h3>{status_icon} {escape(check.check_name)} - <span class='{status}'>{escape(check.status.upper())}</span></h3>\n"
+            f"<p>{escape(check.message)}</p>\n"
+        )
+
+        if check.details:
+            add("<ul>\n")
+            for key, value in check.details.items():
+                add(f"<li><strong>{escape(str(key))}:</strong> {escape(str(value))}</li>\n")
+            add("</ul>\n")
+
+        add("</div>\n")
+
+    # Epubcheck Output
+    if report.epubcheck_output and report.epubcheck_output not in ["epubcheck not available", "timeout"]:
+        add("<h2>Epubcheck Output</h2>\n")
+        add("<pre style='background: #f5f5f5; padding: 10px; border-radius: 5px;'>\n")
+        add(escape(report.epubcheck_output))
+        add("</pre>\n")
+
+    add("</body>\n</html>\n")
+
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write("<!DOCTYPE html>\n")
-        f.write("<html>\n<head>\n")
-        f.write("<meta charset='utf-8'>\n")
-        f.write("<title>EPUB Validation Report</title>\n")
-        f.write("<style>\n")
-        f.write("body { font-family: Arial, sans-serif; margin: 20px; }\n")
-        f.write(".pass { color: green; }\n")
-        f.write(".fail { color: red; }\n")
-        f.write(".warning { color: orange; }\n")
-        f.write(".error { color: red; font-weight: bold; }\n")
-        f.write("h1, h2 { color: #333; }\n")
-        f.write(".summary { background: #f5f5f5; padding: 10px; border-radius: 5px; margin: 10px 0; }\n")
-        f.write("</style>\n")
-        f.write("</head>\n<body>\n")
-
-        f.write(f"<h1>EPUB Validation Report</h1>\n")
-        f.write(f"<p><strong>File:</strong> {report.epub_path}</p>\n")
-        f.write(f"<p><strong>Overall Status:</strong> <span class='{report.overall_status}'>{report.overall_status.upper()}</span></p>\n")
-
-        # KDP Blockers
-        if report.kdp_blockers:
-            f.write("<h2>KDP Blockers</h2>\n")
-            f.write("<ul>\n")
-            for blocker in report.kdp_blockers:
-                f.write(f"<li class='fail'>{blocker}</li>\n")
-            f.write("</ul>\n")
-
-        # Warnings
-        if report.warnings:
-            f.write("<h2>Warnings</h2>\n")
-            f.write("<ul>\n")
-            for warning in report.warnings:
-                f.write(f"<li class='warning'>{warning}</li>\n")
-            f.write("</ul>\n")
-
-        # Detailed Checks
-        f.write("<h2>Detailed Checks</h2>\n")
-        for check in report.checks:
-            status_class = check.status
-            status_icon = {
-                'pass': '✓',
-                'fail': '✗',
-                'warning': '⚠',
-                'error': '✗'
-            }.get(check.status, '?')
-
-            f.write(f"<div class='summary'>\n")
-            f.write(f"<h3>{status_icon} {check.check_name} - <span class='{status_class}'>{check.status.upper()}</span></h3>\n")
-            f.write(f"<p>{check.message}</p>\n")
-
-            if check.details:
-                f.write("<ul>\n")
-                for key, value in check.details.items():
-                    f.write(f"<li><strong>{key}:</strong> {value}</li>\n")
-                f.write("</ul>\n")
-
-            f.write("</div>\n")
-
-        # Epubcheck Output
-        if report.epubcheck_output and report.epubcheck_output not in ["epubcheck not available", "timeout"]:
-            f.write("<h2>Epubcheck Output</h2>\n")
-            f.write("<pre style='background: #f5f5f5; padding: 10px; border-radius: 5px;'>\n")
-            f.write(report.epubcheck_output)
-            f.write("</pre>\n")
-
-        f.write("</body>\n</html>\n")
+        f.write(''.join(parts))
@@ -5,11 +5,22 @@ This module defines the Internal Document Model (IDM) used for processing
 manuscripts into KDP-compatible formats.
 """
 
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass, field
+import json
+import sys
+from typing import Any, Callable, Dict, List, Optional, Union
+from dataclasses import dataclass, field, fields
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+# Slotted dataclasses drop the per-instance __dict__ (large manuscripts hold tens
+# of thousands of blocks); dataclass(slots=...) needs Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class IDMMetadata:
     """Metadata for the document"""
     title: str = ""
@@ -24,7 +35,7 @@ class IDMMetadata:
     ai_cost: float = 0.0
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class IDMHeading:
     """Represents a heading in the document"""
     text: str
@@ -32,7 +43,7 @@ class IDMHeading:
     style: str = "normal"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class IDMQuote:
     """Represents a quote or blockquote in the document"""
     text: str
@@ -40,7 +51,7 @@ class IDMQuote:
     style: str = "blockquote"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class IDMFootnote:
     """Represents a footnote in the document"""
     number: int
@@ -48,7 +59,7 @@ class IDMFootnote:
     reference_location: str = ""
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class IDMParagraph:
     """Represents a paragraph in the document"""
     text: str
@@ -62,7 +73,7 @@ class IDMParagraph:
     heading_level: Optional[int] = None  # for paragraphs that are actually headings (backward compatibility)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class IDMChapter:
     """Represents a chapter in the document"""
     title: str
@@ -74,10 +85,13 @@ class IDMChapter:
     @property
     def paragraphs(self) -> List[IDMParagraph]:
         """Backward compatibility: return only paragraphs from blocks"""
+        # Recomputed on each access: converters assign and append to blocks
+        # directly, so a cached view could go stale, and callers only take
+        # its length once per chapter
         return [block for block in self.blocks if isinstance(block, IDMParagraph)]
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class IDMDocument:
     """Internal Document Model representing a complete manuscript"""
     metadata: IDMMetadata = field(default_factory=IDMMetadata)
@@ -86,89 +100,167 @@ class IDMDocument:
     back_matter: List[IDMParagraph] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        def block_to_dict(block: Union[IDMParagraph, IDMHeading, IDMQuote]) -> Dict[str, Any]:
-            """Convert a block to dictionary with type information"""
-            if isinstance(block, IDMParagraph):
-                return {
-                    "type": "paragraph",
-                    "text": block.text,
-                    "style": block.style,
-                    "alignment": block.alignment,
-                    "indent": block.indent,
-                    "spacing_before": block.spacing_before,
-                    "spacing_after": block.spacing_after,
-                    "footnote_refs": block.footnote_refs,
-                    "is_quote": block.is_quote,
-                    "heading_level": block.heading_level
-                }
-            elif isinstance(block, IDMHeading):
-                return {
-                    "type": "heading",
-                    "text": block.text,
-                    "level": block.level,
-                    "style": block.style
-                }
-            elif isinstance(block, IDMQuote):
-                return {
-                    "type": "quote",
-                    "text": block.text,
-                    "attribution": block.attribution,
-                    "style": block.style
-                }
-            else:
-                raise ValueError(f"Unknown block type: {type(block)}")
-
+        """Convert to dictionary for JSON serialization (builds the whole document in memory)"""
         return {
-            "metadata": {
-                "title": self.metadata.title,
-                "author": self.metadata.author,
-                "isbn": self.metadata.isbn,
-                "language": self.metadata.language,
-                "word_count": self.metadata.word_count,
-                "page_count_estimate": self.metadata.page_count_estimate,
-                "has_front_matter": self.metadata.has_front_matter,
-                "has_back_matter": self.metadata.has_back_matter,
-                "detected_by_ai": self.metadata.detected_by_ai,
-                "ai_cost": self.metadata.ai_cost
-            },
-            "chapters": [
-                {
-                    "title": chapter.title,
-                    "number": chapter.number,
-                    "blocks": [block_to_dict(block) for block in chapter.blocks],
-                    "footnotes": [
-                        {
-                            "number": fn.number,
-                            "text": fn.text,
-                            "reference_location": fn.reference_location
-                        }
-                        for fn in chapter.footnotes
-                    ],
-                    "start_on_recto": chapter.start_on_recto
-                }
-                for chapter in self.chapters
-            ],
-            "front_matter": [
-                {
-                    "text": p.text,
-                    "style": p.style,
-                    "alignment": p.alignment,
-                    "indent": p.indent,
-                    "spacing_before": p.spacing_before,
-                    "spacing_after": p.spacing_after
-                }
-                for p in self.front_matter
-            ],
-            "back_matter": [
-                {
-                    "text": p.text,
-                    "style": p.style,
-                    "alignment": p.alignment,
-                    "indent": p.indent,
-                    "spacing_before": p.spacing_before,
-                    "spacing_after": p.spacing_after
-                }
-                for p in self.back_matter
-            ]
+            "metadata": _metadata_to_dict(self.metadata),
+            "chapters": [_chapter_to_dict(chapter) for chapter in self.chapters],
+            "front_matter": [_matter_to_dict(p) for p in self.front_matter],
+            "back_matter": [_matter_to_dict(p) for p in self.back_matter]
         }
+
+    def to_json_bytes(self, indent: bool = False) -> bytes:
+        """
+        Serialize to UTF-8 JSON, using orjson when it is installed
+
+        Args:
+            indent: Pretty-print with two-space indentation
+
+        Returns:
+            The JSON document as bytes
+        """
+        return _json_dumps(self.to_dict(), indent)
+
+    def write_json(self, path: str, indent: bool = False):
+        """
+        Stream the document to a JSON file one chapter at a time
+
+        Produces the same bytes as to_json_bytes() while holding only one
+        chapter's dictionaries in memory.
+
+        Args:
+            path: Output file path
+            indent: Pretty-print with two-space indentation
+        """
+        newline = b'\n  ' if indent else b''
+        separator = b': ' if indent else b':'
+        with open(path, 'wb') as f:
+            f.write(b'{' + newline + b'"metadata"' + separator)
+            metadata_json = _json_dumps(_metadata_to_dict(self.metadata), indent)
+            f.write(metadata_json.replace(b'\n', newline) if indent else metadata_json)
+            for key, items, item_to_dict in (
+                (b'"chapters"', self.chapters, _chapter_to_dict),
+                (b'"front_matter"', self.front_matter, _matter_to_dict),
+                (b'"back_matter"', self.back_matter, _matter_to_dict),
+            ):
+                f.write(b',' + newline + key + separator)
+                _write_json_list(f, items, item_to_dict, indent)
+            f.write(b'\n}' if indent else b'}')
+
+
+def _json_dumps(data: Any, indent: bool) -> bytes:
+    """Encode data as UTF-8 JSON with orjson, falling back to the json module"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _write_json_list(f, items: List[Any], item_to_dict: Callable[[Any], Dict[str, Any]], indent: bool):
+    """Write a JSON array nested one level deep, encoding one item at a time"""
+    if not items:
+        f.write(b'[]')
+        return
+    # Encoded JSON never holds a raw newline inside a string, so indented items
+    # can be shifted to the nesting depth with a plain replace
+    item_newline = b'\n    ' if indent else b''
+    f.write(b'[')
+    for index, item in enumerate(items):
+        if index:
+            f.write(b',')
+        f.write(item_newline)
+        item_json = _json_dumps(item_to_dict(item), indent)
+        f.write(item_json.replace(b'\n', item_newline) if indent else item_json)
+    f.write(b'\n  ]' if indent else b']')
+
+
+# Every metadata field is serialized, in declaration order
+_METADATA_FIELDS = tuple(f.name for f in fields(IDMMetadata))
+
+
+def _metadata_to_dict(metadata: IDMMetadata) -> Dict[str, Any]:
+    """Convert document metadata to a dictionary"""
+    return {name: getattr(metadata, name) for name in _METADATA_FIELDS}
+
+
+def _paragraph_to_dict(block: IDMParagraph) -> Dict[str, Any]:
+    """Convert a paragraph block to dictionary with type information"""
+    return {
+        "type": "paragraph",
+        "text": block.text,
+        "style": block.style,
+        "alignment": block.alignment,
+        "indent": block.indent,
+        "spacing_before": block.spacing_before,
+        "spacing_after": block.spacing_after,
+        "footnote_refs": block.footnote_refs,
+        "is_quote": block.is_quote,
+        "heading_level": block.heading_level
+    }
+
+
+def _heading_to_dict(block: IDMHeading) -> Dict[str, Any]:
+    """Convert a heading block to dictionary with type information"""
+    return {
+        "type": "heading",
+        "text": block.text,
+        "level": block.level,
+        "style": block.style
+    }
+
+
+def _quote_to_dict(block: IDMQuote) -> Dict[str, Any]:
+    """Convert a quote block to dictionary with type information"""
+    return {
+        "type": "quote",
+        "text": block.text,
+        "attribution": block.attribution,
+        "style": block.style
+    }
+
+
+# IDM block type -> dictionary converter
+_BLOCK_TO_DICT = {
+    IDMParagraph: _paragraph_to_dict,
+    IDMHeading: _heading_to_dict,
+    IDMQuote: _quote_to_dict,
+}
+
+
+def _unknown_block_to_dict(block: Any) -> Dict[str, Any]:
+    """Reject blocks that are not an IDM block type"""
+    raise ValueError(f"Unknown block type: {type(block)}")
+
+
+def _chapter_to_dict(chapter: IDMChapter) -> Dict[str, Any]:
+    """Convert a chapter, its blocks and footnotes to a dictionary"""
+    return {
+        "title": chapter.title,
+        "number": chapter.number,
+        # Dispatch on the exact block type rather than an isinstance chain
+        "blocks": [
+            _BLOCK_TO_DICT.get(type(block), _unknown_block_to_dict)(block)
+            for block in chapter.blocks
+        ],
+        "footnotes": [
+            {
+                "number": fn.number,
+                "text": fn.text,
+                "reference_location": fn.reference_location
+            }
+            for fn in chapter.footnotes
+        ],
+        "start_on_recto": chapter.start_on_recto
+    }
+
+
+def _matter_to_dict(p: IDMParagraph) -> Dict[str, Any]:
+    """Convert a front or back matter paragraph to a dictionary"""
+    return {
+        "text": p.text,
+        "style": p.style,
+        "alignment": p.alignment,
+        "indent": p.indent,
+        "spacing_before": p.spacing_before,
+        "spacing_after": p.spacing_after
+    }
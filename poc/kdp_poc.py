@@ -16,47 +16,62 @@ Usage:
 
     # Generate only EPUB
     python poc/kdp_poc.py --input test_data/sample_short.txt --output output/sample.epub --epub --skip-pdf
+
+    # Also save the intermediate document model as JSON
+    python poc/kdp_poc.py --input test_data/sample_short.txt --output output/sample_print.pdf --emit-idm
+
+    # Process every .txt manuscript in a directory in one run
+    python poc/kdp_poc.py --input-dir test_data --output-dir output --pattern '*.txt' --epub
 """
 
 import argparse
-import json
+import io
+import multiprocessing
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
 
 # Add poc directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 
-try:
-    from converters import convert, compare_detection_methods
-    from renderer import render_document_to_pdf
-    from validator import validate_pdf_file, generate_validation_report
-    from epub_generator import generate_epub
-    from epub_validator import validate_epub_file, generate_epub_validation_report
-except ImportError:
-    # Fallback for direct script execution
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(__file__))
-    from converters import convert, compare_detection_methods
-    from renderer import render_document_to_pdf
-    from validator import validate_pdf_file, generate_validation_report
-    from epub_generator import generate_epub
-    from epub_validator import validate_epub_file, generate_epub_validation_report
+# The pipeline modules (converters, renderer, validator, epub_generator,
+# epub_validator) are imported where they are first needed, so runs that never
+# render or validate a format don't pay for importing its dependencies
+
+
+# Console icons for validation statuses
+_STATUS_ICONS = {'pass': '✓', 'fail': '✗', 'warning': '⚠', 'error': '✗'}
+
+# Input formats accepted in batch mode
+_SUPPORTED_INPUT_EXTENSIONS = ('.txt', '.pdf', '.docx', '.md')
 
 
 def main():
     parser = argparse.ArgumentParser(description='KDP Formatter POC')
     parser.add_argument(
         '--input', '-i',
-        required=True,
         help='Input document path (supports .txt, .pdf, .docx, .md)'
     )
     parser.add_argument(
         '--output', '-o',
-        required=True,
         help='Output PDF path'
     )
+    parser.add_argument(
+        '--input-dir',
+        help='Process every matching document in this directory (batch mode, use with --output-dir)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        help='Directory for batch outputs, named <input name>_print.pdf/.epub'
+    )
+    parser.add_argument(
+        '--pattern',
+        default='*',
+        help='Glob pattern selecting batch inputs within --input-dir (default: all supported files)'
+    )
     parser.add_argument(
         '--css',
         help='Custom CSS stylesheet path (default: poc/styles.css)'
@@ -101,6 +116,11 @@ def main():
         action='store_true',
         help='Skip PDF generation, only generate EPUB (requires --epub flag)'
     )
+    parser.add_argument(
+        '--emit-idm',
+        action='store_true',
+        help='Save the intermediate document model as JSON next to the output (always on with --verbose)'
+    )
     parser.add_argument(
         '--drop-caps',
         action='store_true',
@@ -109,6 +129,22 @@ def main():
 
     args = parser.parse_args()
 
+    if args.skip_pdf and not args.epub:
+        print("Error: --skip-pdf requires --epub flag")
+        sys.exit(1)
+
+    if args.input_dir or args.output_dir:
+        if not (args.input_dir and args.output_dir):
+            parser.error("--input-dir and --output-dir must be used together")
+        if args.input or args.output or args.epub_output or args.validate_only or args.compare_methods:
+            parser.error("batch mode cannot be combined with --input, --output, --epub-output, "
+                         "--validate-only or --compare-methods")
+        process_directory(args)
+        return
+
+    if not (args.input and args.output):
+        parser.error("the following arguments are required: --input/-i, --output/-o")
+
     # Ensure output directory exists
     output_dir = os.path.dirname(args.output)
     if output_dir and not os.path.exists(output_dir):
@@ -133,6 +169,7 @@ def main():
     if args.compare_methods:
         print(f"Comparing detection methods for: {args.input}")
         try:
+            from converters import compare_detection_methods
             comparison = compare_detection_methods(args.input)
             print("\n=== Detection Method Comparison ===")
             print(f"File: {comparison['file']}")
@@ -171,45 +208,55 @@ def main():
             sys.exit(1)
         return
 
-    print(f"Processing: {args.input}")
-    print(f"Output: {args.output}")
+    if not process_document(args, args.input, args.output):
+        sys.exit(1)
+
+
+def process_document(args: argparse.Namespace, input_path: str, output_path: str,
+                     parallel_formats: bool = True) -> bool:
+    """
+    Convert one document and render, then validate, the requested formats
+
+    Args:
+        args: Parsed command line arguments
+        input_path: Input document path
+        output_path: Output PDF path (EPUB and report paths are derived from it)
+        parallel_formats: Render PDF and EPUB in separate processes when both are requested
+
+    Returns:
+        True if every requested file was generated, False if an error was reported
+    """
+    print(f"Processing: {input_path}")
+    print(f"Output: {output_path}")
 
     # Determine output paths
-    pdf_output = args.output if not args.skip_pdf else None
+    pdf_output = output_path if not args.skip_pdf else None
     epub_output = None
     if args.epub:
         if args.epub_output:
             epub_output = args.epub_output
-        elif pdf_output:
-            epub_output = pdf_output.replace('.pdf', '.epub')
         else:
-            # EPUB-only mode with default naming
-            epub_output = args.output.replace('.pdf', '.epub')
-
-    # Validate arguments
-    if args.skip_pdf and not args.epub:
-        print("Error: --skip-pdf requires --epub flag")
-        sys.exit(1)
-
-    if not pdf_output and not epub_output:
-        print("Error: Must generate either PDF or EPUB (use --epub flag)")
-        sys.exit(1)
+            # Default naming, also used in EPUB-only mode
+            epub_output = _sibling_path(output_path, '.epub')
 
     try:
         # Step 1: Convert input to IDM
         if args.verbose:
             print("Step 1: Converting document to IDM...")
-        document = convert(args.input, use_ai=args.use_ai, ai_model=args.ai_model)
-
-        # Step 2: Save IDM as JSON (for inspection)
-        if pdf_output:
-            idm_path = pdf_output.replace('.pdf', '_idm.json')
-        else:
-            idm_path = epub_output.replace('.epub', '_idm.json')
-        with open(idm_path, 'w', encoding='utf-8') as f:
-            json.dump(document.to_dict(), f, indent=2, ensure_ascii=False)
-        if args.verbose:
-            print(f"IDM saved to: {idm_path}")
+        from converters import convert
+        document = convert(input_path, use_ai=args.use_ai, ai_model=args.ai_model)
+
+        # Step 2: Save IDM as JSON when asked to (for inspection), encoded with
+        # orjson one chapter at a time; nothing later needs the dict form, so
+        # none is kept. Rendering only reads the IDM, so the file is written on
+        # a background thread while it runs
+        idm_path = None
+        idm_future = None
+        if args.verbose or args.emit_idm:
+            idm_path = _sibling_path(pdf_output or epub_output, '_idm.json')
+            idm_writer = ThreadPoolExecutor(max_workers=1)
+            idm_future = idm_writer.submit(document.write_json, idm_path, True)
+            idm_writer.shutdown(wait=False)
 
         # Report AI detection results
         if document.metadata.detected_by_ai:
@@ -217,79 +264,175 @@ def main():
         else:
             print("Structure detected by: Regex (cost: $0.00)")
 
-        step_counter = 3
-
-        # Step 3: Render to PDF (if not skipped)
-        if pdf_output:
-            if args.verbose:
-                print(f"Step {step_counter}: Rendering PDF...")
-            render_document_to_pdf(document, pdf_output, args.css, use_drop_caps=args.drop_caps)
-
-            if args.verbose:
-                print(f"PDF generated: {pdf_output}")
-
-            # Step 4: Validate PDF
-            if args.verbose:
-                print(f"Step {step_counter + 1}: Validating PDF...")
-            validate_and_report(pdf_output, args.verbose)
-            step_counter += 2
-
-        # Step X: Generate EPUB (if requested)
-        if epub_output:
-            if args.verbose:
-                print(f"Step {step_counter}: Generating EPUB...")
-            generate_epub(document, epub_output)
-
-            if args.verbose:
-                print(f"EPUB generated: {epub_output}")
+        # Steps 3+: Render and validate each requested format
+        if pdf_output and epub_output and parallel_formats:
+            # The two formats share no state, so render them in separate
+            # processes; each worker's console output is captured and printed
+            # in the usual PDF-then-EPUB order once both have finished. The
+            # IDM writer thread may be mid-write, so the workers are spawned
+            # rather than forked from a process with a live thread
+            with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as pool:
+                pdf_future = pool.submit(
+                    _run_captured, _generate_pdf, document, pdf_output, args.css, args.drop_caps, 3, args.verbose
+                )
+                epub_future = pool.submit(
+                    _run_captured, _generate_epub, document, epub_output, 5, args.verbose
+                )
+                sys.stdout.write(pdf_future.result())
+                sys.stdout.write(epub_future.result())
+        else:
+            if pdf_output:
+                _generate_pdf(document, pdf_output, args.css, args.drop_caps, 3, args.verbose)
+            if epub_output:
+                _generate_epub(document, epub_output, 5 if pdf_output else 3, args.verbose)
 
-            # Step X+1: Validate EPUB
+        if idm_future is not None:
+            idm_future.result()
             if args.verbose:
-                print(f"Step {step_counter + 1}: Validating EPUB...")
-            validate_epub_and_report(epub_output, args.verbose)
-            step_counter += 2
+                print(f"IDM saved to: {idm_path}")
 
         print("\nSuccess! Generated files:")
         if pdf_output:
             print(f"  PDF: {pdf_output}")
-            print(f"  PDF Report: {pdf_output.replace('.pdf', '_report.txt')}")
+            print(f"  PDF Report: {_sibling_path(pdf_output, '_report.txt')}")
             if args.drop_caps:
                 print("  Drop Caps: Enabled (test carefully in KDP Preview)")
         if epub_output:
             print(f"  EPUB: {epub_output}")
-            print(f"  EPUB Report: {epub_output.replace('.epub', '_epub_report.html')}")
-        print(f"  IDM: {idm_path}")
+            print(f"  EPUB Report: {_sibling_path(epub_output, '_epub_report.html')}")
+        if idm_path:
+            print(f"  IDM: {idm_path}")
         if document.metadata.detected_by_ai:
             print(f"  AI Cost: ${document.metadata.ai_cost:.4f}")
+        return True
 
     except Exception as e:
         print(f"Error: {str(e)}")
         if args.verbose:
             import traceback
             traceback.print_exc()
+        return False
+
+
+
+def process_directory(args: argparse.Namespace):
+    """Process every supported document matching --pattern in --input-dir"""
+    from converters import _disable_parallel_pdf_pages
+
+    input_paths = sorted(
+        str(path) for path in Path(args.input_dir).glob(args.pattern)
+        if path.is_file() and path.suffix.lower() in _SUPPORTED_INPUT_EXTENSIONS
+    )
+    if not input_paths:
+        print(f"Error: No supported input files matching '{args.pattern}' in {args.input_dir}")
         sys.exit(1)
 
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_paths = [
+        os.path.join(args.output_dir, f"{Path(input_path).stem}_print.pdf")
+        for input_path in input_paths
+    ]
+
+    # Documents are independent, so each one runs through the whole pipeline in
+    # its own worker process, importing and warming up the renderers once per
+    # worker rather than once per file. Inside a worker, formats and PDF pages
+    # are processed serially to avoid nesting process pools.
+    failed = []
+    with ProcessPoolExecutor(initializer=_disable_parallel_pdf_pages) as pool:
+        futures = [
+            pool.submit(_process_captured, args, input_path, output_path)
+            for input_path, output_path in zip(input_paths, output_paths)
+        ]
+        for input_path, future in zip(input_paths, futures):
+            succeeded, output = future.result()
+            sys.stdout.write(output + "\n")
+            if not succeeded:
+                failed.append(input_path)
+
+    print(f"Batch complete: {len(input_paths) - len(failed)} of {len(input_paths)} documents processed")
+    if failed:
+        print("Failed:")
+        for input_path in failed:
+            print(f"  {input_path}")
+        sys.exit(1)
+
+
+def _process_captured(args: argparse.Namespace, input_path: str, output_path: str) -> Tuple[bool, str]:
+    """Process one batch document in a worker, returning its result and console output"""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        succeeded = process_document(args, input_path, output_path, parallel_formats=False)
+    return succeeded, output.getvalue()
+
+
+def _sibling_path(path: str, tail: str) -> str:
+    """Swap the file extension of path for tail, e.g. book.pdf -> book_report.txt"""
+    return str(Path(path).with_suffix('')) + tail
+
+
+def _generate_pdf(document, pdf_output: str, css_path: Optional[str], use_drop_caps: bool, step: int, verbose: bool):
+    """Render the document to PDF and validate it"""
+    from renderer import render_document_to_pdf
+
+    if verbose:
+        print(f"Step {step}: Rendering PDF...")
+    render_document_to_pdf(document, pdf_output, css_path, use_drop_caps=use_drop_caps)
+
+    if verbose:
+        print(f"PDF generated: {pdf_output}")
+
+    # Validate PDF
+    if verbose:
+        print(f"Step {step + 1}: Validating PDF...")
+    validate_and_report(pdf_output, verbose)
+
+
+def _generate_epub(document, epub_output: str, step: int, verbose: bool):
+    """Generate the EPUB and validate it"""
+    from epub_generator import generate_epub
+
+    if verbose:
+        print(f"Step {step}: Generating EPUB...")
+    generate_epub(document, epub_output)
+
+    if verbose:
+        print(f"EPUB generated: {epub_output}")
+
+    # Validate EPUB
+    if verbose:
+        print(f"Step {step + 1}: Validating EPUB...")
+    validate_epub_and_report(epub_output, verbose)
+
+
+def _run_captured(func: Callable[..., Any], *args) -> str:
+    """Run func and return everything it printed"""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        func(*args)
+    return output.getvalue()
+
 
 def validate_and_report(pdf_path: str, verbose: bool = False):
     """Validate PDF and generate report"""
     try:
+        from validator import validate_pdf_file, generate_validation_report
         report = validate_pdf_file(pdf_path)
 
         # Generate text report
-        report_path = pdf_path.replace('.pdf', '_report.txt')
+        report_path = _sibling_path(pdf_path, '_report.txt')
         generate_validation_report(report, report_path)
 
-        # Print summary
-        icon_map = {'pass': '✓','fail': '✗','warning': '⚠','error': '✗'}
-        overall_icon = icon_map.get(report.overall_status, '?')
-        print(f"PDF Validation: {overall_icon} {report.overall_status.upper()}")
+        # Print summary, collected so it reaches the console in one write
+        overall_icon = _STATUS_ICONS.get(report.overall_status, '?')
+        lines = [f"PDF Validation: {overall_icon} {report.overall_status.upper()}"]
 
         if verbose:
             for check in report.checks:
-                icon = icon_map.get(check.status, '?')
-                print(f"  {icon} {check.check_name}: {check.message}")
+                icon = _STATUS_ICONS.get(check.status, '?')
+                lines.append(f"  {icon} {check.check_name}: {check.message}")
 
-        print(f"PDF Report saved: {report_path}")
+        lines.append(f"PDF Report saved: {report_path}")
+        print('\n'.join(lines))
 
     except Exception as e:
         print(f"PDF validation failed: {str(e)}")
@@ -298,33 +441,34 @@ def validate_and_report(pdf_path: str, verbose: bool = False):
 def validate_epub_and_report(epub_path: str, verbose: bool = False):
     """Validate EPUB and generate report"""
     try:
+        from epub_validator import validate_epub_file, generate_epub_validation_report
         report = validate_epub_file(epub_path)
 
         # Generate HTML report
-        report_path = epub_path.replace('.epub', '_epub_report.html')
+        report_path = _sibling_path(epub_path, '_epub_report.html')
         generate_epub_validation_report(report, report_path)
 
-        # Print summary
-        icon_map = {'pass': '✓','fail': '✗','warning': '⚠','error': '✗'}
-        overall_icon = icon_map.get(report.overall_status, '?')
-        print(f"EPUB Validation: {overall_icon} {report.overall_status.upper()}")
+        # Print summary, collected so it reaches the console in one write
+        overall_icon = _STATUS_ICONS.get(report.overall_status, '?')
+        lines = [f"EPUB Validation: {overall_icon} {report.overall_status.upper()}"]
 
         if verbose:
             for check in report.checks:
-                icon = icon_map.get(check.status, '?')
-                print(f"  {icon} {check.check_name}: {check.message}")
+                icon = _STATUS_ICONS.get(check.status, '?')
+                lines.append(f"  {icon} {check.check_name}: {check.message}")
 
             if report.kdp_blockers:
-                print("  KDP Blockers:")
+                lines.append("  KDP Blockers:")
                 for blocker in report.kdp_blockers:
-                    print(f"    ✗ {blocker}")
+                    lines.append(f"    ✗ {blocker}")
 
             if report.warnings:
-                print("  Warnings:")
+                lines.append("  Warnings:")
                 for warning in report.warnings:
-                    print(f"    ⚠ {warning}")
+                    lines.append(f"    ⚠ {warning}")
 
-        print(f"EPUB Report saved: {report_path}")
+        lines.append(f"EPUB Report saved: {report_path}")
+        print('\n'.join(lines))
 
     except Exception as e:
         print(f"EPUB validation failed: {str(e)}")
@@ -75,7 +75,7 @@ for test_file in "${TEST_FILES[@]}"; do
         output_pdf="$OUTPUT_DIR/${base_name}_print.pdf"
 
         # Run POC without drop caps (default)
-        if python3 "$POC_DIR/kdp_poc.py" --input "$input_path" --output "$output_pdf" --epub; then
+        if python3 "$POC_DIR/kdp_poc.py" --input "$input_path" --output "$output_pdf" --epub --emit-idm; then
             echo -e "${GREEN}✓ PASSED: $test_file${NC}"
 
             # Check if output files were created
@@ -152,7 +152,7 @@ if [ -n "$OPENAI_API_KEY" ]; then
 
         output_pdf="$OUTPUT_DIR/sample_short_ai_print.pdf"
 
-        if python3 "$POC_DIR/kdp_poc.py" --input "$TEST_DATA_DIR/sample_short.txt" --output "$output_pdf" --use-ai; then
+        if python3 "$POC_DIR/kdp_poc.py" --input "$TEST_DATA_DIR/sample_short.txt" --output "$output_pdf" --use-ai --emit-idm; then
             echo -e "${GREEN}✓ PASSED: AI detection on sample_short.txt${NC}"
 
             # Extract AI cost from output (this is a bit hacky but works)
@@ -218,7 +218,7 @@ if [ -f "$TEST_DATA_DIR/sample_short.txt" ]; then
 
     epub_output="$OUTPUT_DIR/sample_short_epub_only.epub"
 
-    if python3 "$POC_DIR/kdp_poc.py" --input "$TEST_DATA_DIR/sample_short.txt" --output "$epub_output" --epub --skip-pdf; then
+    if python3 "$POC_DIR/kdp_poc.py" --input "$TEST_DATA_DIR/sample_short.txt" --output "$epub_output" --epub --skip-pdf --emit-idm; then
         echo -e "${GREEN}✓ PASSED: EPUB-only generation${NC}"
 
         # Check if output files were created
@@ -0,0 +1,94 @@
+"""Tests for the Pandoc JSON AST walk in poc/converters.py."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'poc'))
+
+import converters  # noqa: E402
+
+ATTR = ["", [], []]
+
+
+def text(words):
+    """Inlines for a space-separated string"""
+    inlines = []
+    for word in words.split(' '):
+        if inlines:
+            inlines.append({"t": "Space"})
+        inlines.append({"t": "Str", "c": word})
+    return inlines
+
+
+def note(words):
+    return {"t": "Note", "c": [{"t": "Para", "c": text(words)}]}
+
+
+def cell(blocks):
+    return [ATTR, {"t": "AlignDefault"}, 1, 1, blocks]
+
+
+def table(head_blocks, body_blocks):
+    head = [ATTR, [[ATTR, [cell(head_blocks)]]]]
+    body = [ATTR, 0, [], [[ATTR, [cell(body_blocks)]]]]
+    colspecs = [[{"t": "AlignDefault"}, {"t": "ColWidthDefault"}]]
+    return {"t": "Table", "c": [ATTR, [None, []], colspecs, head, [body], [ATTR, []]]}
+
+
+# A document and the HTML Pandoc writes for it
+AST_BLOCKS = [
+    {"t": "Header", "c": [1, ["chapter-one", [], []], text("Chapter One")]},
+    {"t": "Para", "c": [{"t": "Str", "c": "Body"}, note("FOOTNOTE-TEXT"), {"t": "Space"}, {"t": "Str", "c": "text."}]},
+    {"t": "BlockQuote", "c": [{"t": "Para", "c": text("Quoted line.")}]},
+    table([{"t": "Para", "c": text("Head cell")}], [{"t": "Para", "c": text("Body cell")}]),
+    {"t": "BulletList", "c": [[{"t": "Plain", "c": text("Item") + [note("LIST-NOTE")]}]]},
+]
+
+PANDOC_HTML = """
+<h1 id="chapter-one">Chapter One</h1>
+<p>Body<a href="#fn1" class="footnote-ref" id="fnref1" role="doc-noteref"><sup>1</sup></a> text.</p>
+<blockquote>
+<p>Quoted line.</p>
+</blockquote>
+<table>
+<thead>
+<tr><th><p>Head cell</p></th></tr>
+</thead>
+<tbody>
+<tr><td><p>Body cell</p></td></tr>
+</tbody>
+</table>
+<ul>
+<li>Item<a href="#fn2" class="footnote-ref" id="fnref2" role="doc-noteref"><sup>2</sup></a></li>
+</ul>
+<section id="footnotes" class="footnotes footnotes-end-of-document" role="doc-endnotes">
+<hr />
+<ol>
+<li id="fn1"><p>FOOTNOTE-TEXT<a href="#fnref1" class="footnote-back" role="doc-backlink">↩︎</a></p></li>
+<li id="fn2"><p>LIST-NOTE<a href="#fnref2" class="footnote-back" role="doc-backlink">↩︎</a></p></li>
+</ol>
+</section>
+"""
+
+
+def test_pandoc_ast_keeps_footnotes_and_table_cells():
+    assert list(converters._iter_pandoc_document(AST_BLOCKS)) == [
+        ('heading', 'Chapter One', False),
+        ('p', 'Body text.', False),
+        ('p', 'Quoted line.', True),
+        ('p', 'Head cell', False),
+        ('p', 'Body cell', False),
+        ('p', 'FOOTNOTE-TEXT', False),
+        ('p', 'LIST-NOTE', False),
+    ]
+
+
+def test_pandoc_ast_matches_html_path():
+    bs4 = pytest.importorskip("bs4")
+    soup = bs4.BeautifulSoup(PANDOC_HTML, converters._BS_PARSER, parse_only=converters._PANDOC_STRAINER)
+    # Footnote numbers and back-links are navigation, not text
+    for anchor in soup.select('a.footnote-ref, a.footnote-back'):
+        anchor.decompose()
+
+    assert list(converters._iter_pandoc_document(AST_BLOCKS)) == list(converters._iter_html_elements(soup))